@@ -1,7 +1,7 @@
 import click
-from cat_merge.merge import merge as pandas_merge
-from cat_merge.duckdb_merge import merge_duckdb
-from cat_merge.duckdb_qc import generate_qc_report_from_database
+
+# Engine modules are imported inside each command so that a command only pays
+# for the libraries it uses (pandas, DuckDB, LinkML) and --help stays instant
 
 
 @click.group()
@@ -14,7 +14,7 @@ def main():
 
 @main.command()
 @click.option('--name', help='Name of KG to merge')
-@click.option('--source', help='Optional directory containing node and edge files')
+@click.option('--source', help='Optional directory or tar archive containing node and edge files (TSV, compressed TSV, or Parquet with the duckdb engine)')
 @click.option('--mapping', multiple=True, required=False, help='Optional SSSOM mapping file(s) or glob patterns (e.g., mappings/*.sssom.tsv)')
 @click.option('--output_dir', help='Directory to output knowledge graph')
 @click.option('--qc_report', required=False, default=True,
@@ -24,7 +24,64 @@ def main():
 @click.option('--engine', type=click.Choice(['pandas', 'duckdb']), default='duckdb',
               help='Merge engine to use: duckdb (default, faster) or pandas for compatibility')
 @click.option('--schema', help='Optional path to LinkML schema file for multivalued field detection')
-def merge(name, source, mapping, output_dir, qc_report, graph_stats, engine, schema):
+@click.option('--schema_free', is_flag=True, default=False,
+              help='Detect multivalued fields from the built-in KGX field list without loading a schema (duckdb engine only)')
+@click.option('--workers', type=int, default=1,
+              help='Number of node/edge files to load concurrently with the duckdb engine (defaults to 1)')
+@click.option('--explicit_columns', is_flag=True, default=False,
+              help='Read TSV files with explicit column types from the schema instead of sniffing them (duckdb engine only)')
+@click.option('--column_spec', help='Optional YAML file mapping column names to DuckDB types (implies --explicit_columns)')
+@click.option('--memory_limit', help='Optional DuckDB memory limit, e.g. 16GB (duckdb engine only)')
+@click.option('--threads', type=int, help='Optional number of DuckDB threads (duckdb engine only)')
+@click.option('--temp_directory', help='Optional directory DuckDB spills to when over the memory limit (duckdb engine only)')
+@click.option('--preserve_insertion_order', type=bool,
+              help='Optional DuckDB preserve_insertion_order setting; false reduces memory use (duckdb engine only)')
+@click.option('--incremental', is_flag=True, default=False,
+              help='Reload only the node and edge files that changed since the last incremental merge into the same '
+                   'output database (duckdb engine only)')
+@click.option('--enum_columns', is_flag=True, default=False,
+              help='Store category, predicate and provided_by columns as ENUMs (duckdb engine only)')
+@click.option('--mapping_conflict_policy', type=click.Choice(['mapping_source', 'confidence', 'predicate']),
+              default='mapping_source',
+              help='How to choose between mappings of the same object_id (duckdb engine only)')
+@click.option('--mapping_source_priority', multiple=True,
+              help='Mapping source to prefer for the mapping_source conflict policy, most preferred first; '
+                   'can be repeated (duckdb engine only)')
+@click.option('--mapping_max_depth', type=int, default=10,
+              help='Maximum number of chained mapping hops to follow; 1 applies mappings in a single hop (duckdb engine only)')
+@click.option('--map_node_ids', is_flag=True, default=False,
+              help='Also apply mappings to node ids, keeping the replaced id in original_id')
+@click.option('--mapping_predicate', multiple=True,
+              help='Mapping predicate_id to keep (e.g. skos:exactMatch); can be repeated (duckdb engine only)')
+@click.option('--mapping_justification', multiple=True,
+              help='Mapping mapping_justification to keep; can be repeated (duckdb engine only)')
+@click.option('--mapping_min_confidence', type=float,
+              help='Minimum mapping confidence; mappings without a confidence are dropped (duckdb engine only)')
+@click.option('--mapping_cache', is_flag=True, default=False,
+              help='Cache parsed mapping tables in the cache directory and reuse them while the mapping files are '
+                   'unchanged (duckdb engine only)')
+@click.option('--node_merge_strategy', type=click.Choice(['first', 'priority', 'union']), default='first',
+              help='How to merge nodes provided more than once: keep the first by provided_by, keep the first by '
+                   '--node_source_priority, or also union their multivalued fields (duckdb engine only)')
+@click.option('--node_source_priority', multiple=True,
+              help='Node provided_by to prefer for the priority and union node merge strategies, most preferred first; '
+                   'can be repeated (duckdb engine only)')
+@click.option('--dedup_triples', is_flag=True, default=False,
+              help='Collapse edges with the same subject, predicate, object and qualifiers into one edge, unioning '
+                   'their multivalued fields (duckdb engine only)')
+@click.option('--edge_qualifier', multiple=True,
+              help='Edge column that is part of the --dedup_triples key; can be repeated. Defaults to negated, '
+                   'qualified_predicate, qualifiers and *qualifier columns (duckdb engine only)')
+@click.option('--shards', type=int, default=1,
+              help='Number of hash shards to merge in separate worker processes; memory and thread limits apply to '
+                   'each worker. Workers are spawned, so scripts calling merge_duckdb with shards > 1 need an '
+                   'if __name__ == "__main__": guard (duckdb engine only)')
+def merge(name, source, mapping, output_dir, qc_report, graph_stats, engine, schema, schema_free, workers, explicit_columns, column_spec,
+          memory_limit, threads, temp_directory, preserve_insertion_order, incremental, enum_columns,
+          mapping_conflict_policy, mapping_source_priority, mapping_max_depth,
+          map_node_ids, mapping_predicate, mapping_justification, mapping_min_confidence,
+          mapping_cache, node_merge_strategy, node_source_priority, dedup_triples, edge_qualifier,
+          shards):
     """
     Merge nodes and edges into a knowledge graph.
 
@@ -36,21 +93,68 @@ def merge(name, source, mapping, output_dir, qc_report, graph_stats, engine, sch
         qc_report (bool, optional): Boolean for whether to generate a qc report (defaults to True).
         graph_stats (bool, optional): Boolean for whether to generate comprehensive graph statistics report (defaults to False).
         engine (str): Merge engine to use (pandas or duckdb).
+        schema (str, optional): Path to LinkML schema file for multivalued field detection.
+        schema_free (bool): Use the built-in KGX multivalued field list instead of a schema (duckdb engine only).
+        workers (int, optional): Number of node/edge files to load concurrently (duckdb engine only).
+        explicit_columns (bool, optional): Read TSV files with explicit column types (duckdb engine only).
+        column_spec (str, optional): YAML file mapping column names to DuckDB types (duckdb engine only).
+        memory_limit (str, optional): DuckDB memory limit (duckdb engine only).
+        threads (int, optional): Number of DuckDB threads (duckdb engine only).
+        temp_directory (str, optional): Directory DuckDB spills to (duckdb engine only).
+        preserve_insertion_order (bool, optional): DuckDB preserve_insertion_order setting (duckdb engine only).
+        incremental (bool): Reload only changed node and edge files into the existing output database (duckdb engine only).
+        enum_columns (bool): Store category, predicate and provided_by columns as ENUMs (duckdb engine only).
+        mapping_conflict_policy (str): How to choose between mappings of the same object_id (duckdb engine only).
+        mapping_source_priority (list[str], optional): Mapping sources to prefer, most preferred first (duckdb engine only).
+        mapping_max_depth (int): Maximum number of chained mapping hops to follow (duckdb engine only).
+        map_node_ids (bool): Also apply mappings to node ids, keeping the replaced id in original_id.
+        mapping_predicate (list[str], optional): Mapping predicate_id values to keep (duckdb engine only).
+        mapping_justification (list[str], optional): Mapping mapping_justification values to keep (duckdb engine only).
+        mapping_min_confidence (float, optional): Minimum mapping confidence (duckdb engine only).
+        mapping_cache (bool): Cache parsed mapping tables and reuse them while unchanged (duckdb engine only).
+        node_merge_strategy (str): How to merge nodes provided more than once (duckdb engine only).
+        node_source_priority (list[str], optional): Node provided_by values to prefer, most preferred first (duckdb engine only).
+        dedup_triples (bool): Collapse edges with the same triple and qualifiers into one edge (duckdb engine only).
+        edge_qualifier (list[str], optional): Qualifier columns that are part of the triple dedup key (duckdb engine only).
+        shards (int): Number of hash shards to merge in separate worker processes (duckdb engine only).
 
     Returns:
         None
     """
+    if schema_free:
+        from cat_merge.schema_utils import KGX_SCHEMA
+        if schema:
+            raise click.UsageError("--schema and --schema_free cannot both be specified")
+        schema = KGX_SCHEMA
+
     if engine == 'pandas':
-        pandas_merge(name=name, source=source, mappings=mapping, output_dir=output_dir, qc_report=qc_report)
+        from cat_merge.merge import merge as pandas_merge
+        pandas_merge(name=name, source=source, mappings=mapping, output_dir=output_dir, qc_report=qc_report,
+                     map_node_ids=map_node_ids)
     else:
-        merge_duckdb(name=name, source=source, mappings=mapping, output_dir=output_dir, qc_report=qc_report, graph_stats=graph_stats, schema_path=schema)
+        from cat_merge.duckdb_merge import merge_duckdb
+        merge_duckdb(name=name, source=source, mappings=mapping, output_dir=output_dir, qc_report=qc_report, graph_stats=graph_stats, schema_path=schema, workers=workers,
+                     explicit_columns=explicit_columns, column_spec=column_spec,
+                     memory_limit=memory_limit, threads=threads, temp_directory=temp_directory,
+                     preserve_insertion_order=preserve_insertion_order, incremental=incremental,
+                     enum_columns=enum_columns, mapping_conflict_policy=mapping_conflict_policy,
+                     mapping_source_priority=list(mapping_source_priority), mapping_max_depth=mapping_max_depth,
+                     map_node_ids=map_node_ids, mapping_predicates=list(mapping_predicate),
+                     mapping_justifications=list(mapping_justification), mapping_min_confidence=mapping_min_confidence,
+                     mapping_cache=mapping_cache, node_merge_strategy=node_merge_strategy,
+                     node_source_priority=list(node_source_priority), dedup_triples=dedup_triples,
+                     edge_qualifiers=list(edge_qualifier) or None, shards=shards)
 
 
 @main.command()
 @click.option('--database', required=True, help='Path to existing DuckDB database file')
 @click.option('--output-dir', default='.', help='Directory to output the QC report (defaults to current directory)')
 @click.option('--output-name', default='qc_report.yaml', help='Name of the QC report file (defaults to "qc_report.yaml")')
-def qc_report(database, output_dir, output_name):
+@click.option('--memory-limit', help='Optional DuckDB memory limit, e.g. 16GB')
+@click.option('--threads', type=int, help='Optional number of DuckDB threads')
+@click.option('--temp-directory', help='Optional directory DuckDB spills to when over the memory limit')
+@click.option('--preserve-insertion-order', type=bool, help='Optional DuckDB preserve_insertion_order setting')
+def qc_report(database, output_dir, output_name, memory_limit, threads, temp_directory, preserve_insertion_order):
     """
     Generate QC report from an existing DuckDB database.
 
@@ -58,11 +162,40 @@ def qc_report(database, output_dir, output_name):
         database (str): Path to existing DuckDB database file.
         output_dir (str): Directory to output the QC report.
         output_name (str): Name of the QC report file.
+        memory_limit (str, optional): DuckDB memory limit.
+        threads (int, optional): Number of DuckDB threads.
+        temp_directory (str, optional): Directory DuckDB spills to.
+        preserve_insertion_order (bool, optional): DuckDB preserve_insertion_order setting.
+
+    Returns:
+        None
+    """
+    from cat_merge.duckdb_qc import generate_qc_report_from_database
+    generate_qc_report_from_database(database, output_dir, output_name, memory_limit=memory_limit, threads=threads,
+                                     temp_directory=temp_directory, preserve_insertion_order=preserve_insertion_order)
+
+
+@main.command()
+@click.option('--version', help='Biolink Model version to download, e.g. 4.2.0 (defaults to the latest release on master)')
+@click.option('--bundled', is_flag=True, default=False,
+              help='Cache the Biolink Model snapshot bundled with cat-merge instead of downloading one')
+@click.option('--pin', is_flag=True, default=False,
+              help='Use this schema for merges that do not specify a schema')
+def cache_schema(version, bundled, pin):
+    """
+    Download a Biolink Model schema into the local schema cache.
+
+    Args:
+        version (str, optional): Biolink Model version to download.
+        bundled (bool): Cache the bundled snapshot instead of downloading.
+        pin (bool): Use this schema by default.
 
     Returns:
         None
     """
-    generate_qc_report_from_database(database, output_dir, output_name)
+    from cat_merge.schema_utils import cache_biolink_schema
+    schema_path = cache_biolink_schema(version=version, pin=pin, bundled=bundled)
+    print(f"Cached Biolink Model schema: {schema_path}")
 
 
 if __name__ == "__main__":
@@ -4,9 +4,13 @@ import yaml
 from typing import List
 
 from cat_merge.duckdb_utils import (
+    duckdb_config,
     read_kg_files, 
+    encode_low_cardinality_columns,
     read_mapping_files,
+    get_mapping_cache_dir,
     apply_mappings,
+    intern_node_ids,
     merge_and_clean,
     create_qc_aggregations,
     write_output_files
@@ -23,21 +27,74 @@ def merge_duckdb(
     output_dir: str = "merged-output",
     qc_report: bool = True,
     graph_stats: bool = False,
-    schema_path: str = None
+    schema_path: str = None,
+    workers: int = 1,
+    explicit_columns: bool = False,
+    column_spec: str = None,
+    memory_limit: str = None,
+    threads: int = None,
+    temp_directory: str = None,
+    preserve_insertion_order: bool = None,
+    incremental: bool = False,
+    enum_columns: bool = False,
+    mapping_conflict_policy: str = "mapping_source",
+    mapping_source_priority: List[str] = None,
+    mapping_max_depth: int = 10,
+    map_node_ids: bool = False,
+    mapping_predicates: List[str] = None,
+    mapping_justifications: List[str] = None,
+    mapping_min_confidence: float = None,
+    mapping_cache: bool = False,
+    node_merge_strategy: str = "first",
+    node_source_priority: List[str] = None,
+    dedup_triples: bool = False,
+    edge_qualifiers: List[str] = None,
+    shards: int = 1
 ):
     """
     Merge knowledge graph files using DuckDB for improved performance.
     
     Args:
         name: Output name of KG after merge
-        source: Optional directory containing node and edge files
+        source: Optional directory or tar archive containing node and edge files
         nodes: Optional list of node files
         edges: Optional list of edge files  
         mappings: Optional list of SSSOM mapping files
         output_dir: Directory to output knowledge graph
         qc_report: Whether to generate a QC report (defaults to True)
         graph_stats: Whether to generate comprehensive graph statistics report (defaults to False)
-        schema_path: Optional path to LinkML schema for multivalued field detection
+        schema_path: Optional path to LinkML schema for multivalued field detection, or "kgx" to use the
+            built-in KGX multivalued field list without loading a schema
+        workers: Number of node/edge files to sniff and load concurrently (defaults to 1)
+        explicit_columns: Read TSV files with explicit column types from the schema instead of sniffing them
+        column_spec: Optional YAML file mapping column names to DuckDB types (implies explicit_columns)
+        memory_limit: Optional DuckDB memory limit (e.g. '16GB'), beyond which DuckDB spills to disk
+        threads: Optional number of DuckDB threads
+        temp_directory: Optional directory for DuckDB to spill to
+        preserve_insertion_order: Optional DuckDB preserve_insertion_order setting (False reduces memory use)
+        incremental: Reuse the files loaded into {output_dir}/{name}.duckdb by a previous incremental run,
+            reloading only the provided_by partitions whose files changed
+        enum_columns: Store category, predicate and provided_by columns as ENUMs to reduce memory use
+            and speed up grouping and joins on them
+        mapping_conflict_policy: How to choose between mappings of the same object_id: "mapping_source",
+            "confidence" or "predicate" (defaults to "mapping_source")
+        mapping_source_priority: Optional list of mapping sources, most preferred first
+        mapping_max_depth: Maximum number of chained mapping hops to follow (1 applies mappings in a single hop)
+        map_node_ids: Also apply mappings to node ids, keeping the replaced id in original_id
+        mapping_predicates: Optional list of mapping predicate_id values to keep (e.g. skos:exactMatch)
+        mapping_justifications: Optional list of mapping_justification values to keep
+        mapping_min_confidence: Optional minimum mapping confidence; mappings without a confidence are dropped
+        mapping_cache: Cache the parsed mappings table and reuse it while the mapping files and filters are unchanged
+        node_merge_strategy: How to merge nodes provided more than once: "first", "priority" or "union"
+            (defaults to "first")
+        node_source_priority: Optional list of node provided_by values to prefer, most preferred first
+        dedup_triples: Collapse edges with the same subject, predicate, object and qualifiers into one edge,
+            unioning their multivalued fields
+        edge_qualifiers: Optional list of qualifier columns that are part of the triple dedup key
+        shards: Number of hash shards to merge and aggregate in separate worker processes (defaults to 1, merging in
+            this process); memory_limit, threads and temp_directory apply to each worker. Workers
+            are spawned, so scripts calling merge_duckdb with shards > 1 need an
+            ``if __name__ == "__main__":`` guard.
     """
     start_time = time.time()
     timing = {}
@@ -51,6 +108,13 @@ Merging KG files with DuckDB...
   mappings: {mappings}
   output_dir: {output_dir}
   graph_stats: {graph_stats}
+  workers: {workers}
+  memory_limit: {memory_limit}
+  threads: {threads}
+  temp_directory: {temp_directory}
+  incremental: {incremental}
+  enum_columns: {enum_columns}
+  shards: {shards}
 """)
     
     # Validate arguments
@@ -65,34 +129,62 @@ Merging KG files with DuckDB...
     os.makedirs(output_dir, exist_ok=True)
     database_path = f"{output_dir}/{name}.duckdb"
     
+    # Resource settings apply to the connection used by every step below
+    config = duckdb_config(memory_limit=memory_limit, threads=threads, temp_directory=temp_directory,
+                           preserve_insertion_order=preserve_insertion_order)
+    
     # Read files into DuckDB (persistent database)
     step_start = time.time()
     print("Reading node and edge files into DuckDB...")
-    conn = read_kg_files(source=source, nodes=nodes, edges=edges, database_path=database_path, schema_path=schema_path)
+    conn = read_kg_files(source=source, nodes=nodes, edges=edges, database_path=database_path, schema_path=schema_path, workers=workers,
+                         explicit_columns=explicit_columns, column_spec=column_spec, config=config,
+                         incremental=incremental)
+    if enum_columns:
+        print("Encoding low-cardinality columns as ENUMs...")
+        encode_low_cardinality_columns(conn)
     timing['read_files'] = time.time() - step_start
     
     # Read mappings if provided
     if mappings:
         step_start = time.time()
         print("Reading mapping files...")
-        read_mapping_files(conn, mappings)
+        read_mapping_files(conn, mappings, mapping_predicates, mapping_justifications, mapping_min_confidence,
+                           cache_dir=get_mapping_cache_dir() if mapping_cache else None)
         print("Applying mappings...")
-        apply_mappings(conn)
+        apply_mappings(conn, mapping_conflict_policy, mapping_source_priority, mapping_max_depth, map_node_ids)
         timing['mappings'] = time.time() - step_start
     else:
+        # Don't report conflicts or cycles left in the database by an earlier merge with mappings
+        conn.execute("DROP TABLE IF EXISTS mapping_conflicts")
+        conn.execute("DROP TABLE IF EXISTS mapping_cycles")
         timing['mappings'] = 0
     
     # Perform merge and cleaning operations
     step_start = time.time()
-    print("Merging and cleaning data...")
-    merge_and_clean(conn)
-    timing['merge_clean'] = time.time() - step_start
+    print("Interning node ids...")
+    intern_node_ids(conn)
+    if shards > 1:
+        # Workers also create the QC aggregations of their shards, so both steps are timed as merge_clean
+        from cat_merge.duckdb_shards import sharded_merge_and_clean
+        print(f"Merging, cleaning and aggregating data in {shards} shards...")
+        sharded_merge_and_clean(conn, shards, config=config, work_dir=output_dir,
+                                node_merge_strategy=node_merge_strategy, source_priority=node_source_priority,
+                                dedup_triples=dedup_triples, qualifier_columns=edge_qualifiers)
+        if enum_columns:
+            # ENUM columns come back from the shards' Parquet files as VARCHAR
+            encode_low_cardinality_columns(conn)
+        timing['merge_clean'] = time.time() - step_start
+        timing['qc_aggregations'] = 0
+    else:
+        print("Merging and cleaning data...")
+        merge_and_clean(conn, node_merge_strategy, node_source_priority, dedup_triples, edge_qualifiers)
+        timing['merge_clean'] = time.time() - step_start
     
-    # Create aggregation tables for QC reporting
-    step_start = time.time()
-    print("Creating QC aggregations...")
-    create_qc_aggregations(conn)
-    timing['qc_aggregations'] = time.time() - step_start
+        # Create aggregation tables for QC reporting
+        step_start = time.time()
+        print("Creating QC aggregations...")
+        create_qc_aggregations(conn)
+        timing['qc_aggregations'] = time.time() - step_start
     
     # Write output files
     step_start = time.time()
@@ -2,6 +2,8 @@ import duckdb
 import yaml
 from typing import Dict, List, Union
 
+from cat_merge.duckdb_utils import duckdb_config, node_join_condition
+
 
 def create_qc_report_duckdb(conn: duckdb.DuckDBPyConnection) -> Dict:
     """
@@ -28,6 +30,10 @@ def create_qc_report_duckdb(conn: duckdb.DuckDBPyConnection) -> Dict:
     duplicate_nodes_report = _get_duplicate_nodes_report(conn)
     duplicate_edges_report = _get_duplicate_edges_report(conn)
     dangling_edges_report = _get_dangling_edges_report(conn)
+    rejected_rows_report = _get_rejected_rows_report(conn)
+    mapping_conflicts_report = _get_mapping_conflicts_report(conn)
+    mapping_cycles_report = _get_mapping_cycles_report(conn)
+    collapsed_edges_report = _get_collapsed_edges_report(conn)
 
     return {
         "total_nodes": total_nodes,
@@ -36,7 +42,11 @@ def create_qc_report_duckdb(conn: duckdb.DuckDBPyConnection) -> Dict:
         "edges": edges_by_source,
         "duplicate_nodes": duplicate_nodes_report,
         "duplicate_edges": duplicate_edges_report,
-        "dangling_edges": dangling_edges_report
+        "dangling_edges": dangling_edges_report,
+        "rejected_rows": rejected_rows_report,
+        "mapping_conflicts": mapping_conflicts_report,
+        "mapping_cycles": mapping_cycles_report,
+        "collapsed_edges": collapsed_edges_report
     }
 
 
@@ -274,7 +284,7 @@ def _generate_node_stats(conn: duckdb.DuckDBPyConnection, total_nodes: int) -> D
         SELECT 
             CASE 
                 WHEN category IS NULL THEN 'unknown'
-                WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                 ELSE CAST(category AS VARCHAR)
             END as category,
             COUNT(*) as count
@@ -309,7 +319,7 @@ def _generate_node_stats(conn: duckdb.DuckDBPyConnection, total_nodes: int) -> D
             FROM nodes
             WHERE CASE 
                 WHEN category IS NULL THEN 'unknown'
-                WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                 ELSE CAST(category AS VARCHAR)
             END = ?
             GROUP BY provided_by
@@ -334,7 +344,7 @@ def _generate_node_stats(conn: duckdb.DuckDBPyConnection, total_nodes: int) -> D
             FROM nodes
             WHERE CASE 
                 WHEN category IS NULL THEN 'unknown'
-                WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                 ELSE CAST(category AS VARCHAR)
             END = ?
             GROUP BY split_part(id, ':', 1)
@@ -356,7 +366,7 @@ def _generate_node_stats(conn: duckdb.DuckDBPyConnection, total_nodes: int) -> D
                 SELECT split_part(id, ':', 1) as prefix, COUNT(*) as count
                 FROM nodes WHERE CASE 
                     WHEN category IS NULL THEN 'unknown'
-                    WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                    WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                     ELSE CAST(category AS VARCHAR)
                 END = ?
                 GROUP BY split_part(id, ':', 1)
@@ -370,6 +380,8 @@ def _generate_node_stats(conn: duckdb.DuckDBPyConnection, total_nodes: int) -> D
 
 def _generate_edge_stats(conn: duckdb.DuckDBPyConnection, total_edges: int) -> Dict:
     """Generate comprehensive edge statistics."""
+    subject_join = node_join_condition(conn, "edges", "e", "sn", "subject")
+    object_join = node_join_condition(conn, "edges", "e", "on_node", "object")
     
     # Get all predicates
     predicate_counts = conn.execute("""
@@ -406,23 +418,23 @@ def _generate_edge_stats(conn: duckdb.DuckDBPyConnection, total_edges: int) -> D
         }
     
     # Build count_by_spo (Subject-Predicate-Object patterns)
-    spo_counts = conn.execute("""
+    spo_counts = conn.execute(f"""
         SELECT 
             CASE 
                 WHEN sn.category IS NULL THEN 'unknown'
-                WHEN typeof(sn.category) = 'VARCHAR[]' THEN array_to_string(sn.category, '|')
+                WHEN typeof(sn.category) LIKE '%[]' THEN array_to_string(sn.category, '|')
                 ELSE CAST(sn.category AS VARCHAR)
             END as subject_category,
             COALESCE(e.predicate, 'unknown') as predicate,
             CASE 
                 WHEN on_node.category IS NULL THEN 'unknown'
-                WHEN typeof(on_node.category) = 'VARCHAR[]' THEN array_to_string(on_node.category, '|')
+                WHEN typeof(on_node.category) LIKE '%[]' THEN array_to_string(on_node.category, '|')
                 ELSE CAST(on_node.category AS VARCHAR)
             END as object_category,
             COUNT(*) as count
         FROM edges e
-        LEFT JOIN nodes sn ON e.subject = sn.id  
-        LEFT JOIN nodes on_node ON e.object = on_node.id
+        LEFT JOIN nodes sn ON {subject_join}
+        LEFT JOIN nodes on_node ON {object_join}
         GROUP BY subject_category, e.predicate, object_category
         HAVING COUNT(*) > 0
         ORDER BY subject_category, e.predicate, object_category
@@ -433,20 +445,20 @@ def _generate_edge_stats(conn: duckdb.DuckDBPyConnection, total_edges: int) -> D
         spo_key = f"{subj_cat}-{pred}-{obj_cat}"
         
         # Get provided_by breakdown for this SPO pattern
-        provided_by_breakdown = conn.execute("""
+        provided_by_breakdown = conn.execute(f"""
             SELECT e.provided_by, COUNT(*) as count
             FROM edges e
-            LEFT JOIN nodes sn ON e.subject = sn.id  
-            LEFT JOIN nodes on_node ON e.object = on_node.id
+            LEFT JOIN nodes sn ON {subject_join}
+            LEFT JOIN nodes on_node ON {object_join}
             WHERE CASE 
                 WHEN sn.category IS NULL THEN 'unknown'
-                WHEN typeof(sn.category) = 'VARCHAR[]' THEN array_to_string(sn.category, '|')
+                WHEN typeof(sn.category) LIKE '%[]' THEN array_to_string(sn.category, '|')
                 ELSE CAST(sn.category AS VARCHAR)
             END = ?
               AND COALESCE(e.predicate, 'unknown') = ?
               AND CASE 
                 WHEN on_node.category IS NULL THEN 'unknown'
-                WHEN typeof(on_node.category) = 'VARCHAR[]' THEN array_to_string(on_node.category, '|')
+                WHEN typeof(on_node.category) LIKE '%[]' THEN array_to_string(on_node.category, '|')
                 ELSE CAST(on_node.category AS VARCHAR)
             END = ?
             GROUP BY e.provided_by
@@ -502,7 +514,7 @@ def _get_duplicate_nodes_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
             SELECT
                 CASE
                     WHEN category IS NULL THEN 'unknown'
-                    WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                    WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                     ELSE CAST(category AS VARCHAR)
                 END as category,
                 COUNT(*) as count
@@ -570,7 +582,7 @@ def _get_duplicate_edges_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
             SELECT
                 CASE
                     WHEN category IS NULL THEN 'unknown'
-                    WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                    WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                     ELSE CAST(category AS VARCHAR)
                 END as category,
                 COUNT(*) as count
@@ -652,7 +664,7 @@ def _get_dangling_edges_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
             SELECT
                 CASE
                     WHEN category IS NULL THEN 'unknown'
-                    WHEN typeof(category) = 'VARCHAR[]' THEN array_to_string(category, '|')
+                    WHEN typeof(category) LIKE '%[]' THEN array_to_string(category, '|')
                     ELSE CAST(category AS VARCHAR)
                 END as category,
                 COUNT(*) as count
@@ -699,8 +711,100 @@ def _get_dangling_edges_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
     return dangling_edges_report
 
 
+def _get_rejected_rows_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
+    """Create rejected rows section of QC report: lines of each source that could not be parsed."""
+    # Check if rejects table exists
+    try:
+        conn.execute("SELECT COUNT(*) FROM rejects").fetchone()
+        table_exists = True
+    except:
+        table_exists = False
+
+    if not table_exists:
+        return []
+
+    rejected_rows = conn.execute("""
+        SELECT provided_by, COUNT(*) as total
+        FROM rejects
+        GROUP BY provided_by
+        ORDER BY provided_by
+    """).fetchall()
+
+    return [{"name": source, "total_number": total} for source, total in rejected_rows]
+
+
+def _get_mapping_conflicts_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
+    """Create mapping conflicts section of QC report: object ids each mapping source maps ambiguously."""
+    # Check if mapping_conflicts table exists
+    try:
+        conn.execute("SELECT COUNT(*) FROM mapping_conflicts").fetchone()
+        table_exists = True
+    except:
+        table_exists = False
+
+    if not table_exists:
+        return []
+
+    conflicts = conn.execute("""
+        SELECT mapping_source, COUNT(DISTINCT object_id) as total, COUNT(*) FILTER (WHERE selected) as selected
+        FROM mapping_conflicts
+        GROUP BY mapping_source
+        ORDER BY mapping_source
+    """).fetchall()
+
+    return [{"name": source, "total_number": total, "selected_number": selected}
+            for source, total, selected in conflicts]
+
+
+def _get_mapping_cycles_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
+    """Create mapping cycles section of QC report: object ids whose mapping chain could not be resolved, by reason."""
+    # Check if mapping_cycles table exists
+    try:
+        conn.execute("SELECT COUNT(*) FROM mapping_cycles").fetchone()
+        table_exists = True
+    except:
+        table_exists = False
+
+    if not table_exists:
+        return []
+
+    cycles = conn.execute("""
+        SELECT reason, COUNT(*) as total
+        FROM mapping_cycles
+        GROUP BY reason
+        ORDER BY reason
+    """).fetchall()
+
+    return [{"name": reason, "total_number": total} for reason, total in cycles]
+
+
+def _get_collapsed_edges_report(conn: duckdb.DuckDBPyConnection) -> List[Dict]:
+    """Create collapsed edges section of QC report: edge groups with the same triple, and the edges removed, by predicate."""
+    # Check if collapsed_edges table exists
+    try:
+        conn.execute("SELECT COUNT(*) FROM collapsed_edges").fetchone()
+        table_exists = True
+    except:
+        table_exists = False
+
+    if not table_exists:
+        return []
+
+    groups = conn.execute("""
+        SELECT predicate, COUNT(*) as total, SUM(count) - COUNT(*) as collapsed
+        FROM collapsed_edges
+        GROUP BY predicate
+        ORDER BY predicate
+    """).fetchall()
+
+    return [{"name": predicate, "total_number": total, "collapsed_number": collapsed}
+            for predicate, total, collapsed in groups]
+
+
 def _get_qc_predicates_report(conn: duckdb.DuckDBPyConnection, source: str, table_name: str) -> List[Dict]:
     """Get predicate breakdown for a QC table (dangling_edges or duplicate_edges)."""
+    subject_join = node_join_condition(conn, table_name, "e", "sn", "subject")
+    object_join = node_join_condition(conn, table_name, "e", "on_node", "object")
 
     predicates = conn.execute(f"""
         SELECT DISTINCT predicate
@@ -726,21 +830,21 @@ def _get_qc_predicates_report(conn: duckdb.DuckDBPyConnection, source: str, tabl
                 COALESCE(
                     CASE
                         WHEN sn.category IS NULL THEN 'missing'
-                        WHEN typeof(sn.category) = 'VARCHAR[]' THEN array_to_string(sn.category, '|')
+                        WHEN typeof(sn.category) LIKE '%[]' THEN array_to_string(sn.category, '|')
                         ELSE CAST(sn.category AS VARCHAR)
                     END, 'missing'
                 ) as subject_category,
                 COALESCE(
                     CASE
                         WHEN on_node.category IS NULL THEN 'missing'
-                        WHEN typeof(on_node.category) = 'VARCHAR[]' THEN array_to_string(on_node.category, '|')
+                        WHEN typeof(on_node.category) LIKE '%[]' THEN array_to_string(on_node.category, '|')
                         ELSE CAST(on_node.category AS VARCHAR)
                     END, 'missing'
                 ) as object_category,
                 COUNT(*) as count
             FROM {table_name} e
-            LEFT JOIN nodes sn ON e.subject = sn.id
-            LEFT JOIN nodes on_node ON e.object = on_node.id
+            LEFT JOIN nodes sn ON {subject_join}
+            LEFT JOIN nodes on_node ON {object_join}
             WHERE e.provided_by = ? AND e.predicate = ?
             GROUP BY all
             ORDER BY all
@@ -759,6 +863,8 @@ def _get_qc_predicates_report(conn: duckdb.DuckDBPyConnection, source: str, tabl
 
 def _get_qc_node_types_report(conn: duckdb.DuckDBPyConnection, source: str, table_name: str) -> List[Dict]:
     """Get node type breakdown for a QC table (dangling_edges or duplicate_edges)."""
+    subject_join = node_join_condition(conn, table_name, "e", "sn", "subject")
+    object_join = node_join_condition(conn, table_name, "e", "on_node", "object")
 
     # Get unique subject/object category combinations by joining with nodes
     node_type_stats = conn.execute(f"""
@@ -766,21 +872,21 @@ def _get_qc_node_types_report(conn: duckdb.DuckDBPyConnection, source: str, tabl
             COALESCE(
                 CASE
                     WHEN sn.category IS NULL THEN 'missing'
-                    WHEN typeof(sn.category) = 'VARCHAR[]' THEN array_to_string(sn.category, '|')
+                    WHEN typeof(sn.category) LIKE '%[]' THEN array_to_string(sn.category, '|')
                     ELSE CAST(sn.category AS VARCHAR)
                 END, 'missing'
             ) as subject_category,
             COALESCE(
                 CASE
                     WHEN on_node.category IS NULL THEN 'missing'
-                    WHEN typeof(on_node.category) = 'VARCHAR[]' THEN array_to_string(on_node.category, '|')
+                    WHEN typeof(on_node.category) LIKE '%[]' THEN array_to_string(on_node.category, '|')
                     ELSE CAST(on_node.category AS VARCHAR)
                 END, 'missing'
             ) as object_category,
             COUNT(*) as count
         FROM {table_name} e
-        LEFT JOIN nodes sn ON e.subject = sn.id
-        LEFT JOIN nodes on_node ON e.object = on_node.id
+        LEFT JOIN nodes sn ON {subject_join}
+        LEFT JOIN nodes on_node ON {object_join}
         WHERE e.provided_by = ?
         GROUP BY all
         ORDER BY count DESC
@@ -789,7 +895,15 @@ def _get_qc_node_types_report(conn: duckdb.DuckDBPyConnection, source: str, tabl
     return _df_to_category_pairs(node_type_stats)
 
 
-def generate_qc_report_from_database(database_path: str, output_dir: str = ".", output_name: str = "qc_report.yaml") -> None:
+def generate_qc_report_from_database(
+    database_path: str,
+    output_dir: str = ".",
+    output_name: str = "qc_report.yaml",
+    memory_limit: str = None,
+    threads: int = None,
+    temp_directory: str = None,
+    preserve_insertion_order: bool = None
+) -> None:
     """
     Generate QC report from an existing DuckDB database.
 
@@ -797,6 +911,10 @@ def generate_qc_report_from_database(database_path: str, output_dir: str = ".",
         database_path: Path to existing DuckDB database file
         output_dir: Directory to output the QC report (defaults to current directory)
         output_name: Name of the QC report file (defaults to "qc_report.yaml")
+        memory_limit: Optional DuckDB memory limit (e.g. '16GB'), beyond which DuckDB spills to disk
+        threads: Optional number of DuckDB threads
+        temp_directory: Optional directory for DuckDB to spill to
+        preserve_insertion_order: Optional DuckDB preserve_insertion_order setting
 
     Returns:
         None
@@ -807,7 +925,9 @@ def generate_qc_report_from_database(database_path: str, output_dir: str = ".",
     os.makedirs(output_dir, exist_ok=True)
 
     # Connect to existing database
-    conn = duckdb.connect(database_path)
+    config = duckdb_config(memory_limit=memory_limit, threads=threads, temp_directory=temp_directory,
+                           preserve_insertion_order=preserve_insertion_order)
+    conn = duckdb.connect(database_path, config=config)
 
     # Generate QC report
     qc_report_data = create_qc_report_duckdb(conn)
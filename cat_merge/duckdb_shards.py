@@ -0,0 +1,272 @@
+"""
+Hash-sharded merge and clean, run in worker processes.
+
+Nodes are split into shards by a hash of their id and edges by a hash of their id, so
+all rows that are deduplicated together land in the same shard. Each worker process
+deduplicates its shard and aggregates its QC stats in its own DuckDB database, bounded
+by the connection's memory limit, and the parent combines the shards' Parquet outputs.
+Edge workers share one node lookup file with the key and category of every clean node,
+for their dangling checks and node category joins.
+
+Workers are started with the spawn method, so scripts that call this module's functions
+need an ``if __name__ == "__main__":`` guard around them.
+"""
+
+import duckdb
+import multiprocessing
+import os
+import shutil
+import tempfile
+from concurrent.futures import ProcessPoolExecutor
+from functools import partial
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+from cat_merge.duckdb_utils import (
+    _classify_edges,
+    _classify_nodes,
+    _collapse_triples,
+    _create_edge_stats,
+    _create_node_stats,
+    _get_column_types,
+    _split_classified_edges,
+    _split_classified_nodes,
+    NODE_KEY_COLUMN,
+    NODE_MERGE_STRATEGIES,
+)
+
+
+def _partition_table(conn: duckdb.DuckDBPyConnection, table: str, key_column: str, shards: int, shard_dir: Path) -> List[str]:
+    """
+    Write a table to one Parquet directory per shard, by hash of key_column, in a single scan.
+
+    Shards that get no rows are written as empty files with the table's columns, so every
+    shard has input.
+
+    Returns:
+        Glob pattern of each shard's files, by shard number
+    """
+    shard_dir.parent.mkdir(parents=True, exist_ok=True)
+    conn.execute(f"""
+        COPY (SELECT *, hash({key_column}) % {shards} as _shard FROM {table})
+        TO '{shard_dir}' (FORMAT PARQUET, PARTITION_BY (_shard))
+    """)
+    shard_files = []
+    for shard in range(shards):
+        partition_dir = shard_dir / f"_shard={shard}"
+        if not partition_dir.exists():
+            partition_dir.mkdir(parents=True)
+            conn.execute(f"COPY (SELECT * FROM {table} LIMIT 0) TO '{partition_dir / 'empty.parquet'}' (FORMAT PARQUET)")
+        shard_files.append(str(partition_dir / "*.parquet"))
+    return shard_files
+
+
+def _worker_temp_directory(work_dir: str, name: str, config: Optional[Dict[str, Any]]) -> str:
+    """
+    Return a worker's own spill directory, inside the configured temp_directory or work_dir.
+
+    DuckDB gives its spill files the same names in every process, so workers sharing a
+    temp_directory would overwrite each other's spilled data.
+    """
+    return os.path.join((config or {}).get("temp_directory") or work_dir, f"{name}.tmp")
+
+
+def _connect_worker(work_dir: str, name: str, config: Optional[Dict[str, Any]]) -> duckdb.DuckDBPyConnection:
+    """Open a worker's own database file, so it can spill to its own directory beyond its memory limit."""
+    config = {**(config or {}), "temp_directory": _worker_temp_directory(work_dir, name, config)}
+    return duckdb.connect(os.path.join(work_dir, f"{name}.duckdb"), config=config)
+
+
+def _close_worker(conn: duckdb.DuckDBPyConnection, work_dir: str, name: str, config: Optional[Dict[str, Any]]) -> None:
+    """Close a worker's connection and remove its database file and spill directory."""
+    conn.close()
+    os.remove(os.path.join(work_dir, f"{name}.duckdb"))
+    shutil.rmtree(_worker_temp_directory(work_dir, name, config), ignore_errors=True)
+
+
+def _write_tables(conn: duckdb.DuckDBPyConnection, tables: List[str], output_dir: str, name: str) -> None:
+    """Write a worker's result tables to {output_dir}/{table}/{name}.parquet."""
+    for table in tables:
+        os.makedirs(os.path.join(output_dir, table), exist_ok=True)
+        conn.execute(f"COPY {table} TO '{os.path.join(output_dir, table, f'{name}.parquet')}' (FORMAT PARQUET)")
+
+
+def _merge_node_shard(
+    shard_files: str,
+    shard: int,
+    work_dir: str,
+    config: Optional[Dict[str, Any]] = None,
+    node_merge_strategy: str = "first",
+    source_priority: Optional[List[str]] = None
+) -> None:
+    """Deduplicate a node shard and aggregate its node stats."""
+    conn = _connect_worker(work_dir, f"nodes-{shard}", config)
+    try:
+        conn.execute(f"CREATE TABLE nodes AS SELECT * FROM read_parquet('{shard_files}', hive_partitioning = false)")
+        _classify_nodes(conn, source_priority=None if node_merge_strategy == "first" else source_priority)
+        _split_classified_nodes(conn, union_multivalued=node_merge_strategy == "union")
+        _create_node_stats(conn)
+        _write_tables(conn, ["nodes", "duplicate_nodes", "node_stats"], work_dir, f"shard-{shard}")
+    finally:
+        _close_worker(conn, work_dir, f"nodes-{shard}", config)
+
+
+def _write_node_lookup(conn: duckdb.DuckDBPyConnection, node_files: str, lookup_file: Path) -> None:
+    """
+    Write the clean nodes' join key and category to a single Parquet file.
+
+    The join key is node_key when the nodes were interned with intern_node_ids, and id
+    otherwise; these are the only node columns edge workers use, so each of them hashes
+    two columns of every node rather than the whole node table.
+    """
+    nodes = f"read_parquet('{node_files}')"
+    key_column = NODE_KEY_COLUMN if NODE_KEY_COLUMN in _get_column_types(conn, nodes) else "id"
+    conn.execute(f"COPY (SELECT {key_column}, category FROM {nodes}) TO '{lookup_file}' (FORMAT PARQUET)")
+
+
+def _merge_edge_shard(
+    shard_files: str,
+    shard: int,
+    work_dir: str,
+    node_lookup: str,
+    config: Optional[Dict[str, Any]] = None,
+    edge_stats: bool = True
+) -> None:
+    """
+    Deduplicate an edge shard and drop its dangling edges, checking them against the
+    node lookup of all shards, then aggregate its edge stats if edge_stats is set.
+    """
+    conn = _connect_worker(work_dir, f"edges-{shard}", config)
+    try:
+        conn.execute(f"CREATE TABLE edges AS SELECT * FROM read_parquet('{shard_files}', hive_partitioning = false)")
+        conn.execute(f"CREATE VIEW nodes AS SELECT * FROM read_parquet('{node_lookup}')")
+        _classify_edges(conn)
+        _split_classified_edges(conn)
+        tables = ["edges", "duplicate_edges", "dangling_edges"]
+        if edge_stats:
+            _create_edge_stats(conn)
+            tables.append("edge_stats")
+        _write_tables(conn, tables, work_dir, f"shard-{shard}")
+    finally:
+        _close_worker(conn, work_dir, f"edges-{shard}", config)
+
+
+def _collapse_triple_shard(
+    shard_files: str,
+    shard: int,
+    work_dir: str,
+    node_lookup: str,
+    config: Optional[Dict[str, Any]] = None,
+    qualifier_columns: Optional[List[str]] = None
+) -> None:
+    """Collapse the edges of a shard of clean edges split by subject, then aggregate its edge stats."""
+    conn = _connect_worker(work_dir, f"triples-{shard}", config)
+    try:
+        conn.execute(f"CREATE TABLE edges AS SELECT * FROM read_parquet('{shard_files}', hive_partitioning = false)")
+        conn.execute(f"CREATE VIEW nodes AS SELECT * FROM read_parquet('{node_lookup}')")
+        _collapse_triples(conn, qualifier_columns)
+        _create_edge_stats(conn)
+        _write_tables(conn, ["edges", "collapsed_edges", "edge_stats"], os.path.join(work_dir, "triples"), f"shard-{shard}")
+    finally:
+        _close_worker(conn, work_dir, f"triples-{shard}", config)
+
+
+def _run_shards(executor: ProcessPoolExecutor, worker, shard_files: List[str], work_dir: str) -> None:
+    """Run a worker function on every shard, raising the first worker error."""
+    futures = [executor.submit(worker, files, shard, work_dir) for shard, files in enumerate(shard_files)]
+    for future in futures:
+        future.result()
+
+
+def sharded_merge_and_clean(
+    conn: duckdb.DuckDBPyConnection,
+    shards: int,
+    config: Optional[Dict[str, Any]] = None,
+    processes: Optional[int] = None,
+    work_dir: Optional[str] = None,
+    node_merge_strategy: str = "first",
+    source_priority: Optional[List[str]] = None,
+    dedup_triples: bool = False,
+    qualifier_columns: Optional[List[str]] = None
+) -> None:
+    """
+    Perform merge_and_clean and create_qc_aggregations across hash shards in worker processes.
+
+    Creates the same clean nodes and edges, QC tables and stats tables as the single-process
+    path. Nodes are sharded by id and edges by id for deduplication and dangling checks,
+    against a lookup of the key and category of the clean nodes of all shards; with
+    dedup_triples the clean edges are sharded again by subject to collapse triples. Each
+    worker opens its own DuckDB database with config, so a memory limit in it applies to
+    each worker, and spills to its own subdirectory of the configured temp_directory.
+
+    Workers are started with the spawn method, which re-imports the calling script in each
+    worker, so scripts calling this function need an ``if __name__ == "__main__":`` guard.
+
+    Args:
+        conn: DuckDB connection with nodes and edges tables
+        shards: Number of shards to split nodes and edges into
+        config: Optional DuckDB configuration for the worker connections (see duckdb_config)
+        processes: Optional number of worker processes (defaults to the smaller of shards and CPU count)
+        work_dir: Optional directory for shard files (defaults to a temporary directory)
+        node_merge_strategy: "first", "priority" or "union" (defaults to "first")
+        source_priority: Optional list of provided_by values, most preferred first
+        dedup_triples: Whether to collapse edges with the same triple and qualifiers (defaults to False)
+        qualifier_columns: Optional list of qualifier columns that are part of the triple dedup key
+    """
+    if node_merge_strategy not in NODE_MERGE_STRATEGIES:
+        raise ValueError(f"Unknown node merge strategy {node_merge_strategy}, "
+                         f"expected one of {', '.join(NODE_MERGE_STRATEGIES)}")
+    processes = processes or min(shards, os.cpu_count() or 1)
+
+    with tempfile.TemporaryDirectory(dir=work_dir, prefix="cat-merge-shards-") as shard_dir:
+        shard_dir = Path(shard_dir)
+        node_shards = _partition_table(conn, "nodes", "id", shards, shard_dir / "input" / "nodes")
+        edge_shards = _partition_table(conn, "edges", "id", shards, shard_dir / "input" / "edges")
+
+        # Workers are spawned rather than forked from this process, which holds an open DuckDB connection
+        context = multiprocessing.get_context("spawn")
+        with ProcessPoolExecutor(max_workers=processes, mp_context=context) as executor:
+            _run_shards(executor, partial(_merge_node_shard, config=config, node_merge_strategy=node_merge_strategy,
+                                          source_priority=source_priority), node_shards, str(shard_dir))
+
+            node_lookup = shard_dir / "node_lookup.parquet"
+            _write_node_lookup(conn, str(shard_dir / "nodes" / "*.parquet"), node_lookup)
+            _run_shards(executor, partial(_merge_edge_shard, node_lookup=str(node_lookup), config=config,
+                                          edge_stats=not dedup_triples), edge_shards, str(shard_dir))
+
+            if dedup_triples:
+                clean_edges = f"read_parquet('{shard_dir / 'edges' / '*.parquet'}')"
+                triple_shards = _partition_table(conn, clean_edges, "subject", shards, shard_dir / "input" / "triples")
+                _run_shards(executor, partial(_collapse_triple_shard, node_lookup=str(node_lookup), config=config,
+                                              qualifier_columns=qualifier_columns), triple_shards, str(shard_dir))
+
+        edge_dir = shard_dir / "triples" if dedup_triples else shard_dir
+        outputs = {
+            "nodes": shard_dir / "nodes",
+            "duplicate_nodes": shard_dir / "duplicate_nodes",
+            "edges": edge_dir / "edges",
+            "duplicate_edges": shard_dir / "duplicate_edges",
+            "dangling_edges": shard_dir / "dangling_edges",
+        }
+        if dedup_triples:
+            outputs["collapsed_edges"] = edge_dir / "collapsed_edges"
+        else:
+            # Don't report edges collapsed by an earlier merge into the same database
+            conn.execute("DROP TABLE IF EXISTS collapsed_edges")
+        for table, table_dir in outputs.items():
+            conn.execute(f"CREATE OR REPLACE TABLE {table} AS SELECT * FROM read_parquet('{table_dir / '*.parquet'}')")
+
+        # Shard stats are partial counts of the same groups, so they are summed per group
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE node_stats AS
+            SELECT provided_by, category, namespace, CAST(SUM(count) AS BIGINT) as count
+            FROM read_parquet('{shard_dir / 'node_stats' / '*.parquet'}')
+            GROUP BY ALL
+        """)
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE edge_stats AS
+            SELECT provided_by, edge_category, predicate, subject_namespace, object_namespace,
+                subject_category, object_category, CAST(SUM(count) AS BIGINT) as count
+            FROM read_parquet('{edge_dir / 'edge_stats' / '*.parquet'}')
+            GROUP BY ALL
+        """)
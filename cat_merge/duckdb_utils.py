@@ -1,48 +1,369 @@
+import csv
 import duckdb
+import glob
+import gzip
+import hashlib
+import io
+import json
 import os
-from typing import List, Optional, Union
+import re
+import tarfile
+from concurrent.futures import ThreadPoolExecutor
+from typing import IO, TYPE_CHECKING, Any, Dict, Iterator, List, Optional, Tuple, Union
 from pathlib import Path
-from cat_merge.schema_utils import get_schema_parser, split_multivalued_field
+from cat_merge.schema_utils import (
+    get_cache_dir, get_schema_fingerprint, get_schema_parser, load_column_spec, split_multivalued_field
+)
 
+if TYPE_CHECKING:
+    # pandas is only imported to stream tar archive members
+    import pandas as pd
 
-def _generate_select_with_multivalued_splits(conn: duckdb.DuckDBPyConnection, temp_table: str, schema_path: Optional[str] = None) -> str:
+
+# Node/edge file extensions read by the DuckDB engine; compressed files are
+# stream-decompressed by read_csv based on their extension
+TSV_FILE_EXTENSIONS = ('.tsv', '.tsv.gz', '.tsv.zst')
+PARQUET_FILE_EXTENSIONS = ('.parquet',)
+KG_FILE_EXTENSIONS = TSV_FILE_EXTENSIONS + PARQUET_FILE_EXTENSIONS
+
+# Compression of tar archive members, keyed by the TSV file extensions read from archives
+TAR_MEMBER_COMPRESSION = {'.tsv': None, '.tsv.gz': 'gzip', '.tsv.zst': 'zstd'}
+
+# Number of rows per batch when streaming tar archive members into DuckDB
+TAR_CHUNK_SIZE = 100_000
+
+# read_csv options that skip malformed lines but record them in per-connection temp
+# tables, which _collect_rejects moves into the persistent rejects table
+REJECTS_OPTIONS = "store_rejects=true, rejects_table='reject_errors', rejects_scan='reject_scans'"
+
+# Block size used when hashing node/edge files for incremental merges
+HASH_BLOCK_SIZE = 1024 * 1024
+
+# Low-cardinality columns that can be stored as ENUMs, keyed by table
+LOW_CARDINALITY_COLUMNS = {
+    "nodes": ("category", "provided_by"),
+    "edges": ("category", "predicate", "provided_by"),
+}
+
+# Columns with more distinct values than this are left as VARCHAR
+MAX_ENUM_VALUES = 65_535
+
+# Ways to choose one mapping when an object_id is mapped to more than one subject_id
+MAPPING_CONFLICT_POLICIES = ("mapping_source", "confidence", "predicate")
+
+# Preference order of SSSOM mapping predicates for the 'predicate' conflict policy
+MAPPING_PREDICATE_PRIORITY = (
+    "skos:exactMatch",
+    "owl:equivalentClass",
+    "skos:closeMatch",
+    "skos:narrowMatch",
+    "skos:broadMatch",
+    "skos:relatedMatch",
+)
+
+# Maximum number of mapping hops followed when resolving chained mappings
+MAX_MAPPING_DEPTH = 10
+
+# Ways to merge the rows of a node id that is provided more than once
+NODE_MERGE_STRATEGIES = ("first", "priority", "union")
+
+# Edge columns that distinguish otherwise identical (subject, predicate, object) triples, when not configured
+EDGE_QUALIFIER_COLUMNS = ("negated", "qualified_predicate", "qualifiers")
+
+# Integer surrogate key columns added by intern_node_ids, which are left out of output files
+NODE_KEY_COLUMN = "node_key"
+EDGE_KEY_COLUMNS = {"subject": "subject_key", "object": "object_key"}
+
+# Cached mapping tables are keyed by this format; bump it when the mappings table changes shape
+MAPPING_CACHE_FORMAT = 1
+
+
+def duckdb_config(
+    memory_limit: Optional[str] = None,
+    threads: Optional[int] = None,
+    temp_directory: Optional[str] = None,
+    preserve_insertion_order: Optional[bool] = None
+) -> Dict[str, Any]:
     """
-    Generate a SELECT statement that splits pipe-delimited multivalued fields into arrays.
-    
+    Build a DuckDB connection configuration from resource settings.
+
+    Settings left as None are not included, so DuckDB's defaults apply.
+
+    Args:
+        memory_limit: Maximum memory DuckDB may use before spilling (e.g. '16GB')
+        threads: Number of threads DuckDB may use
+        temp_directory: Directory DuckDB spills to when memory_limit is reached
+        preserve_insertion_order: Whether results must keep insertion order; disabling
+            this lets large scans and copies run with less memory
+
+    Returns:
+        Configuration dictionary for duckdb.connect
+    """
+    settings = {
+        "memory_limit": memory_limit,
+        "threads": threads,
+        "temp_directory": temp_directory,
+        "preserve_insertion_order": preserve_insertion_order
+    }
+    return {key: value for key, value in settings.items() if value is not None}
+
+
+def _get_provided_by(file_path: str) -> str:
+    """
+    Get the provided_by value for a node or edge file: its name without the KG file extension.
+
+    Args:
+        file_path: Path to a node or edge file
+
+    Returns:
+        File name with any recognized (and compressed) extension removed
+    """
+    name = Path(file_path).name
+    for extension in sorted(KG_FILE_EXTENSIONS, key=len, reverse=True):
+        if name.endswith(extension):
+            return name[:-len(extension)]
+    return Path(file_path).stem
+
+
+def _find_kg_files(source: str, match_pattern: str) -> List[str]:
+    """
+    Find node or edge files in a directory, including compressed TSV and Parquet files.
+
+    Args:
+        source: Directory to search
+        match_pattern: String the file name must end with, before the extension (e.g. '_nodes')
+
+    Returns:
+        Sorted list of matching file paths
+    """
+    files = []
+    for extension in KG_FILE_EXTENSIONS:
+        files.extend(glob.glob(f"{source}/*{match_pattern}{extension}"))
+    return sorted(files)
+
+
+def _read_csv_sql(file_path: str, column_types: Optional[Dict[str, str]] = None, comment: Optional[str] = None) -> str:
+    """
+    Build the read_csv table function call used for node, edge and mapping files.
+
+    Malformed lines are skipped and recorded in the connection's reject tables
+    (see REJECTS_OPTIONS and _collect_rejects) rather than dropped silently.
+
+    Args:
+        file_path: Path of the file to read
+        column_types: Optional column names and types, in file order. When given, the file
+            is read with these explicit columns and is not sniffed.
+        comment: Optional comment character; lines starting with it are skipped
+
+    Returns:
+        SQL table function expression
+    """
+    comment_option = f"comment='{comment}',\n                              " if comment else ""
+    if column_types is not None:
+        columns_sql = "{" + ", ".join(f"'{col_name}': '{col_type}'" for col_name, col_type in column_types.items()) + "}"
+        return f"""read_csv('{file_path}',
+                              columns={columns_sql},
+                              header=true,
+                              auto_detect=false,
+                              delim='\t',
+                              quote='',
+                              escape='',
+                              {comment_option}{REJECTS_OPTIONS})"""
+    return f"""read_csv_auto('{file_path}',
+                              delim='\t',
+                              quote='',
+                              all_varchar=true,
+                              {comment_option}{REJECTS_OPTIONS})"""
+
+
+def _read_parquet_sql(file_path: str) -> str:
+    """Build the read_parquet table function call used for node and edge files."""
+    return f"read_parquet('{file_path}')"
+
+
+def _is_parquet(file_path: str) -> bool:
+    """Check whether a node or edge file is a Parquet file."""
+    return file_path.endswith(PARQUET_FILE_EXTENSIONS)
+
+
+def _read_file_sql(file_path: str) -> str:
+    """Build the table function call for a single TSV or Parquet node/edge file."""
+    return _read_parquet_sql(file_path) if _is_parquet(file_path) else _read_csv_sql(file_path)
+
+
+def _create_rejects_table(conn: duckdb.DuckDBPyConnection, replace: bool = True) -> None:
+    """Create the rejects table for lines of input files that could not be parsed (empty if replace is set)."""
+    create = "CREATE OR REPLACE TABLE" if replace else "CREATE TABLE IF NOT EXISTS"
+    conn.execute(f"""
+        {create} rejects (
+            provided_by VARCHAR,
+            file VARCHAR,
+            line BIGINT,
+            error_type VARCHAR,
+            error VARCHAR,
+            csv_line VARCHAR
+        )
+    """)
+
+
+def _collect_rejects(conn: duckdb.DuckDBPyConnection, sources: Dict[str, str]) -> None:
+    """
+    Move lines rejected by read_csv on this connection into the rejects table.
+
+    Each rejected line is recorded once, with its error types and first error. The connection's
+    temporary reject tables are dropped afterwards so lines are not collected twice.
+
+    Args:
+        conn: DuckDB connection or cursor that ran the reads
+        sources: Paths of the files that were read, mapped to their provided_by values
+    """
+    has_rejects = conn.execute("""
+        SELECT COUNT(*) FROM duckdb_tables() WHERE temporary AND table_name = 'reject_errors'
+    """).fetchone()[0] > 0
+    if not has_rejects or not sources:
+        return
+
+    source_values = ", ".join(f"('{file_path}', '{provided_by}')" for file_path, provided_by in sources.items())
+    conn.execute(f"""
+        INSERT INTO rejects
+        SELECT 
+            f.provided_by,
+            s.file_path as file,
+            e.line,
+            string_agg(DISTINCT e.error_type, '; ') as error_type,
+            first(e.error_message ORDER BY e.column_idx) as error,
+            any_value(e.csv_line) as csv_line
+        FROM reject_errors e
+        JOIN reject_scans s ON e.scan_id = s.scan_id AND e.file_id = s.file_id
+        JOIN (VALUES {source_values}) f(file_path, provided_by) ON s.file_path = f.file_path
+        GROUP BY f.provided_by, s.file_path, e.line
+        ORDER BY s.file_path, e.line
+    """)
+    conn.execute("DROP TABLE temp.reject_errors")
+    conn.execute("DROP TABLE temp.reject_scans")
+
+
+def _table_exists(conn: duckdb.DuckDBPyConnection, table_name: str) -> bool:
+    """Check whether a (non-temporary) table exists in the database."""
+    return conn.execute(
+        "SELECT COUNT(*) FROM duckdb_tables() WHERE NOT temporary AND table_name = ?", [table_name]
+    ).fetchone()[0] > 0
+
+
+def _read_tsv_header(conn: duckdb.DuckDBPyConnection, file_path: str) -> List[str]:
+    """Read the column names from the header line of a (possibly compressed) TSV file without sniffing it."""
+    header = conn.execute(f"""
+        SELECT line
+        FROM read_csv('{file_path}',
+                      columns={{'line': 'VARCHAR'}},
+                      header=false,
+                      auto_detect=false,
+                      delim='\x01',
+                      quote='',
+                      escape='')
+        LIMIT 1
+    """).fetchone()
+    return header[0].split('\t') if header and header[0] else []
+
+
+def _get_explicit_column_types(conn: duckdb.DuckDBPyConnection, file_path: str, schema_parser, column_spec: Optional[Dict[str, str]] = None) -> Dict[str, str]:
+    """
+    Resolve explicit column types for a TSV file from its header.
+
+    Multivalued fields are read as VARCHAR so they can be split into arrays. Other columns
+    take their type from the column spec if one is given, otherwise from the range of the
+    schema slot, defaulting to VARCHAR.
+
     Args:
         conn: DuckDB connection
-        temp_table: Name of temporary table to read from
-        schema_path: Optional schema path for multivalued field detection
-        
+        file_path: Path to the TSV file
+        schema_parser: Schema parser used for multivalued field and type detection
+        column_spec: Optional mapping of column names to DuckDB types
+
     Returns:
-        SQL SELECT statement with appropriate column transformations
+        Column names mapped to DuckDB types, in file order
+    """
+    column_types = {}
+    for col_name in _read_tsv_header(conn, file_path):
+        if _is_multivalued(col_name, schema_parser):
+            column_types[col_name] = 'VARCHAR'
+        elif column_spec is not None:
+            column_types[col_name] = column_spec.get(col_name, 'VARCHAR')
+        elif schema_parser:
+            column_types[col_name] = schema_parser.get_field_type(col_name)
+        else:
+            column_types[col_name] = 'VARCHAR'
+    return column_types
+
+
+def _is_multivalued(col_name: str, schema_parser) -> bool:
+    """Check whether a column is multivalued according to the schema parser."""
+    if not schema_parser:
+        return False
+    return schema_parser.is_field_multivalued(col_name)
+
+
+def _create_table_with_columns(conn: duckdb.DuckDBPyConnection, table_name: str, column_types: Dict[str, str], schema_parser, keep_types: bool = False) -> None:
+    """
+    Create an empty table for the given input columns plus provided_by.
+
+    Multivalued columns are typed as VARCHAR[] to match the multivalued projection,
+    everything else as VARCHAR, or as its input type when keep_types is set. provided_by
+    is created where it appears in column_types, or after the other columns if it doesn't.
+    """
+    column_definitions = []
+    for col_name, col_type in column_types.items():
+        if col_name == 'provided_by':
+            column_definitions.append("provided_by VARCHAR")
+            continue
+        if col_name == 'filename':
+            continue
+        if _is_multivalued(col_name, schema_parser):
+            col_type = 'VARCHAR[]'
+        elif not keep_types:
+            col_type = 'VARCHAR'
+        column_definitions.append(f"{col_name} {col_type}")
+    if 'provided_by' not in column_types:
+        column_definitions.append("provided_by VARCHAR")
+    conn.execute(f"CREATE OR REPLACE TABLE {table_name} ({', '.join(column_definitions)})")
+
+
+def _build_select_with_multivalued_splits(column_types: Dict[str, str], schema_parser, keep_types: bool = False) -> str:
+    """
+    Build SELECT clause columns, splitting pipe-delimited multivalued fields into arrays.
+
+    Columns that are not VARCHAR (e.g. typed Parquet columns) are cast so the result
+    has the same types as a TSV read: VARCHAR[] for multivalued fields, VARCHAR otherwise.
+    With keep_types, typed single-valued columns are selected as they are.
+
+    Args:
+        column_types: Column names of the relation being selected from, mapped to their types
+        schema_parser: Schema parser used for multivalued field detection
+        keep_types: Whether to keep the type of single-valued, non-VARCHAR columns
+
+    Returns:
+        SQL SELECT column list with appropriate column transformations
     """
-    # Get column names from the temporary table
-    columns_result = conn.execute(f"DESCRIBE {temp_table}").fetchall()
-    column_names = [col[0] for col in columns_result]
-    
-    # Get schema parser if available
-    try:
-        schema_parser = get_schema_parser(schema_path) if schema_path or True else None
-    except Exception:
-        schema_parser = None
-    
-    # Build SELECT clause with conditional column transformation
     select_parts = []
-    for col_name in column_names:
+    for col_name, col_type in column_types.items():
         # Skip filename and provided_by (handled separately)
         if col_name in ('filename', 'provided_by'):
             continue
-            
-        # Check if this column is multivalued according to schema
-        is_multivalued = False
-        if schema_parser:
-            try:
-                is_multivalued = schema_parser.is_field_multivalued(col_name)
-            except Exception:
-                is_multivalued = False
-        
-        if is_multivalued:
+
+        is_multivalued = _is_multivalued(col_name, schema_parser)
+        if col_type.endswith('[]'):
+            if is_multivalued:
+                select_parts.append(f"CAST({col_name} AS VARCHAR[]) as {col_name}")
+            else:
+                select_parts.append(f"array_to_string({col_name}, '|') as {col_name}")
+        elif col_type != 'VARCHAR':
+            if is_multivalued:
+                select_parts.append(f"[CAST({col_name} AS VARCHAR)] as {col_name}")
+            elif keep_types:
+                select_parts.append(f"{col_name}")
+            else:
+                select_parts.append(f"CAST({col_name} AS VARCHAR) as {col_name}")
+        elif is_multivalued:
             # Split pipe-delimited values into arrays, handle empty/null values
             select_parts.append(f"""
                 CASE 
@@ -52,10 +373,40 @@ def _generate_select_with_multivalued_splits(conn: duckdb.DuckDBPyConnection, te
         else:
             # Keep as regular string column
             select_parts.append(f"{col_name}")
-    
+
     return ",\n                ".join(select_parts)
 
 
+def _get_column_types(conn: duckdb.DuckDBPyConnection, relation: str) -> Dict[str, str]:
+    """Describe a table or table function expression and return its column names and types."""
+    columns_result = conn.execute(f"DESCRIBE SELECT * FROM {relation}").fetchall()
+    return {col[0]: col[1] for col in columns_result}
+
+
+def _describe_file(conn: duckdb.DuckDBPyConnection, file_path: str, schema_parser, explicit_columns: bool = False, column_spec: Optional[Dict[str, str]] = None) -> Tuple[str, Dict[str, str]]:
+    """
+    Build the table function call for a single node or edge file and describe its columns.
+
+    With explicit_columns, TSV files are not sniffed: only their header line is read and
+    the column types come from the column spec or the schema.
+
+    Args:
+        conn: DuckDB connection
+        file_path: Path to a TSV or Parquet node/edge file
+        schema_parser: Schema parser used for multivalued field and type detection
+        explicit_columns: Whether to read TSV files with explicit column types
+        column_spec: Optional mapping of column names to DuckDB types
+
+    Returns:
+        Tuple of the table function expression and its column names mapped to types
+    """
+    if explicit_columns and not _is_parquet(file_path):
+        column_types = _get_explicit_column_types(conn, file_path, schema_parser, column_spec)
+        return _read_csv_sql(file_path, column_types=column_types), column_types
+    relation = _read_file_sql(file_path)
+    return relation, _get_column_types(conn, relation)
+
+
 def read_kg_files(
     source: str = None,
     nodes: List[str] = None,
@@ -63,359 +414,1317 @@ def read_kg_files(
     nodes_match: str = "_nodes",
     edges_match: str = "_edges",
     database_path: str = None,
-    schema_path: str = None
+    schema_path: str = None,
+    workers: int = 1,
+    explicit_columns: bool = False,
+    column_spec: str = None,
+    config: Optional[Dict[str, Any]] = None,
+    incremental: bool = False
 ) -> duckdb.DuckDBPyConnection:
     """
     Read knowledge graph files into DuckDB tables.
     
     Args:
-        source: Directory path containing node and edge files
+        source: Directory or tar archive containing node and edge files (.tsv, .tsv.gz, .tsv.zst or,
+            for directories, .parquet)
         nodes: List of node file paths
         edges: List of edge file paths
         nodes_match: String pattern to match node files
         edges_match: String pattern to match edge files
         database_path: Optional path to persistent database file (if None, uses in-memory)
-        schema_path: Optional path to LinkML schema file for multivalued field detection
+        schema_path: Optional path to LinkML schema file for multivalued field detection, or
+            KGX_SCHEMA ("kgx") to use the built-in KGX field list without loading a schema
+        workers: Number of files to sniff and load concurrently (1 loads files serially)
+        explicit_columns: Read TSV files with explicit column types from the schema instead of
+            sniffing them. Rows whose values do not parse as their column type are dropped.
+        column_spec: Optional path to a YAML file mapping column names to DuckDB types, used
+            instead of the schema for explicit column types (implies explicit_columns)
+        config: Optional DuckDB configuration (see duckdb_config) applied to the connection
+        incremental: Keep the loaded files in the database and, on later runs against the same
+            database, reload only the provided_by partitions whose files changed. Not supported
+            for tar archive sources, which are always loaded in full, replacing earlier rejects.
+
+    Tar archive members are streamed through pandas rather than read_csv, so workers,
+    explicit_columns and column_spec can't be combined with a tar archive source and raise a
+    ValueError. Their lines with the wrong number of fields are rejected as read_csv rejects them.
         
     Returns:
         DuckDB connection with 'nodes' and 'edges' tables loaded
     """
-    conn = duckdb.connect(database_path or ":memory:")
+    conn = duckdb.connect(database_path or ":memory:", config=config or {})
+    _create_rejects_table(conn, replace=not incremental)
+
+    column_types = None
+    if column_spec is not None:
+        column_types = load_column_spec(column_spec)
+        explicit_columns = True
     
     if source is not None:
         if nodes or edges:
             raise ValueError("Cannot specify both source directory and individual file lists")
         
         if not os.path.isdir(source):
-            raise ValueError(f"Source path {source} is not a directory")
-            
-        # Use glob patterns to read files with automatic source tracking
-        nodes_pattern = f"{source}/*{nodes_match}.tsv"
-        edges_pattern = f"{source}/*{edges_match}.tsv"
-        
-        # Create nodes table with provided_by from filename, excluding any input provided_by
-        conn.execute(f"""
-            CREATE TEMP TABLE temp_nodes AS
-            SELECT *
-            FROM read_csv_auto('{nodes_pattern}', 
-                              filename=true,
-                              delim='\t',
-                              quote='',
-                              all_varchar=true,
-                              union_by_name=true,
-                              ignore_errors=true)
-        """)
-        
-        # Generate SELECT with multivalued field splitting
-        select_columns = _generate_select_with_multivalued_splits(conn, 'temp_nodes', schema_path)
-        
-        conn.execute(f"""
-            CREATE OR REPLACE TABLE nodes AS
-            SELECT 
-                {select_columns},
-                regexp_extract(filename, '/([^/]+)\.tsv$', 1) as provided_by
-            FROM temp_nodes
-        """)        
-        
-        # Create edges table with provided_by from filename, excluding any input provided_by
-        conn.execute(f"""
-            CREATE TEMP TABLE temp_edges AS
-            SELECT *
-            FROM read_csv_auto('{edges_pattern}',
-                              filename=true, 
-                              delim='\t',
-                              quote='',
-                              all_varchar=true,
-                              union_by_name=true,
-                              ignore_errors=true)
-        """)
+            if not tarfile.is_tarfile(source):
+                raise ValueError(f"Source path {source} is not a directory or tar archive")
+
+            if workers != 1 or explicit_columns:
+                raise ValueError("workers, explicit_columns and column_spec are not supported for tar archive sources")
+
+            # Tar archives are always loaded in full, so rejects of earlier incremental runs are dropped too
+            _create_rejects_table(conn, replace=True)
+
+            # Stream archive members straight into DuckDB without extracting them to disk
+            with tarfile.open(source, "r:*") as tar:
+                _load_tar_members(conn, "nodes", tar, nodes_match, schema_path)
+                _load_tar_members(conn, "edges", tar, edges_match, schema_path)
+            return conn
+
+        nodes = _find_kg_files(source, nodes_match)
+        edges = _find_kg_files(source, edges_match)
+        if not nodes or not edges:
+            raise ValueError(f"Source path {source} must contain both *{nodes_match} and *{edges_match} files "
+                             f"with one of the extensions {', '.join(KG_FILE_EXTENSIONS)}")
+
+    elif not (nodes and edges):
+        raise ValueError("Must specify either source directory or both nodes and edges file lists")
+
+    if incremental:
+        # Rejected rows of unchanged files are kept, everything else is recorded again
+        _create_ingest_files_table(conn)
+        conn.execute("DELETE FROM rejects WHERE file NOT IN (SELECT file FROM ingest_files)")
+        _load_file_list_incremental(conn, "nodes", nodes, schema_path, workers, explicit_columns, column_types)
+        _load_file_list_incremental(conn, "edges", edges, schema_path, workers, explicit_columns, column_types)
+        return conn
+
+    # Each file gets its own scan so rejected lines can be traced back to their file;
+    # the scans are combined by column name straight into the final tables
+    _load_file_list(conn, "nodes", nodes, nodes_match, schema_path, workers, explicit_columns, column_types)
+    _load_file_list(conn, "edges", edges, edges_match, schema_path, workers, explicit_columns, column_types)
+    
+    return conn
+
+
+def _load_file_list(conn: duckdb.DuckDBPyConnection, table_name: str, files: List[str], match_pattern: str, schema_path: Optional[str] = None, workers: int = 1, explicit_columns: bool = False, column_spec: Optional[Dict[str, str]] = None):
+    """Load a list of files into a single table with provided_by column and multivalued field support."""
+    _create_rejects_table(conn, replace=False)
+    if workers > 1:
+        _load_file_list_parallel(conn, table_name, files, schema_path, workers, explicit_columns, column_spec)
+        return
+
+    schema_parser = get_schema_parser(schema_path)
+    
+    # Build UNION ALL query for all files with their provided_by values, reading
+    # each file directly rather than through a per-file temp table
+    union_parts = []
+    for file_path in files:
+        provided_by = _get_provided_by(file_path)
+        relation, column_types = _describe_file(conn, file_path, schema_parser, explicit_columns, column_spec)
         
         # Generate SELECT with multivalued field splitting
-        select_columns = _generate_select_with_multivalued_splits(conn, 'temp_edges', schema_path)
+        select_columns = _build_select_with_multivalued_splits(column_types, schema_parser, keep_types=explicit_columns)
         
-        conn.execute(f"""
-            CREATE OR REPLACE TABLE edges AS
+        union_parts.append(f"""
             SELECT 
                 {select_columns},
-                regexp_extract(filename, '/([^/]+)\.tsv$', 1) as provided_by
-            FROM temp_edges
+                '{provided_by}' as provided_by
+            FROM {relation}
         """)
-        
-    elif nodes and edges:
-        # Read individual file lists
-        _load_file_list(conn, "nodes", nodes, nodes_match, schema_path)
-        _load_file_list(conn, "edges", edges, edges_match, schema_path)
-        
-    else:
-        raise ValueError("Must specify either source directory or both nodes and edges file lists")
     
-    return conn
+    # Create table with UNION ALL of all files, matching columns by name
+    union_query = " UNION ALL BY NAME ".join(union_parts)
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        {union_query}
+    """)
+    _collect_rejects(conn, {file_path: _get_provided_by(file_path) for file_path in files})
+
+
+def _load_file_list_parallel(conn: duckdb.DuckDBPyConnection, table_name: str, files: List[str], schema_path: Optional[str], workers: int, explicit_columns: bool = False, column_spec: Optional[Dict[str, str]] = None):
+    """
+    Load a list of files into a single table using a pool of worker threads.
+
+    Each worker uses its own DuckDB cursor. Files are first sniffed concurrently to
+    determine the union of their columns, then appended concurrently by name into
+    the target table, which has its columns in the same order as a serial load.
+
+    Args:
+        conn: DuckDB connection
+        table_name: Name of the table to create
+        files: List of file paths to load
+        schema_path: Optional schema path for multivalued field detection
+        workers: Maximum number of concurrent worker threads
+        explicit_columns: Whether to read TSV files with explicit column types instead of sniffing them
+        column_spec: Optional mapping of column names to DuckDB types used with explicit_columns
+    """
+    # Resolve the schema parser once, before handing work to the threads
+    schema_parser = get_schema_parser(schema_path)
+
+    def sniff(file_path: str) -> Tuple[str, Dict[str, str]]:
+        cursor = conn.cursor()
+        try:
+            return _describe_file(cursor, file_path, schema_parser, explicit_columns, column_spec)
+        finally:
+            cursor.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        described_files = list(executor.map(sniff, files))
+
+    # Union of columns in the order a serial load unions them by name: the first file's
+    # columns and provided_by, then columns first seen in later files
+    all_columns = {}
+    for _, column_types in described_files:
+        for col_name, col_type in column_types.items():
+            if col_name not in ('filename', 'provided_by'):
+                all_columns.setdefault(col_name, col_type)
+        all_columns.setdefault('provided_by', 'VARCHAR')
+    _create_table_with_columns(conn, table_name, all_columns, schema_parser, keep_types=explicit_columns)
+
+    def load(file_path: str, described_file: Tuple[str, Dict[str, str]]) -> None:
+        provided_by = _get_provided_by(file_path)
+        relation, column_types = described_file
+        select_columns = _build_select_with_multivalued_splits(column_types, schema_parser, keep_types=explicit_columns)
+        cursor = conn.cursor()
+        try:
+            cursor.execute(f"""
+                INSERT INTO {table_name} BY NAME
+                SELECT 
+                    {select_columns},
+                    '{provided_by}' as provided_by
+                FROM {relation}
+            """)
+            # Reject tables are temporary, so each cursor collects its own
+            _collect_rejects(cursor, {file_path: provided_by})
+        finally:
+            cursor.close()
+
+    with ThreadPoolExecutor(max_workers=workers) as executor:
+        # Consume the results so any worker exception is raised here
+        list(executor.map(load, files, described_files))
+
+
+def _create_ingest_files_table(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the table of node/edge file fingerprints used by incremental merges, if missing."""
+    conn.execute("""
+        CREATE TABLE IF NOT EXISTS ingest_files (
+            file VARCHAR,
+            table_name VARCHAR,
+            provided_by VARCHAR,
+            size BIGINT,
+            mtime_ns BIGINT,
+            sha256 VARCHAR,
+            columns VARCHAR[],
+            load_options VARCHAR
+        )
+    """)
+
+
+def _hash_file(file_path: str) -> str:
+    """Return the SHA-256 hex digest of a file's contents."""
+    digest = hashlib.sha256()
+    with open(file_path, "rb") as fh:
+        for block in iter(lambda: fh.read(HASH_BLOCK_SIZE), b""):
+            digest.update(block)
+    return digest.hexdigest()
+
+
+def _load_file_list_incremental(conn: duckdb.DuckDBPyConnection, table_name: str, files: List[str], schema_path: Optional[str] = None, workers: int = 1, explicit_columns: bool = False, column_spec: Optional[Dict[str, str]] = None):
+    """
+    Load a list of files into a table, reloading only the provided_by partitions whose files changed.
+
+    Loaded rows are kept in a persistent ingest_{table_name} table and each file's size,
+    modification time and content hash are recorded in ingest_files. A file counts as changed
+    when its content hash differs from the recorded one; the hash is only recomputed when
+    the size or modification time differ. Partitions of changed, new or removed files are
+    deleted and reloaded; all partitions are reloaded when the load options or the resolved
+    schema's slots differ from the recorded ones. Then table_name is rebuilt from
+    ingest_{table_name} with the columns of the current files, as a full load would create it.
+
+    Args:
+        conn: DuckDB connection to a persistent database
+        table_name: Name of the table to create ('nodes' or 'edges')
+        files: List of file paths to load
+        schema_path: Optional schema path for multivalued field detection
+        workers: Number of files of a partition to sniff and load concurrently
+        explicit_columns: Whether to read TSV files with explicit column types instead of sniffing them
+        column_spec: Optional mapping of column names to DuckDB types used with explicit_columns
+    """
+    ingest_table = f"ingest_{table_name}"
+    # Keyed on the schema actually resolved, so a changed default or edited schema reloads everything
+    load_options = repr((get_schema_fingerprint(get_schema_parser(schema_path)), explicit_columns, column_spec))
+    _create_ingest_files_table(conn)
+
+    stored = {}
+    if _table_exists(conn, ingest_table):
+        for file_path, provided_by, size, mtime_ns, sha256, columns, options in conn.execute("""
+            SELECT file, provided_by, size, mtime_ns, sha256, columns, load_options
+            FROM ingest_files WHERE table_name = ?
+        """, [table_name]).fetchall():
+            stored[file_path] = (provided_by, size, mtime_ns, sha256, columns, options)
+    if any(entry[5] != load_options for entry in stored.values()):
+        # Files read with other options would not match a full load, so start over
+        stored = {}
+    if not stored:
+        conn.execute(f"DROP TABLE IF EXISTS {ingest_table}")
+
+    # Group files into provided_by partitions and find the partitions to reload
+    partitions = {}
+    fingerprints = {}
+    changed = set()
+    for file_path in files:
+        provided_by = _get_provided_by(file_path)
+        partitions.setdefault(provided_by, []).append(file_path)
+        stat = os.stat(file_path)
+        previous = stored.get(file_path)
+        if previous is not None and previous[0] == provided_by and previous[1:3] == (stat.st_size, stat.st_mtime_ns):
+            fingerprints[file_path] = (stat.st_size, stat.st_mtime_ns, previous[3])
+            continue
+        sha256 = _hash_file(file_path)
+        fingerprints[file_path] = (stat.st_size, stat.st_mtime_ns, sha256)
+        if previous is None or previous[0] != provided_by or previous[3] != sha256:
+            changed.add(provided_by)
+    for file_path, previous in stored.items():
+        if file_path not in fingerprints:
+            changed.add(previous[0])
+
+    # Drop the changed partitions along with their rejected rows, then reload them one by one
+    if changed:
+        reloaded_files = [f for f in list(fingerprints) + list(stored) if _get_provided_by(f) in changed]
+        conn.execute("DELETE FROM rejects WHERE file IN (SELECT unnest(?))", [reloaded_files])
+        if _table_exists(conn, ingest_table):
+            conn.execute(f"DELETE FROM {ingest_table} WHERE provided_by IN (SELECT unnest(?))", [sorted(changed)])
+
+    partition_columns = {entry[0]: entry[4] for entry in stored.values()}
+    for provided_by in sorted(changed):
+        partition_files = partitions.get(provided_by)
+        if not partition_files:
+            continue
+        _load_file_list(conn, "ingest_staging", partition_files, "", schema_path, workers, explicit_columns, column_spec)
+        staging_types = {col: col_type for col, col_type in _get_column_types(conn, "ingest_staging").items()
+                         if col != 'provided_by'}
+        if not _table_exists(conn, ingest_table):
+            conn.execute(f"CREATE TABLE {ingest_table} AS SELECT * FROM ingest_staging")
+        else:
+            ingest_types = _get_column_types(conn, ingest_table)
+            for col_name, col_type in staging_types.items():
+                if col_name not in ingest_types:
+                    conn.execute(f"ALTER TABLE {ingest_table} ADD COLUMN {col_name} {col_type}")
+            conn.execute(f"INSERT INTO {ingest_table} BY NAME SELECT * FROM ingest_staging")
+        partition_columns[provided_by] = list(staging_types)
+    conn.execute("DROP TABLE IF EXISTS ingest_staging")
+
+    # Record the fingerprints of the current files
+    conn.execute("DELETE FROM ingest_files WHERE table_name = ?", [table_name])
+    conn.executemany("INSERT INTO ingest_files VALUES (?, ?, ?, ?, ?, ?, ?, ?)", [
+        [file_path, table_name, _get_provided_by(file_path), size, mtime_ns, sha256,
+         partition_columns[_get_provided_by(file_path)], load_options]
+        for file_path, (size, mtime_ns, sha256) in fingerprints.items()
+    ])
+
+    # Columns of the current files in the order a full load unions them by name: the first
+    # file's columns and provided_by, then columns first seen in later files. Columns that
+    # only removed files had are dropped.
+    columns = []
+    for file_path in files:
+        for col_name in partition_columns[_get_provided_by(file_path)]:
+            if col_name not in columns:
+                columns.append(col_name)
+        if 'provided_by' not in columns:
+            columns.append('provided_by')
+    for col_name in _get_column_types(conn, ingest_table):
+        if col_name not in columns:
+            conn.execute(f"ALTER TABLE {ingest_table} DROP COLUMN {col_name}")
+
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE {table_name} AS
+        SELECT {', '.join(columns)} FROM {ingest_table}
+    """)
+
+
+def _open_tar_member(tar: tarfile.TarFile, member: tarfile.TarInfo, compression: Optional[str]) -> IO[str]:
+    """Open a tar archive member as a stream of decompressed text."""
+    fh = tar.extractfile(member)
+    if compression == 'gzip':
+        fh = gzip.GzipFile(fileobj=fh)
+    elif compression == 'zstd':
+        import zstandard
+        fh = zstandard.ZstdDecompressor().stream_reader(fh)
+    return io.TextIOWrapper(fh, encoding="utf-8", newline="")
+
+
+def _read_tar_member_chunks(fh: IO[str], chunk_size: int, rejected_lines: List[Tuple[int, str, str, str]]) -> Iterator["pd.DataFrame"]:
+    """
+    Parse a TSV stream into string DataFrames of up to chunk_size rows, with empty values as NULL.
+
+    Lines with a different number of fields than the header are left out and appended to
+    rejected_lines as (line, error_type, error, csv_line), numbered and described as read_csv
+    reports them, so rejects from tar archives and directories look the same.
+    """
+    import pandas as pd
+
+    def to_frame(rows: List[List[str]]) -> pd.DataFrame:
+        df = pd.DataFrame(rows, columns=header, dtype="string")
+        return df.mask(df == "")
+
+    reader = csv.reader(fh, delimiter="\t", quoting=csv.QUOTE_NONE)
+    header = next(reader, None)
+    if header is None:
+        return
+    rows = []
+    chunks = 0
+    for fields in reader:
+        if not fields:
+            continue
+        if len(fields) != len(header):
+            error_type = "TOO MANY COLUMNS" if len(fields) > len(header) else "MISSING COLUMNS"
+            rejected_lines.append((reader.line_num, error_type,
+                                   f"Expected Number of Columns: {len(header)} Found: {len(fields)}", "\t".join(fields)))
+            continue
+        rows.append(fields)
+        if len(rows) == chunk_size:
+            yield to_frame(rows)
+            rows = []
+            chunks += 1
+    # A member without rows still adds its columns to the table
+    if rows or chunks == 0:
+        yield to_frame(rows)
+
+
+def _load_tar_members(conn: duckdb.DuckDBPyConnection, table_name: str, tar: tarfile.TarFile, match_pattern: str, schema_path: Optional[str] = None, chunk_size: int = TAR_CHUNK_SIZE):
+    """
+    Stream matching members of a tar archive into a single table with provided_by column.
+
+    Members are decompressed and parsed in batches of chunk_size rows, and each batch is
+    appended by name into the target table, so nothing is extracted to disk and memory
+    is bounded by the batch size. Columns first seen in later members are added as needed.
+    Lines with more or fewer fields than the header are skipped and recorded in the rejects
+    table with the member name and line number.
+
+    Args:
+        conn: DuckDB connection
+        table_name: Name of the table to create
+        tar: Open tar archive
+        match_pattern: String the member file name must end with, before the extension (e.g. '_nodes')
+        schema_path: Optional schema path for multivalued field detection
+        chunk_size: Number of rows per batch
+    """
+    schema_parser = get_schema_parser(schema_path)
+    table_columns = None
+
+    for member in tar.getmembers():
+        if not member.isfile():
+            continue
+        extension = next((ext for ext in sorted(TAR_MEMBER_COMPRESSION, key=len, reverse=True)
+                          if member.name.endswith(f"{match_pattern}{ext}")), None)
+        if extension is None:
+            continue
+
+        provided_by = _get_provided_by(member.name)
+        rejected_lines = []
+        with _open_tar_member(tar, member, TAR_MEMBER_COMPRESSION[extension]) as fh:
+            for chunk in _read_tar_member_chunks(fh, chunk_size, rejected_lines):
+                column_types = dict.fromkeys(chunk.columns, 'VARCHAR')
+                if table_columns is None:
+                    _create_table_with_columns(conn, table_name, column_types, schema_parser)
+                    table_columns = set(column_types)
+                for col_name in column_types:
+                    if col_name in table_columns or col_name in ('filename', 'provided_by'):
+                        continue
+                    col_type = "VARCHAR[]" if _is_multivalued(col_name, schema_parser) else "VARCHAR"
+                    conn.execute(f"ALTER TABLE {table_name} ADD COLUMN {col_name} {col_type}")
+                    table_columns.add(col_name)
+
+                select_columns = _build_select_with_multivalued_splits(column_types, schema_parser)
+                conn.register("tar_member_chunk", chunk)
+                try:
+                    conn.execute(f"""
+                        INSERT INTO {table_name} BY NAME
+                        SELECT 
+                            {select_columns},
+                            '{provided_by}' as provided_by
+                        FROM tar_member_chunk
+                    """)
+                finally:
+                    conn.unregister("tar_member_chunk")
+
+        if rejected_lines:
+            conn.executemany("INSERT INTO rejects VALUES (?, ?, ?, ?, ?, ?)", [
+                (provided_by, member.name, line, error_type, error, csv_line)
+                for line, error_type, error, csv_line in rejected_lines
+            ])
+
+    if table_columns is None:
+        raise ValueError(f"Tar archive {tar.name} does not contain any *{match_pattern} files")
+
+
+def encode_low_cardinality_columns(conn: duckdb.DuckDBPyConnection, max_values: int = MAX_ENUM_VALUES) -> None:
+    """
+    Store the low-cardinality columns of the nodes and edges tables as ENUMs.
+
+    Each column in LOW_CARDINALITY_COLUMNS that exists as VARCHAR (or VARCHAR[] for
+    multivalued columns) is converted to an ENUM of its distinct values, which shrinks
+    the tables and speeds up grouping and joining on these columns. The ENUM values are
+    sorted so ordering by an encoded column gives the same order as ordering the strings.
+    The ENUM types are inline rather than named, so rerunning against a persistent
+    database does not conflict with types from an earlier run.
+
+    Args:
+        conn: DuckDB connection with nodes and edges tables
+        max_values: Columns with more distinct values than this are left unencoded
+    """
+    for table_name, col_names in LOW_CARDINALITY_COLUMNS.items():
+        column_types = _get_column_types(conn, table_name)
+        replacements = []
+        for col_name in col_names:
+            col_type = column_types.get(col_name)
+            if col_type == 'VARCHAR':
+                values_query = f"SELECT DISTINCT {col_name} AS value FROM {table_name}"
+            elif col_type == 'VARCHAR[]':
+                values_query = f"SELECT DISTINCT unnest({col_name}) AS value FROM {table_name}"
+            else:
+                continue
+            values = [value for (value,) in conn.execute(f"""
+                SELECT value FROM ({values_query}) WHERE value IS NOT NULL ORDER BY value
+            """).fetchall()]
+            if not values or len(values) > max_values:
+                continue
+            enum_type = "ENUM({})".format(", ".join("'{}'".format(value.replace("'", "''")) for value in values))
+            if col_type.endswith('[]'):
+                enum_type += "[]"
+            replacements.append(f"CAST({col_name} AS {enum_type}) AS {col_name}")
+
+        if replacements:
+            conn.execute(f"""
+                CREATE OR REPLACE TABLE {table_name} AS
+                SELECT * REPLACE ({', '.join(replacements)}) FROM {table_name}
+            """)
+
+
+def _get_mapping_files(mappings: List[str]) -> Dict[str, str]:
+    """
+    Expand mapping file paths and glob patterns into files and their mapping_source values.
+
+    Files matched by a glob pattern are named by their file name without the .sssom.tsv
+    suffix, individually listed files by their stem.
+
+    Args:
+        mappings: List of mapping file paths or glob patterns
+
+    Returns:
+        Mapping file paths mapped to their mapping_source values
+    """
+    mapping_files = {}
+    for file_pattern in mappings:
+        # Check if it's a glob pattern or individual file
+        if '*' in file_pattern or '?' in file_pattern:
+            for file_path in sorted(glob.glob(file_pattern)):
+                match = re.search(r'([^/]+)\.sssom\.tsv$', file_path)
+                mapping_files[file_path] = match.group(1) if match else ''
+        else:
+            mapping_files[file_pattern] = Path(file_pattern).stem
+    return mapping_files
+
+
+def _mapping_filter_sql(
+    columns: Dict[str, str],
+    predicates: Optional[List[str]] = None,
+    justifications: Optional[List[str]] = None,
+    min_confidence: Optional[float] = None
+) -> str:
+    """
+    Build the WHERE clause that filters a mapping file's rows while it is scanned.
+
+    A filter on a column the file does not have excludes all of the file's rows,
+    as do rows with an empty value in a filtered column.
+
+    Args:
+        columns: Column names and types of the mapping file
+        predicates: Optional predicate_id values to keep
+        justifications: Optional mapping_justification values to keep
+        min_confidence: Optional minimum confidence to keep
+
+    Returns:
+        SQL WHERE clause, or an empty string when nothing is filtered
+    """
+    conditions = []
+    for column, values in (("predicate_id", predicates), ("mapping_justification", justifications)):
+        if values:
+            conditions.append(f"list_contains({_sql_list(values)}, {column})" if column in columns else "false")
+    if min_confidence is not None:
+        conditions.append(
+            f"TRY_CAST(confidence AS DOUBLE) >= {float(min_confidence)}" if "confidence" in columns else "false"
+        )
+    return f"WHERE {' AND '.join(conditions)}" if conditions else ""
+
+
+def get_mapping_cache_dir() -> Path:
+    """Get the directory parsed mapping tables are cached in (the mappings subdirectory of the cache directory)."""
+    return get_cache_dir() / "mappings"
+
+
+def _mapping_cache_key(
+    mapping_files: Dict[str, str],
+    predicates: Optional[List[str]] = None,
+    justifications: Optional[List[str]] = None,
+    min_confidence: Optional[float] = None
+) -> str:
+    """
+    Build the cache key of a mappings table from the content of its files and the read filters.
+
+    Files are identified by their content hash and mapping_source rather than their path,
+    so moved or copied mapping files still hit the cache.
+    """
+    key = {
+        "format": MAPPING_CACHE_FORMAT,
+        "files": [[mapping_source, _hash_file(file_path)] for file_path, mapping_source in mapping_files.items()],
+        "predicates": sorted(predicates or []),
+        "justifications": sorted(justifications or []),
+        "min_confidence": min_confidence,
+    }
+    return hashlib.sha256(json.dumps(key).encode()).hexdigest()
+
+
+def _restore_cached_mappings(conn: duckdb.DuckDBPyConnection, cache_path: Path, mapping_files: Dict[str, str]) -> bool:
+    """
+    Load the mappings table and its rejected lines from the cache, if they are cached.
+
+    Cached rejected lines are recorded against the current paths of their mapping files.
 
+    Returns:
+        Whether the mappings were loaded from the cache
+    """
+    rejects_path = cache_path.with_suffix(".rejects.parquet")
+    if not cache_path.exists() or not rejects_path.exists():
+        return False
 
-def _load_file_list(conn: duckdb.DuckDBPyConnection, table_name: str, files: List[str], match_pattern: str, schema_path: Optional[str] = None):
-    """Load a list of files into a single table with provided_by column and multivalued field support."""
-    
-    # Build UNION ALL query for all files with their provided_by values
-    union_parts = []
-    for file_path in files:
-        provided_by = Path(file_path).stem
-        
-        # Create temp table to check for provided_by column
-        temp_table = f"temp_{table_name}_{len(union_parts)}"
-        conn.execute(f"""
-            CREATE TEMP TABLE {temp_table} AS
-            SELECT *
-            FROM read_csv_auto('{file_path}',
-                              delim='\t',
-                              quote='',
-                              all_varchar=true,
-                              union_by_name=true,
-                              ignore_errors=true)
-        """)
-        
-        # Generate SELECT with multivalued field splitting
-        select_columns = _generate_select_with_multivalued_splits(conn, temp_table, schema_path)
-        
-        union_parts.append(f"""
-            SELECT 
-                {select_columns},
-                '{provided_by}' as provided_by
-            FROM {temp_table}
-        """)
-    
-    # Create table with UNION ALL of all files
-    union_query = " UNION ALL ".join(union_parts)
+    conn.execute(f"CREATE OR REPLACE TABLE mappings AS SELECT * FROM read_parquet('{cache_path}')")
+    _create_rejects_table(conn, replace=False)
+    source_values = ", ".join(f"('{file_path}', '{mapping_source}')" for file_path, mapping_source in mapping_files.items())
     conn.execute(f"""
-        CREATE OR REPLACE TABLE {table_name} AS
-        {union_query}
+        INSERT INTO rejects
+        SELECT r.provided_by, f.file_path, r.line, r.error_type, r.error, r.csv_line
+        FROM read_parquet('{rejects_path}') r
+        JOIN (VALUES {source_values}) f(file_path, provided_by) ON r.provided_by = f.provided_by
     """)
+    return True
+
+
+def _store_cached_mappings(conn: duckdb.DuckDBPyConnection, cache_path: Path, mapping_files: Dict[str, str]) -> None:
+    """
+    Write the mappings table and the rejected lines of its files to the cache.
+
+    Both files are written to temporary paths and renamed into place, the mappings
+    file last, so an interrupted run never leaves a partial cache entry behind.
+    """
+    cache_path.parent.mkdir(parents=True, exist_ok=True)
+    rejects_path = cache_path.with_suffix(".rejects.parquet")
+    file_list = _sql_list(list(mapping_files))
+    for table_query, path in (
+        (f"SELECT * FROM rejects WHERE list_contains({file_list}, file)", rejects_path),
+        ("SELECT * FROM mappings", cache_path),
+    ):
+        tmp_path = path.with_name(f"{path.name}.{os.getpid()}.tmp")
+        conn.execute(f"COPY ({table_query}) TO '{tmp_path}' (FORMAT PARQUET)")
+        os.replace(tmp_path, path)
 
 
-def read_mapping_files(conn: duckdb.DuckDBPyConnection, mappings: List[str]) -> None:
+def read_mapping_files(
+    conn: duckdb.DuckDBPyConnection,
+    mappings: List[str],
+    predicates: Optional[List[str]] = None,
+    justifications: Optional[List[str]] = None,
+    min_confidence: Optional[float] = None,
+    cache_dir: Optional[Union[str, Path]] = None
+) -> None:
     """
     Read SSSOM mapping files into DuckDB with filename tracking.
-    
+
+    Rows can be filtered by predicate_id, mapping_justification and confidence; the
+    filters are applied to each file as it is scanned, so unwanted rows are never
+    loaded into the mappings table.
+
+    With a cache_dir, the parsed mappings table is cached there as Parquet, keyed by
+    the content of the mapping files and the filters, and later reads of the same
+    files load the cached table instead of parsing them again.
+
     Args:
         conn: DuckDB connection
         mappings: List of mapping file paths or glob patterns
+        predicates: Optional list of predicate_id values to keep (e.g. skos:exactMatch)
+        justifications: Optional list of mapping_justification values to keep
+        min_confidence: Optional minimum confidence; rows without a confidence are dropped
+        cache_dir: Optional directory to cache parsed mapping tables in
     """
     if not mappings:
         return
+
+    mapping_files = _get_mapping_files(mappings)
+    if not mapping_files:
+        raise ValueError(f"No mapping files found matching {', '.join(mappings)}")
+
+    cache_path = None
+    if cache_dir is not None:
+        cache_key = _mapping_cache_key(mapping_files, predicates, justifications, min_confidence)
+        cache_path = Path(cache_dir) / f"{cache_key}.parquet"
+        if _restore_cached_mappings(conn, cache_path, mapping_files):
+            return
         
-    # Build UNION ALL query for all mapping files with filename tracking
+    # Build UNION ALL query for all mapping files with their mapping_source values
     union_parts = []
-    for i, file_pattern in enumerate(mappings):
-        # Check if it's a glob pattern or individual file
-        if '*' in file_pattern or '?' in file_pattern:
-            # Create temp table to check schema
-            temp_table = f"temp_mapping_{i}"
-            conn.execute(f"""
-                CREATE TEMP TABLE {temp_table} AS
-                SELECT *
-                FROM read_csv_auto('{file_pattern}',
-                                  filename=true,
-                                  delim='\t',
-                                  quote='',
-                                  all_varchar=true,
-                                  union_by_name=true,
-                                  comment='#',
-                                  ignore_errors=true)
-            """)
-            
-            # Check if provided_by column exists and create appropriate SELECT
-            has_provided_by = conn.execute(f"SELECT COUNT(*) FROM information_schema.columns WHERE table_name = '{temp_table}' AND column_name = 'provided_by'").fetchone()[0] > 0
-            exclude_clause = "filename, provided_by" if has_provided_by else "filename"
-            
-            union_parts.append(f"""
-                SELECT * EXCLUDE ({exclude_clause}), 
-                       regexp_extract(filename, '/([^/]+)\.sssom\.tsv$', 1) as mapping_source
-                FROM {temp_table}
-            """)
-        else:
-            # Individual file with source name from filename
-            temp_table = f"temp_mapping_{i}"
-            conn.execute(f"""
-                CREATE TEMP TABLE {temp_table} AS
-                SELECT *
-                FROM read_csv_auto('{file_pattern}',
-                                  delim='\t',
-                                  quote='',
-                                  all_varchar=true,
-                                  union_by_name=true,
-                                  comment='#',
-                                  ignore_errors=true)
-            """)
-            
-            # Check if provided_by column exists
-            has_provided_by = conn.execute(f"SELECT COUNT(*) FROM information_schema.columns WHERE table_name = '{temp_table}' AND column_name = 'provided_by'").fetchone()[0] > 0
-            exclude_clause = "provided_by" if has_provided_by else ""
-            
-            file_stem = Path(file_pattern).stem
-            if exclude_clause:
-                union_parts.append(f"""
-                    SELECT * EXCLUDE ({exclude_clause}), '{file_stem}' as mapping_source
-                    FROM {temp_table}
-                """)
-            else:
-                union_parts.append(f"""
-                    SELECT *, '{file_stem}' as mapping_source
-                    FROM {temp_table}
-                """)
+    for file_path, mapping_source in mapping_files.items():
+        relation = _read_csv_sql(file_path, comment='#')
+        columns = _get_column_types(conn, relation)
+
+        # Exclude any input provided_by column
+        exclude_clause = "EXCLUDE (provided_by)" if 'provided_by' in columns else ""
+        where_clause = _mapping_filter_sql(columns, predicates, justifications, min_confidence)
+        union_parts.append(f"""
+            SELECT * {exclude_clause}, '{mapping_source}' as mapping_source
+            FROM {relation}
+            {where_clause}
+        """)
     
-    # Create table with UNION ALL of all mapping files
-    union_query = " UNION ALL ".join(union_parts)
+    # Create table with UNION ALL of all mapping files, matching columns by name
+    union_query = " UNION ALL BY NAME ".join(union_parts)
     conn.execute(f"""
         CREATE OR REPLACE TABLE mappings AS
         {union_query}
     """)
+    _create_rejects_table(conn, replace=False)
+    _collect_rejects(conn, mapping_files)
+
+    if cache_path is not None:
+        _store_cached_mappings(conn, cache_path, mapping_files)
+
 
+def _sql_list(values: List[str]) -> str:
+    """Format strings as a SQL list literal."""
+    return "[{}]".format(", ".join("'{}'".format(value.replace("'", "''")) for value in values))
 
-def apply_mappings(conn: duckdb.DuckDBPyConnection) -> None:
+
+def build_mapping_lookup(
+    conn: duckdb.DuckDBPyConnection,
+    conflict_policy: str = "mapping_source",
+    mapping_source_priority: Optional[List[str]] = None,
+    max_depth: int = MAX_MAPPING_DEPTH
+) -> None:
     """
-    Apply SSSOM mappings to edges table.
-    
+    Build a one-to-one mapping_lookup table from object_id to its final subject_id.
+
+    When an object_id is mapped to more than one subject_id, one mapping is chosen by
+    the conflict policy and all candidates are recorded in the mapping_conflicts table
+    with a selected flag. Each policy falls back to the others to break ties, and
+    finally to the smallest subject_id, so the choice is deterministic:
+
+    - mapping_source: the first source in mapping_source_priority (unlisted sources
+      come after the listed ones, alphabetically)
+    - confidence: the highest confidence
+    - predicate: the first predicate_id in MAPPING_PREDICATE_PRIORITY
+
+    Chained mappings (A to B in one set, B to C in another) are then resolved so A maps
+    straight to C (see _resolve_mapping_chains).
+
     Args:
-        conn: DuckDB connection with edges and mappings tables
+        conn: DuckDB connection with mappings table
+        conflict_policy: One of MAPPING_CONFLICT_POLICIES
+        mapping_source_priority: Optional list of mapping sources, most preferred first
+        max_depth: Maximum number of mapping hops to follow (1 applies mappings in a single hop)
     """
-    conn.execute("""
-        -- Create temporary table with original subject/object columns
-        CREATE TEMP TABLE edges_with_mappings AS
+    if conflict_policy not in MAPPING_CONFLICT_POLICIES:
+        raise ValueError(f"Unknown mapping conflict policy {conflict_policy}, "
+                         f"expected one of {', '.join(MAPPING_CONFLICT_POLICIES)}")
+
+    mapping_columns = _get_column_types(conn, "mappings")
+    predicate = "predicate_id" if "predicate_id" in mapping_columns else "NULL::VARCHAR"
+    confidence = "TRY_CAST(confidence AS DOUBLE)" if "confidence" in mapping_columns else "NULL::DOUBLE"
+    order_terms = {
+        "mapping_source": f"list_position({_sql_list(mapping_source_priority or [])}, mapping_source) NULLS LAST, mapping_source",
+        "confidence": "confidence DESC NULLS LAST",
+        "predicate": f"list_position({_sql_list(list(MAPPING_PREDICATE_PRIORITY))}, predicate_id) NULLS LAST",
+    }
+    order_by = ", ".join([order_terms[conflict_policy]] +
+                         [term for policy, term in order_terms.items() if policy != conflict_policy] +
+                         ["subject_id"])
+
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE ranked_mappings AS
         SELECT 
-            e.*,
-            e.subject as original_subject,
-            e.object as original_object,
-            sm_subj.subject_id as mapped_subject,
-            sm_obj.subject_id as mapped_object
-        FROM edges e
-        LEFT JOIN mappings sm_subj ON e.subject = sm_subj.object_id
-        LEFT JOIN mappings sm_obj ON e.object = sm_obj.object_id;
-        
-        -- Update edges table with mappings applied, preserving all original columns
-        CREATE OR REPLACE TABLE edges AS
+            *,
+            ROW_NUMBER() OVER (PARTITION BY object_id ORDER BY {order_by}) = 1 as selected,
+            COUNT(DISTINCT subject_id) OVER (PARTITION BY object_id) as subject_count
+        FROM (
+            SELECT 
+                object_id,
+                subject_id,
+                {predicate} as predicate_id,
+                {confidence} as confidence,
+                mapping_source
+            FROM mappings
+            WHERE object_id IS NOT NULL AND subject_id IS NOT NULL
+        );
+
+        CREATE OR REPLACE TABLE mapping_lookup AS
+        SELECT object_id, subject_id
+        FROM ranked_mappings
+        WHERE selected;
+
+        CREATE OR REPLACE TABLE mapping_conflicts AS
+        SELECT object_id, subject_id, predicate_id, confidence, mapping_source, selected
+        FROM ranked_mappings
+        WHERE subject_count > 1
+        ORDER BY object_id, selected DESC, subject_id;
+
+        DROP TABLE ranked_mappings;
+    """)
+    _resolve_mapping_chains(conn, max_depth)
+
+
+def _resolve_mapping_chains(conn: duckdb.DuckDBPyConnection, max_depth: int = MAX_MAPPING_DEPTH) -> None:
+    """
+    Replace each subject_id in mapping_lookup with the end of its mapping chain.
+
+    All chains are followed in one recursive query. Since the lookup is one-to-one, each
+    object_id has a single chain, which ends at a subject_id that is not mapped itself,
+    at a cycle, or after max_depth hops. Chains that run into a cycle keep their
+    single-hop mapping, and chains cut off at max_depth keep the last id reached. Both
+    are recorded in the mapping_cycles table with the path followed and the reason.
+
+    Args:
+        conn: DuckDB connection with mapping_lookup table
+        max_depth: Maximum number of mapping hops to follow
+    """
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE mapping_chains AS
+        WITH RECURSIVE chain(object_id, subject_id, depth, path, is_cycle) AS (
+            SELECT object_id, subject_id, 1, [object_id, subject_id], false
+            FROM mapping_lookup
+            WHERE object_id != subject_id
+            UNION ALL
+            SELECT 
+                c.object_id,
+                l.subject_id,
+                c.depth + 1,
+                list_append(c.path, l.subject_id),
+                list_contains(c.path, l.subject_id)
+            FROM chain c
+            JOIN mapping_lookup l ON c.subject_id = l.object_id AND l.object_id != l.subject_id
+            WHERE NOT c.is_cycle AND c.depth < {max_depth}
+        )
+        SELECT 
+            object_id,
+            arg_max(subject_id, depth) as final_subject_id,
+            arg_min(subject_id, depth) as first_subject_id,
+            arg_max(path, depth) as path,
+            bool_or(is_cycle) as is_cycle,
+            max(depth) as depth
+        FROM chain
+        GROUP BY object_id;
+
+        -- Chains stopped by max_depth whose last id is still mapped further
+        CREATE OR REPLACE TEMP TABLE truncated_chains AS
+        SELECT c.object_id
+        FROM mapping_chains c
+        JOIN mapping_lookup l ON c.final_subject_id = l.object_id AND l.object_id != l.subject_id
+        WHERE NOT c.is_cycle AND c.depth >= {max_depth};
+
+        CREATE OR REPLACE TABLE mapping_cycles AS
+        SELECT 
+            c.object_id,
+            CASE WHEN c.is_cycle THEN c.first_subject_id ELSE c.final_subject_id END as subject_id,
+            c.path,
+            CASE WHEN c.is_cycle THEN 'cycle' ELSE 'max_depth' END as reason
+        FROM mapping_chains c
+        WHERE c.is_cycle OR c.object_id IN (SELECT object_id FROM truncated_chains)
+        ORDER BY c.object_id;
+
+        CREATE OR REPLACE TABLE mapping_lookup AS
         SELECT 
-            * EXCLUDE (subject, object, original_subject, original_object, mapped_subject, mapped_object),
-            COALESCE(mapped_subject, original_subject) as subject,
-            COALESCE(mapped_object, original_object) as object,
-            CASE WHEN mapped_subject IS NOT NULL AND mapped_subject != original_subject 
-                 THEN original_subject ELSE NULL END as original_subject,
-            CASE WHEN mapped_object IS NOT NULL AND mapped_object != original_object
-                 THEN original_object ELSE NULL END as original_object
-        FROM edges_with_mappings;
+            l.object_id,
+            CASE 
+                WHEN c.object_id IS NULL THEN l.subject_id
+                WHEN c.is_cycle THEN c.first_subject_id
+                ELSE c.final_subject_id
+            END as subject_id
+        FROM mapping_lookup l
+        LEFT JOIN mapping_chains c ON l.object_id = c.object_id;
+
+        DROP TABLE mapping_chains;
+        DROP TABLE truncated_chains;
     """)
 
 
-def merge_and_clean(conn: duckdb.DuckDBPyConnection) -> None:
+def apply_mappings(
+    conn: duckdb.DuckDBPyConnection,
+    conflict_policy: str = "mapping_source",
+    mapping_source_priority: Optional[List[str]] = None,
+    max_depth: int = MAX_MAPPING_DEPTH,
+    map_node_ids: bool = False
+) -> None:
     """
-    Perform merge operations: deduplicate nodes and edges, identify QC issues.
+    Apply SSSOM mappings to edges table, and optionally to node ids.
+
+    Mappings are first reduced to one final subject_id per object_id (see build_mapping_lookup),
+    so each edge is matched by at most one mapping on each side. Edges are updated in place,
+    so the cost scales with the number of mapped edges rather than copying the edges table.
     
     Args:
-        conn: DuckDB connection with nodes and edges tables
+        conn: DuckDB connection with nodes, edges and mappings tables
+        conflict_policy: How to choose between mappings of the same object_id (see MAPPING_CONFLICT_POLICIES)
+        mapping_source_priority: Optional list of mapping sources, most preferred first
+        max_depth: Maximum number of chained mapping hops to follow
+        map_node_ids: Whether to also map node ids (see apply_node_mappings)
+    """
+    build_mapping_lookup(conn, conflict_policy, mapping_source_priority, max_depth)
+    if map_node_ids:
+        apply_node_mappings(conn)
+    # Rewrite subject/object in place, touching only the edges that match a mapping;
+    # original_subject/original_object keep the replaced ids
+    for col_name in ("subject", "object"):
+        conn.execute(f"ALTER TABLE edges ADD COLUMN IF NOT EXISTS original_{col_name} VARCHAR")
+        conn.execute(f"""
+            UPDATE edges
+            SET original_{col_name} = edges.{col_name}, {col_name} = m.subject_id
+            FROM mapping_lookup m
+            WHERE edges.{col_name} = m.object_id AND m.subject_id != m.object_id
+        """)
+
+
+def apply_node_mappings(conn: duckdb.DuckDBPyConnection) -> None:
+    """
+    Apply the mapping lookup to node ids, keeping the replaced id in original_id.
+
+    Nodes mapped onto an id that another node already has become duplicate nodes,
+    which merge_and_clean reports and deduplicates like any other duplicates.
+
+    Args:
+        conn: DuckDB connection with nodes and mapping_lookup tables
+    """
+    replacements = ["COALESCE(m.subject_id, n.id) as id"]
+    original_id = "CASE WHEN m.subject_id != n.id THEN n.id ELSE NULL END"
+    if "original_id" in _get_column_types(conn, "nodes"):
+        # Keep an input original_id for nodes this merge doesn't remap
+        replacements.append(f"COALESCE({original_id}, n.original_id) as original_id")
+        original_id_column = ""
+    else:
+        original_id_column = f", {original_id} as original_id"
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE nodes AS
+        SELECT 
+            n.* REPLACE ({', '.join(replacements)}){original_id_column}
+        FROM nodes n
+        LEFT JOIN mapping_lookup m ON n.id = m.object_id
+    """)
+
+
+def intern_node_ids(conn: duckdb.DuckDBPyConnection) -> None:
+    """
+    Give each distinct node id a dense integer key, stored on nodes and on edge subjects and objects.
+
+    Creates the node_keys table (id, node_key) and adds node_key to nodes and subject_key
+    and object_key to edges. Edge ends that are not node ids get a NULL key, so later
+    dangling checks and the node category joins of QC stats compare fixed-width integers
+    instead of CURIE strings. Keys are UINTEGER unless there are too many nodes for it.
+
+    Args:
+        conn: DuckDB connection with nodes and (mapped) edges tables
+    """
+    node_count = conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0]
+    key_type = "UINTEGER" if node_count < 2 ** 32 else "UBIGINT"
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE node_keys AS
+        SELECT id, CAST(ROW_NUMBER() OVER () AS {key_type}) as {NODE_KEY_COLUMN}
+        FROM (SELECT DISTINCT id FROM nodes WHERE id IS NOT NULL)
+    """)
+
+    node_columns = _get_column_types(conn, "nodes")
+    exclude_clause = f"EXCLUDE ({NODE_KEY_COLUMN})" if NODE_KEY_COLUMN in node_columns else ""
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE nodes AS
+        SELECT n.* {exclude_clause}, k.{NODE_KEY_COLUMN}
+        FROM nodes n
+        LEFT JOIN node_keys k ON n.id = k.id
+    """)
+
+    edge_columns = _get_column_types(conn, "edges")
+    existing_keys = [col for col in EDGE_KEY_COLUMNS.values() if col in edge_columns]
+    exclude_clause = f"EXCLUDE ({', '.join(existing_keys)})" if existing_keys else ""
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE edges AS
+        SELECT e.* {exclude_clause},
+            s.{NODE_KEY_COLUMN} as {EDGE_KEY_COLUMNS['subject']},
+            o.{NODE_KEY_COLUMN} as {EDGE_KEY_COLUMNS['object']}
+        FROM edges e
+        LEFT JOIN node_keys s ON e.subject = s.id
+        LEFT JOIN node_keys o ON e.object = o.id
+    """)
+
+
+def _has_node_keys(conn: duckdb.DuckDBPyConnection, edges_table: str = "edges", nodes_table: str = "nodes") -> bool:
+    """Check whether the edges and nodes tables carry the integer keys added by intern_node_ids."""
+    edge_columns = _get_column_types(conn, edges_table)
+    return (all(col in edge_columns for col in EDGE_KEY_COLUMNS.values())
+            and NODE_KEY_COLUMN in _get_column_types(conn, nodes_table))
+
+
+def node_join_condition(conn: duckdb.DuckDBPyConnection, edges_table: str, edge_alias: str, node_alias: str, end: str) -> str:
+    """
+    Build the condition joining an edge's subject or object to its node in the nodes table.
+
+    Compares integer keys when the tables were interned with intern_node_ids, and falls
+    back to the id strings for databases written without them.
+
+    Args:
+        conn: DuckDB connection
+        edges_table: Name of the edges table being joined (e.g. edges or dangling_edges)
+        edge_alias: Alias of the edges table in the query
+        node_alias: Alias of the nodes table in the query
+        end: "subject" or "object"
+
+    Returns:
+        SQL join condition
+    """
+    if _has_node_keys(conn, edges_table):
+        return f"{edge_alias}.{EDGE_KEY_COLUMNS[end]} = {node_alias}.{NODE_KEY_COLUMN}"
+    return f"{edge_alias}.{end} = {node_alias}.id"
+
+
+def _output_relation(conn: duckdb.DuckDBPyConnection, table: str) -> str:
+    """
+    Select a table for writing as KGX TSV.
+
+    List columns (multivalued fields) are joined with '|', and the integer key columns
+    added by intern_node_ids are left out.
+    """
+    key_columns = [NODE_KEY_COLUMN] + list(EDGE_KEY_COLUMNS.values())
+    select_parts = [
+        f"array_to_string({col}, '|') as {col}" if col_type.endswith("[]") else col
+        for col, col_type in _get_column_types(conn, table).items() if col not in key_columns
+    ]
+    return f"(SELECT {', '.join(select_parts)} FROM {table})"
+
+
+def _classify_nodes(conn: duckdb.DuckDBPyConnection, nodes_table: str = "nodes", source_priority: Optional[List[str]] = None) -> None:
+    """
+    Tag each node row with the number of rows sharing its id and its rank within them.
+
+    Creates the temporary classified_nodes table with the node columns plus _id_count
+    and _rn, where the row to keep for each id has _rn = 1: the first by position of its
+    provided_by in source_priority (unlisted sources after listed ones), then by provided_by.
+    Both windows share the id partition, so the nodes are scanned once; it is on node_key
+    when the nodes were interned.
+    """
+    partition = NODE_KEY_COLUMN if NODE_KEY_COLUMN in _get_column_types(conn, nodes_table) else "id"
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE classified_nodes AS
+        SELECT *,
+            COUNT(*) OVER (PARTITION BY {partition}) as _id_count,
+            ROW_NUMBER() OVER (
+                PARTITION BY {partition}
+                ORDER BY list_position({_sql_list(source_priority or [])}, provided_by) NULLS LAST, provided_by
+            ) as _rn
+        FROM {nodes_table}
+    """)
+
+
+def _classify_edges(conn: duckdb.DuckDBPyConnection, edges_table: str = "edges", node_ids_table: str = "nodes") -> None:
+    """
+    Tag each edge row as dangling and with the number of rows sharing its id and its rank within them.
+
+    Creates the temporary classified_edges table with the edge columns plus _dangling,
+    _id_count and _rn. An edge is dangling when its subject or object is not an id in
+    node_ids_table, which must hold each id once; it is probed as a hash join, or, when
+    the edges were interned with intern_node_ids, read off their NULL node keys without
+    a join. The row to keep for each id (the first non-dangling row by provided_by) has
+    _rn = 1 and _dangling false.
+    """
+    if _has_node_keys(conn, edges_table, node_ids_table):
+        dangling_edges_sql = f"""
+            SELECT *, ({EDGE_KEY_COLUMNS['subject']} IS NULL OR {EDGE_KEY_COLUMNS['object']} IS NULL) as _dangling
+            FROM {edges_table}
+        """
+    else:
+        dangling_edges_sql = f"""
+            SELECT e.*, (s.id IS NULL OR o.id IS NULL) as _dangling
+            FROM {edges_table} e
+            LEFT JOIN (SELECT id FROM {node_ids_table}) s ON e.subject = s.id
+            LEFT JOIN (SELECT id FROM {node_ids_table}) o ON e.object = o.id
+        """
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE classified_edges AS
+        SELECT *,
+            COUNT(*) OVER (PARTITION BY id) as _id_count,
+            ROW_NUMBER() OVER (PARTITION BY id ORDER BY _dangling, provided_by) as _rn
+        FROM ({dangling_edges_sql})
+    """)
+
+
+def _union_ranked_rows_sql(conn: duckdb.DuckDBPyConnection, table: str, key_columns: List[str], count_column: str) -> str:
+    """
+    Build a query merging the rows of a classified table that share a key into one row each.
+
+    The table must have count_column, the number of rows sharing the row's key, and _rn,
+    the row's rank within them. Rows with a unique key are passed through, the others are
+    grouped by key in a single GROUP BY: list columns hold the distinct values of all of
+    the group's rows in rank order, other columns the value of its _rn = 1 row. Columns
+    starting with an underscore are left out.
+
+    Args:
+        conn: DuckDB connection
+        table: Name of the classified table
+        key_columns: Columns the rows are grouped by
+        count_column: Column holding the number of rows sharing the row's key
+
+    Returns:
+        SQL query
+    """
+    columns = {col: col_type for col, col_type in _get_column_types(conn, table).items() if not col.startswith("_")}
+    list_columns = [col for col, col_type in columns.items() if col_type.endswith("[]") and col not in key_columns]
+    aggregates = ", ".join(
+        f"flatten(list({col} ORDER BY _rn) FILTER (WHERE {col} IS NOT NULL)) as {col}" if col in list_columns
+        else f"first({col} ORDER BY _rn) as {col}"
+        for col in columns if col not in key_columns
+    )
+    distinct_lists = ", ".join(f"list_filter({col}, (x, i) -> list_position({col}, x) = i) as {col}"
+                               for col in list_columns)
+    replace_clause = f"REPLACE ({distinct_lists})" if list_columns else ""
+    internal_columns = ", ".join(col for col in _get_column_types(conn, table) if col.startswith("_"))
+    return f"""
+        SELECT * EXCLUDE ({internal_columns}) FROM {table} WHERE {count_column} = 1
+        UNION ALL BY NAME
+        SELECT * {replace_clause} FROM (
+            SELECT {", ".join(key_columns)}, {aggregates}
+            FROM {table}
+            WHERE {count_column} > 1
+            GROUP BY {", ".join(key_columns)}
+        )
+    """
+
+
+def _split_classified_nodes(conn: duckdb.DuckDBPyConnection, union_multivalued: bool = False) -> None:
+    """
+    Create the duplicate_nodes QC table and the clean nodes table from classified_nodes.
+
+    Each id keeps its _rn = 1 row. With union_multivalued, the list columns of duplicated
+    ids instead hold the distinct values of all of the id's rows, in rank order; this is
+    a single GROUP BY over the duplicated rows only.
     """
-    
-    # Create QC tables for tracking issues before cleaning
     conn.execute("""
-        -- Duplicate nodes (before cleaning)
         CREATE OR REPLACE TABLE duplicate_nodes AS
-        SELECT * FROM nodes 
-        WHERE id IN (
-            SELECT id FROM nodes 
-            GROUP BY id 
-            HAVING COUNT(*) > 1
-        );
+        SELECT * EXCLUDE (_id_count, _rn) FROM classified_nodes WHERE _id_count > 1
     """)
-    
+
+    if union_multivalued:
+        conn.execute(f"""
+            CREATE OR REPLACE TABLE nodes AS
+            {_union_ranked_rows_sql(conn, "classified_nodes", ["id"], "_id_count")}
+        """)
+    else:
+        conn.execute("""
+            CREATE OR REPLACE TABLE nodes AS
+            SELECT * EXCLUDE (_id_count, _rn) FROM classified_nodes WHERE _rn = 1
+        """)
+    conn.execute("DROP TABLE classified_nodes")
+
+
+def _split_classified_edges(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the duplicate_edges and dangling_edges QC tables and the clean edges table from classified_edges."""
     conn.execute("""
-        -- Duplicate edges (before cleaning) 
         CREATE OR REPLACE TABLE duplicate_edges AS
-        SELECT * FROM edges
-        WHERE id IN (
-            SELECT id FROM edges
-            GROUP BY id 
-            HAVING COUNT(*) > 1
-        );
-    """)
-    
-    conn.execute("""
-        -- Dangling edges (edges referencing non-existent nodes)
+        SELECT * EXCLUDE (_dangling, _id_count, _rn) FROM classified_edges WHERE _id_count > 1;
+
         CREATE OR REPLACE TABLE dangling_edges AS
-        SELECT e.* FROM edges e
-        WHERE e.subject NOT IN (SELECT DISTINCT id FROM nodes)
-           OR e.object NOT IN (SELECT DISTINCT id FROM nodes);
+        SELECT * EXCLUDE (_dangling, _id_count, _rn) FROM classified_edges WHERE _dangling;
+
+        CREATE OR REPLACE TABLE edges AS
+        SELECT * EXCLUDE (_dangling, _id_count, _rn) FROM classified_edges WHERE _rn = 1 AND NOT _dangling;
+
+        DROP TABLE classified_edges;
     """)
-    
-    # Clean nodes - remove duplicates, keep first occurrence
-    conn.execute("""
-        CREATE TEMP TABLE clean_nodes AS
-        SELECT * FROM (
-            SELECT *, ROW_NUMBER() OVER (PARTITION BY id ORDER BY provided_by) as rn
-            FROM nodes
-        ) WHERE rn = 1;
-        
-        CREATE OR REPLACE TABLE nodes AS SELECT * FROM clean_nodes;
-        ALTER TABLE nodes DROP COLUMN rn;
+
+
+def _collapse_triples(conn: duckdb.DuckDBPyConnection, qualifier_columns: Optional[List[str]] = None) -> None:
+    """
+    Collapse clean edges with the same subject, predicate, object and qualifiers into one edge.
+
+    Each group keeps the id and other single-valued columns of its first edge by
+    provided_by and id, and the distinct values of all of its edges in list columns
+    (such as publications or aggregator_knowledge_source). The collapsed_edges QC table
+    records every group of more than one edge with the kept id, the ids and provided_by
+    values of its edges and their number.
+
+    Args:
+        conn: DuckDB connection with a clean edges table
+        qualifier_columns: Optional list of columns that are part of the dedup key. Defaults to
+            the edges' columns in EDGE_QUALIFIER_COLUMNS and those ending in "qualifier".
+    """
+    columns = _get_column_types(conn, "edges")
+    if qualifier_columns is None:
+        qualifier_columns = [col for col in columns if col in EDGE_QUALIFIER_COLUMNS or col.endswith("qualifier")]
+    missing_columns = [col for col in qualifier_columns if col not in columns]
+    if missing_columns:
+        raise ValueError(f"Edge qualifier columns not found in edges: {', '.join(missing_columns)}")
+    key_columns = ", ".join(["subject", "predicate", "object"] + list(qualifier_columns))
+
+    conn.execute(f"""
+        CREATE OR REPLACE TEMP TABLE classified_triples AS
+        SELECT *,
+            COUNT(*) OVER (PARTITION BY {key_columns}) as _triple_count,
+            ROW_NUMBER() OVER (PARTITION BY {key_columns} ORDER BY provided_by, id) as _rn
+        FROM edges
     """)
-    
-    # Clean edges - remove duplicates and dangling edges
-    conn.execute("""
-        CREATE TEMP TABLE clean_edges AS
-        SELECT * FROM (
-            SELECT *, ROW_NUMBER() OVER (PARTITION BY id ORDER BY provided_by) as rn
-            FROM edges e
-            WHERE e.subject IN (SELECT DISTINCT id FROM nodes)
-              AND e.object IN (SELECT DISTINCT id FROM nodes)
-        ) WHERE rn = 1;
-        
-        CREATE OR REPLACE TABLE edges AS SELECT * FROM clean_edges;
-        ALTER TABLE edges DROP COLUMN rn;
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE collapsed_edges AS
+        SELECT
+            {key_columns},
+            first(id ORDER BY _rn) as id,
+            list(id ORDER BY _rn) as collapsed_ids,
+            list(provided_by ORDER BY _rn) as provided_by,
+            COUNT(*) as count
+        FROM classified_triples
+        WHERE _triple_count > 1
+        GROUP BY {key_columns}
+    """)
+    conn.execute(f"""
+        CREATE OR REPLACE TABLE edges AS
+        {_union_ranked_rows_sql(conn, "classified_triples", ["subject", "predicate", "object"] + list(qualifier_columns), "_triple_count")}
     """)
+    conn.execute("DROP TABLE classified_triples")
+
+
+def merge_and_clean(
+    conn: duckdb.DuckDBPyConnection,
+    node_merge_strategy: str = "first",
+    source_priority: Optional[List[str]] = None,
+    dedup_triples: bool = False,
+    qualifier_columns: Optional[List[str]] = None
+) -> None:
+    """
+    Perform merge operations: deduplicate nodes and edges, identify QC issues.
+
+    Each table is classified in a single pass, tagging every row as a duplicate,
+    dangling or kept row, and the QC tables (duplicate_nodes, duplicate_edges,
+    dangling_edges) and the clean nodes and edges tables are split out of that result.
+    Edges are checked against the clean nodes, which hold each node id once.
+
+    Nodes provided more than once are merged by the node merge strategy:
+
+    - first: keep the row with the lowest provided_by
+    - priority: keep the row whose provided_by comes first in source_priority (unlisted
+      sources come after the listed ones, by provided_by)
+    - union: keep the row chosen as for priority, with each multivalued (list) column
+      holding the distinct values of all of the id's rows
+
+    With dedup_triples, clean edges with different ids but the same subject, predicate,
+    object and qualifiers are then collapsed into one edge (see _collapse_triples).
+    
+    Args:
+        conn: DuckDB connection with nodes and edges tables
+        node_merge_strategy: "first", "priority" or "union" (defaults to "first")
+        source_priority: Optional list of provided_by values, most preferred first
+        dedup_triples: Whether to collapse edges with the same triple and qualifiers (defaults to False)
+        qualifier_columns: Optional list of qualifier columns that are part of the triple dedup key
+    """
+    if node_merge_strategy not in NODE_MERGE_STRATEGIES:
+        raise ValueError(f"Unknown node merge strategy {node_merge_strategy}, "
+                         f"expected one of {', '.join(NODE_MERGE_STRATEGIES)}")
+
+    _classify_nodes(conn, source_priority=None if node_merge_strategy == "first" else source_priority)
+    _split_classified_nodes(conn, union_multivalued=node_merge_strategy == "union")
+
+    _classify_edges(conn)
+    _split_classified_edges(conn)
+
+    if dedup_triples:
+        _collapse_triples(conn, qualifier_columns)
+    else:
+        # Don't report edges collapsed by an earlier merge into the same database
+        conn.execute("DROP TABLE IF EXISTS collapsed_edges")
 
 
 def create_qc_aggregations(conn: duckdb.DuckDBPyConnection) -> None:
     """
     Create pre-aggregated tables for QC reporting.
+
+    Multivalued category columns are reported as pipe-delimited strings.
     
     Args:
         conn: DuckDB connection with clean nodes and edges tables
     """
-    
+    _create_node_stats(conn)
+    _create_edge_stats(conn)
+
+
+def _create_node_stats(conn: duckdb.DuckDBPyConnection) -> None:
+    """Create the node_stats table: node counts by provided_by, category and id namespace."""
     # Node statistics aggregation
-    conn.execute("""
+    conn.execute(f"""
         CREATE OR REPLACE TABLE node_stats AS
         SELECT 
             provided_by,
-            category,
-            split_part(id, ':', 1) as namespace,
-            COUNT(*) as count
-        FROM nodes
-        GROUP BY provided_by, category, namespace;
+            {_category_text('category')} as category,
+            namespace,
+            count
+        FROM (
+            SELECT 
+                provided_by,
+                category,
+                split_part(id, ':', 1) as namespace,
+                COUNT(*) as count
+            FROM nodes
+            GROUP BY provided_by, category, namespace
+        );
     """)
-    
+
+
+def _create_edge_stats(conn: duckdb.DuckDBPyConnection) -> None:
+    """
+    Create the edge_stats table: edge counts by provided_by, category, predicate, and subject
+    and object namespace and node category.
+    """
     # Edge statistics aggregation with subject/object categories from joins
-    conn.execute("""
+    conn.execute(f"""
         CREATE OR REPLACE TABLE edge_stats AS
         SELECT 
-            e.provided_by,
-            e.category as edge_category,
-            e.predicate,
-            split_part(e.subject, ':', 1) as subject_namespace,
-            split_part(e.object, ':', 1) as object_namespace,
-            sn.category as subject_category,
-            on_node.category as object_category,
-            COUNT(*) as count
-        FROM edges e
-        LEFT JOIN nodes sn ON e.subject = sn.id  
-        LEFT JOIN nodes on_node ON e.object = on_node.id
-        GROUP BY 
-            e.provided_by, 
-            e.category, 
-            e.predicate,
-            subject_namespace, 
+            provided_by,
+            {_category_text('edge_category')} as edge_category,
+            predicate,
+            subject_namespace,
             object_namespace,
-            sn.category,
-            on_node.category;
+            {_category_text('subject_category')} as subject_category,
+            {_category_text('object_category')} as object_category,
+            count
+        FROM (
+            SELECT 
+                e.provided_by,
+                e.category as edge_category,
+                e.predicate,
+                split_part(e.subject, ':', 1) as subject_namespace,
+                split_part(e.object, ':', 1) as object_namespace,
+                sn.category as subject_category,
+                on_node.category as object_category,
+                COUNT(*) as count
+            FROM edges e
+            LEFT JOIN nodes sn ON {node_join_condition(conn, "edges", "e", "sn", "subject")}
+            LEFT JOIN nodes on_node ON {node_join_condition(conn, "edges", "e", "on_node", "object")}
+            GROUP BY 
+                e.provided_by, 
+                e.category, 
+                e.predicate,
+                subject_namespace, 
+                object_namespace,
+                sn.category,
+                on_node.category
+        );
     """)
 
 
+def _category_text(col_name: str) -> str:
+    """SQL expression for a category column as text, joining multivalued categories with '|'."""
+    return f"""CASE 
+                WHEN typeof({col_name}) LIKE '%[]' THEN array_to_string({col_name}, '|')
+                ELSE CAST({col_name} AS VARCHAR)
+            END"""
+
+
 def write_output_files(conn: duckdb.DuckDBPyConnection, name: str, output_dir: str) -> None:
     """
     Write cleaned nodes and edges to TSV files and create tar.gz bundle.
@@ -437,12 +1746,12 @@ def write_output_files(conn: duckdb.DuckDBPyConnection, name: str, output_dir: s
     
     # Write main output files
     conn.execute(f"""
-        COPY nodes TO '{nodes_path}' 
+        COPY {_output_relation(conn, "nodes")} TO '{nodes_path}' 
         WITH (FORMAT CSV, DELIMITER '\t', HEADER);
     """)
     
     conn.execute(f"""
-        COPY edges TO '{edges_path}'
+        COPY {_output_relation(conn, "edges")} TO '{edges_path}'
         WITH (FORMAT CSV, DELIMITER '\t', HEADER);
     """)
     
@@ -451,18 +1760,40 @@ def write_output_files(conn: duckdb.DuckDBPyConnection, name: str, output_dir: s
     
     # Write QC files
     conn.execute(f"""
-        COPY duplicate_nodes TO '{output_dir}/qc/{name}-duplicate-nodes.tsv'
+        COPY {_output_relation(conn, "duplicate_nodes")} TO '{output_dir}/qc/{name}-duplicate-nodes.tsv'
         WITH (FORMAT CSV, DELIMITER '\t', HEADER);
     """)
     
     conn.execute(f"""
-        COPY duplicate_edges TO '{output_dir}/qc/{name}-duplicate-edges.tsv'
+        COPY {_output_relation(conn, "duplicate_edges")} TO '{output_dir}/qc/{name}-duplicate-edges.tsv'
         WITH (FORMAT CSV, DELIMITER '\t', HEADER);
     """)
     
     conn.execute(f"""
-        COPY dangling_edges TO '{output_dir}/qc/{name}-dangling-edges.tsv'
+        COPY {_output_relation(conn, "dangling_edges")} TO '{output_dir}/qc/{name}-dangling-edges.tsv'
         WITH (FORMAT CSV, DELIMITER '\t', HEADER);
     """)
+    
+    if _table_exists(conn, "rejects"):
+        conn.execute(f"""
+            COPY rejects TO '{output_dir}/qc/{name}-rejected-rows.tsv'
+            WITH (FORMAT CSV, DELIMITER '\t', HEADER);
+        """)
+
+    if _table_exists(conn, "mapping_conflicts"):
+        conn.execute(f"""
+            COPY mapping_conflicts TO '{output_dir}/qc/{name}-mapping-conflicts.tsv'
+            WITH (FORMAT CSV, DELIMITER '\t', HEADER);
+        """)
 
+    if _table_exists(conn, "mapping_cycles"):
+        conn.execute(f"""
+            COPY {_output_relation(conn, "mapping_cycles")} TO '{output_dir}/qc/{name}-mapping-cycles.tsv'
+            WITH (FORMAT CSV, DELIMITER '\t', HEADER);
+        """)
 
+    if _table_exists(conn, "collapsed_edges"):
+        conn.execute(f"""
+            COPY {_output_relation(conn, "collapsed_edges")} TO '{output_dir}/qc/{name}-collapsed-edges.tsv'
+            WITH (FORMAT CSV, DELIMITER '\t', HEADER);
+        """)
@@ -64,16 +64,25 @@ def read_tar_dfs(tar: tarfile.TarFile, type_name, add_source_col: str = "provide
     dataframes = []
     for member in tar.getmembers():
         if member.isfile() and type_name in member.name:
+            _check_not_parquet(member.name)
             dataframes.append(read_df(tar.extractfile(member), add_source_col, member.name))
     return dataframes
 
 
+def _check_not_parquet(name: Optional[str]) -> None:
+    """Raise a ValueError for a Parquet file name, which the pandas engine can't read."""
+    if isinstance(name, str) and name.endswith(".parquet"):
+        raise ValueError(f"Parquet input is only supported by the duckdb engine: {name}")
+
+
 def read_df(fh: Union[str, IO[bytes]],
             add_source_col: Optional[str] = "provided_by",
             source_col_value: Optional[str] = None,
             comment_character: str = None) -> pd.DataFrame:
     """
-    Read a file into a dataframe.
+    Read a TSV file into a dataframe.
+
+    Parquet input is only supported by the duckdb engine, so paths ending in .parquet raise a ValueError.
 
     Args:
         fh (str, io.TextIOWrapper): File handle.
@@ -84,6 +93,7 @@ def read_df(fh: Union[str, IO[bytes]],
     Returns:
         pandas.DataFrame: Dataframe.
     """
+    _check_not_parquet(fh if isinstance(fh, str) else getattr(fh, "name", None))
     df = pd.read_csv(fh,
                      sep="\t",
                      dtype="string",
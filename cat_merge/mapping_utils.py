@@ -1,30 +1,72 @@
-import numpy as np
+from pandas import Series
 from pandas.core.frame import DataFrame
 
 
+def _mapping_index(mapping: DataFrame) -> Series:
+    """
+    Build a single object_id to subject_id lookup from SSSOM mappings.
+
+    An object_id with more than one mapping uses the first one, so each id is
+    mapped to at most one id and applying the lookup never adds rows.
+
+    Args:
+        mapping (pandas.DataFrame): DataFrame of SSSOM mappings.
+
+    Returns:
+        pandas.Series: subject_id values indexed by object_id.
+    """
+    return mapping.drop_duplicates(subset=['object_id']).set_index('object_id')['subject_id']
+
+
+def _map_column(df: DataFrame, column: str, original_column: str, lookup: Series) -> None:
+    """
+    Map the ids in a column in place, keeping replaced ids in original_column.
+
+    Rows that are not remapped keep their original_column value if the frame has one.
+    """
+    mapped_ids = df[column].map(lookup)
+    remapped = mapped_ids.notnull() & (mapped_ids != df[column])
+
+    original_ids = df[column].where(remapped, None)
+    if original_column in df.columns:
+        original_ids = original_ids.where(remapped, df[original_column])
+    df[original_column] = original_ids
+    df[column] = mapped_ids.where(remapped, df[column])
+
+
 def apply_mappings(edges: DataFrame, mapping: DataFrame):
     """
     Apply SSSOM mappings to edges.
 
+    The subject and object columns are mapped through one object_id index with
+    Series.map, updating the edges frame in place rather than merging copies of it.
+
     Args:
         edges (pandas.DataFrame): DataFrame of edges.
         mapping (pandas.DataFrame): DataFrame of SSSOM mappings.
 
     Returns:
-        None
-    """
-    edges.rename(columns={'subject':'original_subject'}, inplace=True)
-    subject_mapping = mapping.rename(columns={'subject_id':'subject'})
-    subject_mapping = subject_mapping[["subject","object_id"]]
-    edges = edges.merge(subject_mapping, how='left', left_on='original_subject', right_on='object_id').drop(['object_id'],axis=1)
-    edges['subject'] = np.where(edges.subject.isnull(), edges.original_subject, edges.subject)
-    edges['original_subject'] = np.where(edges.subject == edges.original_subject, None, edges.original_subject)
-
-    edges.rename(columns={'object':'original_object'}, inplace=True)
-    object_mapping = mapping.rename(columns={'subject_id':'object'})
-    object_mapping = object_mapping[["object", "object_id"]]
-    edges = edges.merge(object_mapping, how='left', left_on='original_object', right_on='object_id').drop(['object_id'],axis=1)
-    edges['object'] = np.where(edges.object.isnull(), edges.original_object, edges.object)
-    edges['original_object'] = np.where(edges.object == edges.original_object, None, edges.original_object)
-
+        pandas.DataFrame: DataFrame of edges with mapped subjects and objects.
+    """
+    lookup = _mapping_index(mapping)
+    _map_column(edges, 'subject', 'original_subject', lookup)
+    _map_column(edges, 'object', 'original_object', lookup)
     return edges
+
+
+def apply_node_mappings(nodes: DataFrame, mapping: DataFrame):
+    """
+    Apply SSSOM mappings to node ids.
+
+    Mapped nodes get the mapping's subject_id as id and keep their old id in
+    original_id. An object_id with more than one mapping uses the first one.
+
+    Args:
+        nodes (pandas.DataFrame): DataFrame of nodes.
+        mapping (pandas.DataFrame): DataFrame of SSSOM mappings.
+
+    Returns:
+        pandas.DataFrame: DataFrame of nodes with mapped ids.
+    """
+    _map_column(nodes, 'id', 'original_id', _mapping_index(mapping))
+    return nodes
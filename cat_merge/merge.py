@@ -20,7 +20,8 @@ def merge(
         edges: List[str] = None,  # Optional list of edge files
         mappings: List[str] = None,  # Optional list of SSSOM mapping files
         output_dir: str = "merged-output",  # Directory to output knowledge graph
-        qc_report: bool = True
+        qc_report: bool = True,
+        map_node_ids: bool = False  # Also apply mappings to node ids
 ):
     """
     Merges nodes and edges into a knowledge graph.
@@ -33,6 +34,7 @@ def merge(
         mappings (List[str], optional): Optional list of SSSOM mapping files.
         output_dir (str): Directory to output knowledge graph.
         qc_report (bool, optional): Boolean for whether to generate a qc report (defaults to True).
+        map_node_ids (bool, optional): Boolean for whether to also apply mappings to node ids (defaults to False).
 
     Returns:
         None
@@ -82,7 +84,7 @@ Merging KG files...
 
     step_start = time.time()
     print("Merging...")
-    kg, qc = merge_kg(node_dfs=node_dfs, edge_dfs=edge_dfs, mapping_dfs=mapping_dfs)
+    kg, qc = merge_kg(node_dfs=node_dfs, edge_dfs=edge_dfs, mapping_dfs=mapping_dfs, map_node_ids=map_node_ids)
     
     write(
         name=name,
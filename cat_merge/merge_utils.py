@@ -2,7 +2,7 @@ import pandas as pd
 from pandas.core.frame import DataFrame
 from typing import List, Tuple
 from cat_merge.model.merged_kg import MergedKG, MergeQC
-from cat_merge.mapping_utils import apply_mappings
+from cat_merge.mapping_utils import apply_mappings, apply_node_mappings
 import numpy as np
 
 
@@ -77,7 +77,8 @@ def get_dangling_edges(edges: DataFrame, nodes: DataFrame) -> DataFrame:
 
 def merge_kg(edge_dfs: List[DataFrame],
              node_dfs: List[DataFrame],
-             mapping_dfs: List[DataFrame] = None) -> tuple[MergedKG, MergeQC]:
+             mapping_dfs: List[DataFrame] = None,
+             map_node_ids: bool = False) -> tuple[MergedKG, MergeQC]:
     """
     Merge a list of node and edge dataframes.
 
@@ -85,6 +86,7 @@ def merge_kg(edge_dfs: List[DataFrame],
         edge_dfs (List[pandas.DataFrame]): List of edge dataframes.
         node_dfs (List[pandas.DataFrame]): List of node dataframes.
         mapping_dfs (List[pandas.DataFrame]): List of mapping dataframes.
+        map_node_ids (bool): Whether to also apply mappings to node ids, keeping the old id in original_id.
 
     Returns:
         Tuple[MergedKG, pandas.DataFrame]: A tuple containing the merged KG and merge QC.
@@ -97,6 +99,8 @@ def merge_kg(edge_dfs: List[DataFrame],
     if mapping_dfs is not None and len(mapping_dfs) > 0:
         mapping_df = concat_dataframes(mapping_dfs)
         all_edges = apply_mappings(all_edges, mapping_df)
+        if map_node_ids:
+            all_nodes = apply_node_mappings(all_nodes, mapping_df)
 
     duplicate_nodes = get_duplicates_by_id(df=all_nodes)
     duplicate_edges = get_duplicates_by_id(df=all_edges)
@@ -3,39 +3,295 @@ Utilities for parsing LinkML schemas to identify multivalued fields.
 Supports KGX format and Biolink Model schema definitions.
 """
 
+import gzip
+import hashlib
+import json
+import os
+import re
+import urllib.request
 import yaml
-from typing import Dict, Set, Optional, List
+from typing import TYPE_CHECKING, Any, Dict, FrozenSet, Set, Optional, List, Union
 from pathlib import Path
-from linkml_runtime.utils.schemaview import SchemaView
+
+if TYPE_CHECKING:
+    # linkml_runtime takes seconds to import, so it is only imported when a schema has to be parsed
+    from linkml_runtime.utils.schemaview import SchemaView
+
+
+# DuckDB column types for LinkML type bases; any other range is read as VARCHAR
+LINKML_BASE_DUCKDB_TYPES = {
+    'int': 'BIGINT',
+    'float': 'DOUBLE',
+    'Bool': 'BOOLEAN',
+    'XSDDate': 'DATE',
+    'XSDDateTime': 'TIMESTAMP'
+}
+
+
+# Biolink Model snapshot shipped with the package and used when no schema is given
+BUNDLED_SCHEMA_DIR = Path(__file__).parent / "schemas"
+BUNDLED_BIOLINK_VERSION = "4.4.6"
+
+# Biolink Model schema file, fetched from a git ref ("master" or a "v<version>" tag)
+BIOLINK_SCHEMA_FILE = "biolink_model.yaml"
+BIOLINK_SCHEMA_URL = "https://raw.githubusercontent.com/biolink/biolink-model/{ref}/src/biolink_model/schema/" + BIOLINK_SCHEMA_FILE
+
+# Environment variables overriding the cache location and selecting a cached Biolink version
+CACHE_DIR_ENV = "CAT_MERGE_CACHE_DIR"
+BIOLINK_VERSION_ENV = "CAT_MERGE_BIOLINK_VERSION"
+
+# File in the cache directory holding the pinned cache key
+PINNED_SCHEMA_FILE = "pinned"
+
+# schema_path value selecting the built-in KGX field list instead of a LinkML schema
+KGX_SCHEMA = "kgx"
+
+# Slot index sidecar written next to cached schemas; bump the format to rebuild existing indexes
+SLOT_INDEX_FILE = "slot_index.json"
+SLOT_INDEX_FORMAT = 1
+
+
+def get_cache_dir() -> Path:
+    """
+    Get the directory cat-merge caches schemas and parsed inputs in.
+
+    Returns:
+        $CAT_MERGE_CACHE_DIR if set, otherwise ~/.cache/cat-merge
+    """
+    return Path(os.environ.get(CACHE_DIR_ENV) or Path.home() / ".cache" / "cat-merge")
+
+
+def get_schema_cache_dir() -> Path:
+    """
+    Get the directory cached Biolink Model schemas are stored in.
+
+    Returns:
+        The biolink subdirectory of the cache directory
+    """
+    return get_cache_dir() / "biolink"
+
+
+def _get_schema_version(content: bytes) -> str:
+    """Read the version of a LinkML schema from its top-level version field."""
+    match = re.search(rb"^version:\s*['\"]?([^'\"\s]+)", content, re.MULTILINE)
+    return match.group(1).decode() if match else "unversioned"
+
+
+def _get_local_imports(content: bytes) -> List[str]:
+    """List the imports of a LinkML schema that are sibling files rather than linkml: modules."""
+    imports = yaml.safe_load(content).get("imports") or []
+    return [name for name in imports if ":" not in name]
+
+
+def _store_schema(files: Dict[str, bytes]) -> Path:
+    """
+    Store a schema and its imported files in the cache under a version and content hash key.
+
+    Args:
+        files: File contents keyed by file name, including BIOLINK_SCHEMA_FILE
+
+    Returns:
+        Path to the cached BIOLINK_SCHEMA_FILE
+    """
+    digest = hashlib.sha256()
+    for file_name in sorted(files):
+        digest.update(file_name.encode())
+        digest.update(files[file_name])
+    key = f"{_get_schema_version(files[BIOLINK_SCHEMA_FILE])}-{digest.hexdigest()[:16]}"
+    schema_dir = get_schema_cache_dir() / key
+
+    if not (schema_dir / BIOLINK_SCHEMA_FILE).exists():
+        schema_dir.mkdir(parents=True, exist_ok=True)
+        # Write the main schema file last and atomically, since its presence marks a complete entry
+        for file_name in sorted(files, key=lambda name: name == BIOLINK_SCHEMA_FILE):
+            tmp_path = schema_dir / f"{file_name}.{os.getpid()}.tmp"
+            tmp_path.write_bytes(files[file_name])
+            os.replace(tmp_path, schema_dir / file_name)
+    return schema_dir / BIOLINK_SCHEMA_FILE
+
+
+def _install_bundled_schema() -> Path:
+    """Copy the bundled Biolink Model snapshot into the cache and return its path."""
+    files = {}
+    for bundled_file in BUNDLED_SCHEMA_DIR.glob("*.yaml.gz"):
+        with gzip.open(bundled_file, "rb") as fh:
+            files[bundled_file.name[:-len(".gz")]] = fh.read()
+    return _store_schema(files)
+
+
+def cache_biolink_schema(version: Optional[str] = None, pin: bool = False, bundled: bool = False) -> Path:
+    """
+    Download a Biolink Model release into the schema cache.
+
+    Args:
+        version: Biolink Model version to download, e.g. '4.2.0' (defaults to the latest on master)
+        pin: Whether to use this schema by default when no schema path is given
+        bundled: Cache the snapshot bundled with the package instead of downloading a release
+
+    Returns:
+        Path to the cached schema file
+    """
+    if bundled:
+        schema_path = _install_bundled_schema()
+    else:
+        url = BIOLINK_SCHEMA_URL.format(ref=f"v{version}" if version else "master")
+        files = {}
+        pending = [BIOLINK_SCHEMA_FILE]
+        while pending:
+            file_name = pending.pop()
+            with urllib.request.urlopen(url.rsplit("/", 1)[0] + f"/{file_name}") as response:
+                files[file_name] = response.read()
+            pending.extend(f"{name}.yaml" for name in _get_local_imports(files[file_name])
+                           if f"{name}.yaml" not in files)
+        schema_path = _store_schema(files)
+
+    if pin:
+        (get_schema_cache_dir() / PINNED_SCHEMA_FILE).write_text(schema_path.parent.name)
+    return schema_path
+
+
+def get_default_schema_path() -> Path:
+    """
+    Get a local path to the Biolink Model schema used when no schema path is given.
+
+    This is, in order of preference, the newest cached schema of the version in
+    $CAT_MERGE_BIOLINK_VERSION, the schema pinned with cache_biolink_schema, or the
+    Biolink Model snapshot bundled with the package. No network access is needed.
+
+    Returns:
+        Path to the cached schema file
+    """
+    cache_dir = get_schema_cache_dir()
+    version = os.environ.get(BIOLINK_VERSION_ENV)
+    if version:
+        if version == BUNDLED_BIOLINK_VERSION:
+            return _install_bundled_schema()
+        cached = sorted(cache_dir.glob(f"{version}-*/{BIOLINK_SCHEMA_FILE}"), key=os.path.getmtime)
+        if not cached:
+            raise FileNotFoundError(f"Biolink Model {version} is not in the schema cache {cache_dir}; "
+                                    f"run 'cat-merge cache-schema --version {version}' first")
+        return cached[-1]
+
+    pinned_file = cache_dir / PINNED_SCHEMA_FILE
+    if pinned_file.exists():
+        pinned = cache_dir / pinned_file.read_text().strip() / BIOLINK_SCHEMA_FILE
+        if not pinned.exists():
+            raise FileNotFoundError(f"Pinned Biolink Model schema {pinned} is missing from the schema cache")
+        return pinned
+
+    return _install_bundled_schema()
+
+
+def build_slot_index(schema_view: "SchemaView") -> Dict[str, Any]:
+    """
+    Compute the multivalued slots and typed slot ranges of a schema.
+
+    Slots are indexed under their schema name and its underscored form (e.g. both
+    'in taxon' and 'in_taxon'), matching how SchemaView looks up column names.
+
+    Args:
+        schema_view: SchemaView of the schema to index
+
+    Returns:
+        Dictionary with the sorted list of multivalued slot names and the DuckDB types
+        of slots whose range is not read as VARCHAR
+    """
+    multivalued = set()
+    types = {}
+    all_types = schema_view.all_types()
+    for slot_name in schema_view.all_slots():
+        try:
+            slot = schema_view.induced_slot(slot_name)
+        except Exception:
+            continue
+        names = {slot_name, slot_name.replace(' ', '_')}
+        if slot.multivalued:
+            multivalued.update(names)
+        if slot.range in all_types:
+            col_type = LINKML_BASE_DUCKDB_TYPES.get(schema_view.induced_type(slot.range).base)
+            if col_type:
+                types.update(dict.fromkeys(names, col_type))
+    return {"format": SLOT_INDEX_FORMAT, "multivalued": sorted(multivalued), "types": dict(sorted(types.items()))}
+
+
+def _get_slot_index_path(schema_path: str) -> Optional[Path]:
+    """
+    Get the path of the slot index sidecar for a schema file.
+
+    Cached schemas are keyed by content hash already, so their index sits next to them.
+    Other local schema files get an index in the cache keyed by a hash of the schema
+    and its imported sibling files. Schemas that are not local files are not indexed.
+    """
+    path = Path(schema_path)
+    if not path.is_file():
+        return None
+    cache_dir = get_schema_cache_dir().resolve()
+    if path.resolve().parent.parent == cache_dir:
+        return path.parent / SLOT_INDEX_FILE
+
+    content = path.read_bytes()
+    digest = hashlib.sha256(content)
+    for name in _get_local_imports(content):
+        import_path = path.parent / f"{name}.yaml"
+        if import_path.is_file():
+            digest.update(import_path.read_bytes())
+    return cache_dir / "slot-index" / f"{digest.hexdigest()[:16]}.json"
 
 
 class SchemaParser:
-    """Parser for LinkML schemas to identify multivalued fields using SchemaView."""
+    """
+    Parser for LinkML schemas to identify multivalued fields and field types.
+
+    Lookups use a slot index computed once per schema with SchemaView and saved as a
+    JSON sidecar (see build_slot_index), so the schema itself is only parsed the first
+    time it is used.
+    """
     
     def __init__(self, schema_path: Optional[str] = None):
         """
         Initialize the schema parser.
         
         Args:
-            schema_path: Path to LinkML YAML schema file. If None, uses latest Biolink Model.
+            schema_path: Path to LinkML YAML schema file. If None, uses the cached Biolink Model
+                (see get_default_schema_path).
         """
         self.schema_path = schema_path
-        self.schema_view = None
-        
-        if schema_path:
-            self.schema_view = SchemaView(schema_path)
-        else:
-            # Default to latest Biolink Model
-            try:
-                self.schema_view = SchemaView("https://raw.githubusercontent.com/biolink/biolink-model/master/biolink-model.yaml")
-            except Exception:
-                # Fallback if network unavailable
-                self.schema_view = None
+        self._resolved_schema_path = str(schema_path or get_default_schema_path())
+        self._schema_view = None
+
+        index = self._load_slot_index()
+        self.multivalued_slots: FrozenSet[str] = frozenset(index["multivalued"])
+        self.slot_types: Dict[str, str] = index["types"]
+
+    @property
+    def schema_view(self) -> "SchemaView":
+        """SchemaView of the schema, parsed on first access."""
+        if self._schema_view is None:
+            from linkml_runtime.utils.schemaview import SchemaView
+            self._schema_view = SchemaView(self._resolved_schema_path)
+        return self._schema_view
+
+    def _load_slot_index(self) -> Dict[str, Any]:
+        """Read the slot index sidecar of the schema, building and saving it if missing or outdated."""
+        index_path = _get_slot_index_path(self._resolved_schema_path)
+        if index_path is not None and index_path.exists():
+            with open(index_path, "r") as index_file:
+                index = json.load(index_file)
+            if index.get("format") == SLOT_INDEX_FORMAT:
+                return index
+
+        index = build_slot_index(self.schema_view)
+        if index_path is not None:
+            index_path.parent.mkdir(parents=True, exist_ok=True)
+            tmp_path = index_path.with_name(f"{index_path.name}.{os.getpid()}.tmp")
+            with open(tmp_path, "w") as index_file:
+                json.dump(index, index_file)
+            os.replace(tmp_path, index_path)
+        return index
     
     def is_field_multivalued(self, field_name: str) -> bool:
         """
         Check if a field is defined as multivalued in the schema.
-        Uses induced_slot to get the base slot definition.
         
         Args:
             field_name: Field/slot name to check
@@ -43,16 +299,19 @@ class SchemaParser:
         Returns:
             True if field is multivalued, False otherwise
         """
-        if not self.schema_view:
-            return False
+        return field_name in self.multivalued_slots
+    
+    def get_field_type(self, field_name: str) -> str:
+        """
+        Get the DuckDB column type for a field from the range of its slot.
         
-        try:
-            # Use induced_slot to get the complete slot definition
-            slot = self.schema_view.induced_slot(field_name)
-            return slot.multivalued if slot else False
-        except Exception:
-            # If slot doesn't exist or other error, assume not multivalued
-            return False
+        Args:
+            field_name: Field/slot name to check
+            
+        Returns:
+            DuckDB type name, VARCHAR if the slot's range is not a numeric, boolean or date type
+        """
+        return self.slot_types.get(field_name, 'VARCHAR')
     
     def get_multivalued_fields_from_list(self, field_names: List[str]) -> Set[str]:
         """
@@ -67,6 +326,32 @@ class SchemaParser:
         return {field for field in field_names if self.is_field_multivalued(field)}
 
 
+class KGXFieldParser:
+    """
+    Schema-free parser using the built-in list of KGX multivalued fields.
+
+    Has the same lookup interface as SchemaParser but never loads a LinkML schema,
+    so it starts instantly. All fields are read as VARCHAR.
+    """
+
+    def __init__(self):
+        self.schema_path = KGX_SCHEMA
+        self.multivalued_slots: FrozenSet[str] = frozenset().union(*get_kgx_multivalued_fields().values())
+        self.slot_types: Dict[str, str] = {}
+
+    def is_field_multivalued(self, field_name: str) -> bool:
+        """Check if a field is a known KGX multivalued field."""
+        return field_name in self.multivalued_slots
+
+    def get_field_type(self, field_name: str) -> str:
+        """Get the DuckDB column type for a field, which is always VARCHAR without a schema."""
+        return 'VARCHAR'
+
+    def get_multivalued_fields_from_list(self, field_names: List[str]) -> Set[str]:
+        """Filter a list of field names to only those that are known KGX multivalued fields."""
+        return {field for field in field_names if self.is_field_multivalued(field)}
+
+
 def get_kgx_multivalued_fields() -> Dict[str, Set[str]]:
     """
     Get commonly known multivalued fields for KGX format when no schema is available.
@@ -98,6 +383,25 @@ def get_kgx_multivalued_fields() -> Dict[str, Set[str]]:
     }
 
 
+def load_column_spec(spec_path: str) -> Dict[str, str]:
+    """
+    Load a column spec file mapping column names to DuckDB types.
+    
+    Args:
+        spec_path: Path to a YAML file of column name to type entries (e.g. ``negated: BOOLEAN``)
+        
+    Returns:
+        Dictionary mapping column names to upper-cased DuckDB type names
+    """
+    with open(spec_path, "r") as spec_file:
+        spec = yaml.safe_load(spec_file) or {}
+    
+    if not isinstance(spec, dict):
+        raise ValueError(f"Column spec {spec_path} must map column names to types")
+    
+    return {str(col_name): str(col_type).upper() for col_name, col_type in spec.items()}
+
+
 def split_multivalued_field(value: str, delimiter: str = '|') -> List[str]:
     """
     Split a pipe-delimited multivalued field into a list.
@@ -122,24 +426,51 @@ def split_multivalued_field(value: str, delimiter: str = '|') -> List[str]:
 _global_schema_parser = None
 
 
-def get_schema_parser(schema_path: Optional[str] = None) -> SchemaParser:
+def get_schema_parser(schema_path: Optional[str] = None) -> Union[SchemaParser, KGXFieldParser]:
     """
     Get a global schema parser instance (cached for performance).
     
     Args:
-        schema_path: Path to schema file (if different from cached instance)
+        schema_path: Path to schema file (None for the default Biolink Model), or KGX_SCHEMA
+            to use the built-in KGX field list without loading a schema
         
     Returns:
-        SchemaParser instance
+        SchemaParser instance, or KGXFieldParser for KGX_SCHEMA
     """
     global _global_schema_parser
     
-    if _global_schema_parser is None or (schema_path and schema_path != _global_schema_parser.schema_path):
-        _global_schema_parser = SchemaParser(schema_path)
+    if schema_path == KGX_SCHEMA:
+        if not isinstance(_global_schema_parser, KGXFieldParser):
+            _global_schema_parser = KGXFieldParser()
+        return _global_schema_parser
+
+    # The default schema is resolved on every call, so a changed CAT_MERGE_BIOLINK_VERSION or
+    # pin is picked up, and an uncached version raises instead of reusing an earlier parser
+    resolved_schema_path = str(schema_path or get_default_schema_path())
+    if getattr(_global_schema_parser, "_resolved_schema_path", None) != resolved_schema_path:
+        _global_schema_parser = SchemaParser(resolved_schema_path)
     
     return _global_schema_parser
 
 
+def get_schema_fingerprint(schema_parser: Union[SchemaParser, KGXFieldParser]) -> str:
+    """
+    Identify the schema a parser resolved to by its path and the slots it reads.
+
+    Differs whenever the multivalued slots or slot types change, including when the
+    default schema changes or a schema file is edited in place.
+
+    Args:
+        schema_parser: Parser returned by get_schema_parser
+
+    Returns:
+        Resolved schema path (or KGX_SCHEMA) and a hash of its multivalued slots and slot types
+    """
+    slots = json.dumps([sorted(schema_parser.multivalued_slots), sorted(schema_parser.slot_types.items())])
+    schema = getattr(schema_parser, "_resolved_schema_path", schema_parser.schema_path)
+    return f"{schema}:{hashlib.sha256(slots.encode()).hexdigest()[:16]}"
+
+
 def is_field_multivalued(field_name: str, schema_path: Optional[str] = None) -> bool:
     """
     Convenience function to check if a field is multivalued.
@@ -0,0 +1,2 @@
+# Tests at the top level of the repository share the cache isolation of tests/
+from tests.conftest import cat_merge_cache_dir, session_cache_dir  # noqa: F401
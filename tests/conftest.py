@@ -5,6 +5,20 @@ from tests.fixtures.edges import kg_edges_1, kg_report_edges_1
 from tests.fixtures.nodes import kg_nodes_1, kg_report_nodes_1
 
 
+@pytest.fixture(scope="session")
+def session_cache_dir(tmp_path_factory):
+    """Cache directory shared by the session's tests, so the bundled schema is indexed once."""
+    return tmp_path_factory.mktemp("cat-merge-cache")
+
+
+@pytest.fixture(autouse=True)
+def cat_merge_cache_dir(session_cache_dir, monkeypatch):
+    """Keep schema and mapping caches out of the user's cache directory, and ignore its pinned version."""
+    monkeypatch.setenv("CAT_MERGE_CACHE_DIR", str(session_cache_dir))
+    monkeypatch.delenv("CAT_MERGE_BIOLINK_VERSION", raising=False)
+    return session_cache_dir
+
+
 @pytest.fixture
 def kg_1(kg_report_edges_1, kg_report_nodes_1) -> MergedKG:
     kg = MergedKG(nodes=kg_report_nodes_1, edges=kg_report_edges_1)
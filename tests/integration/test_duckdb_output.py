@@ -0,0 +1,45 @@
+import csv
+import shutil
+from pathlib import Path
+
+import pytest
+
+from cat_merge.duckdb_merge import merge_duckdb
+
+
+TEST_DATA = Path(__file__).parent.parent / "test_data"
+
+
+def read_tsv(path):
+    with open(path) as tsv_file:
+        return {row["id"]: row for row in csv.DictReader(tsv_file, delimiter="\t")}
+
+
+@pytest.fixture
+def output_dir(tmp_path):
+    source_dir = tmp_path / "source"
+    shutil.copytree(TEST_DATA, source_dir, ignore=shutil.ignore_patterns("expected"))
+    with open(source_dir / "test_kg_edges.tsv", "a") as edges_file:
+        # Edge with pipe-delimited multivalued fields
+        edges_file.write("\t".join([
+            "uuid:multi", "", "biolink:has_phenotype", "", "biolink:DiseaseToPhenotypicFeatureAssociation",
+            "", "infores:hpoa", "test_kg_edges", "", "", "", "", "PMID:1|PMID:2", "", "", "", "", "",
+            "MONDO:0009340", "HP:0002904"
+        ]) + "\n")
+    output_dir = tmp_path / "output"
+    merge_duckdb(name="test-kg", source=str(source_dir), output_dir=str(output_dir))
+    return output_dir
+
+
+def test_multivalued_fields_written_pipe_delimited(output_dir):
+    nodes = read_tsv(output_dir / "test-kg_nodes.tsv")
+    edges = read_tsv(output_dir / "test-kg_edges.tsv")
+    assert nodes["HP:0001081"]["category"] == "biolink:PhenotypicFeature"
+    assert edges["uuid:a7e327d5-4d46-11ed-b384-ad00dd9ee194"]["publications"] == "PMID:7655856"
+    assert edges["uuid:multi"]["publications"] == "PMID:1|PMID:2"
+    assert edges["uuid:multi"]["category"] == "biolink:DiseaseToPhenotypicFeatureAssociation"
+
+
+def test_no_list_text_in_outputs(output_dir):
+    for tsv_path in list(output_dir.glob("*.tsv")) + list((output_dir / "qc").glob("*.tsv")):
+        assert "['" not in tsv_path.read_text(), tsv_path.name
@@ -0,0 +1,83 @@
+import duckdb
+import pytest
+
+from cat_merge.duckdb_utils import apply_mappings, build_mapping_lookup
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE mappings AS SELECT * FROM (VALUES
+            ('MONDO:1', 'skos:exactMatch', 'OMIM:1', '0.9', 'mondo'),
+            ('MONDO:1', 'skos:exactMatch', 'OMIM:1', '0.9', 'other'),
+            ('MONDO:1', 'skos:closeMatch', 'OMIM:2', '0.95', 'mondo'),
+            ('MONDO:2', 'skos:exactMatch', 'OMIM:2', '0.5', 'other'),
+            ('MONDO:3', 'skos:exactMatch', 'OMIM:3', NULL, 'mondo')
+        ) t(subject_id, predicate_id, object_id, confidence, mapping_source)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            ('uuid:1', 'OMIM:2', 'biolink:related_to', 'OMIM:2'),
+            ('uuid:2', 'OMIM:1', 'biolink:related_to', 'HP:1')
+        ) t(id, subject, predicate, object)
+    """)
+    return conn
+
+
+def lookup(conn):
+    return dict(conn.execute("SELECT object_id, subject_id FROM mapping_lookup").fetchall())
+
+
+def test_lookup_is_one_to_one(conn):
+    build_mapping_lookup(conn)
+    assert lookup(conn) == {"OMIM:1": "MONDO:1", "OMIM:2": "MONDO:1", "OMIM:3": "MONDO:3"}
+
+
+def test_conflicts_recorded(conn):
+    build_mapping_lookup(conn)
+    conflicts = conn.execute("""
+        SELECT object_id, subject_id, mapping_source, selected FROM mapping_conflicts
+    """).fetchall()
+    # Duplicate mappings to the same subject are not conflicts
+    assert conflicts == [("OMIM:2", "MONDO:1", "mondo", True), ("OMIM:2", "MONDO:2", "other", False)]
+
+
+@pytest.mark.parametrize("policy, priority, expected", [
+    ("mapping_source", ["other"], "MONDO:2"),
+    ("confidence", None, "MONDO:1"),
+    ("predicate", None, "MONDO:2"),
+])
+def test_conflict_policies(conn, policy, priority, expected):
+    build_mapping_lookup(conn, policy, priority)
+    assert lookup(conn)["OMIM:2"] == expected
+
+
+def test_unknown_policy(conn):
+    with pytest.raises(ValueError, match="Unknown mapping conflict policy"):
+        build_mapping_lookup(conn, "newest")
+
+
+def test_apply_mappings_does_not_multiply_edges(conn):
+    apply_mappings(conn)
+    edges = conn.execute("""
+        SELECT id, subject, object, original_subject, original_object FROM edges ORDER BY id
+    """).fetchall()
+    assert edges == [
+        ("uuid:1", "MONDO:1", "MONDO:1", "OMIM:2", "OMIM:2"),
+        ("uuid:2", "MONDO:1", "HP:1", "OMIM:1", None),
+    ]
+
+
+def test_apply_mappings_keeps_columns_and_input_provenance(conn):
+    conn.execute("ALTER TABLE edges ADD COLUMN original_object VARCHAR")
+    conn.execute("UPDATE edges SET original_object = 'OLD:1'")
+    columns = [col for (col,) in conn.execute("SELECT column_name FROM (DESCRIBE edges)").fetchall()]
+    apply_mappings(conn)
+    assert [col for (col,) in conn.execute("SELECT column_name FROM (DESCRIBE edges)").fetchall()] == \
+        columns + ["original_subject"]
+    # uuid:1's object is remapped, uuid:2's object is not mapped and keeps its input provenance
+    assert conn.execute("SELECT id, object, original_object FROM edges ORDER BY id").fetchall() == [
+        ("uuid:1", "MONDO:1", "OMIM:2"),
+        ("uuid:2", "HP:1", "OLD:1"),
+    ]
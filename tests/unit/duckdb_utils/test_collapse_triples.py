@@ -0,0 +1,70 @@
+import duckdb
+import pytest
+import yaml
+
+from cat_merge.duckdb_merge import merge_duckdb
+from cat_merge.duckdb_utils import merge_and_clean
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            ('Gene:1', 'a_nodes'), ('Disease:1', 'a_nodes')
+        ) t(id, provided_by)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            ('uuid:1', 'Gene:1', 'biolink:related_to', 'Disease:1', NULL, ['PMID:1'], 'b_edges'),
+            ('uuid:2', 'Gene:1', 'biolink:related_to', 'Disease:1', NULL, ['PMID:2', 'PMID:1'], 'a_edges'),
+            ('uuid:3', 'Gene:1', 'biolink:related_to', 'Disease:1', 'increased', ['PMID:3'], 'a_edges'),
+            ('uuid:4', 'Disease:1', 'biolink:related_to', 'Gene:1', NULL, ['PMID:4'], 'a_edges')
+        ) t(id, subject, predicate, object, object_direction_qualifier, publications, provided_by)
+    """)
+    return conn
+
+
+def edges(conn):
+    return conn.execute("SELECT id, publications, provided_by FROM edges ORDER BY id").fetchall()
+
+
+def test_triples_kept_without_dedup(conn):
+    merge_and_clean(conn)
+    assert len(edges(conn)) == 4
+    assert conn.execute("SELECT COUNT(*) FROM duckdb_tables() WHERE table_name = 'collapsed_edges'").fetchone()[0] == 0
+
+
+def test_triples_collapsed_by_qualifiers(conn):
+    merge_and_clean(conn, dedup_triples=True)
+    assert edges(conn) == [
+        ("uuid:2", ["PMID:2", "PMID:1"], "a_edges"),
+        ("uuid:3", ["PMID:3"], "a_edges"),
+        ("uuid:4", ["PMID:4"], "a_edges"),
+    ]
+    assert conn.execute("SELECT id, collapsed_ids, provided_by, count FROM collapsed_edges").fetchall() == [
+        ("uuid:2", ["uuid:2", "uuid:1"], ["a_edges", "b_edges"], 2)]
+
+
+def test_configured_qualifiers(conn):
+    merge_and_clean(conn, dedup_triples=True, qualifier_columns=[])
+    assert [id for id, _, _ in edges(conn)] == ["uuid:2", "uuid:4"]
+    with pytest.raises(ValueError, match="not found in edges: negated"):
+        merge_and_clean(conn, dedup_triples=True, qualifier_columns=["negated"])
+
+
+def test_collapsed_edges_qc_output(tmp_path):
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    (source_dir / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nDisease:1\tbiolink:Disease\n")
+    (source_dir / "a_edges.tsv").write_text("id\tsubject\tpredicate\tobject\tcategory\n"
+                                            "uuid:1\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n")
+    (source_dir / "b_edges.tsv").write_text("id\tsubject\tpredicate\tobject\tcategory\n"
+                                            "uuid:2\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n")
+    output_dir = tmp_path / "output"
+    merge_duckdb(name="test-kg", source=str(source_dir), output_dir=str(output_dir), dedup_triples=True)
+    collapsed = (output_dir / "qc" / "test-kg-collapsed-edges.tsv").read_text().splitlines()
+    assert collapsed[1].endswith("uuid:1\tuuid:1|uuid:2\ta_edges|b_edges\t2")
+    with open(output_dir / "qc_report.yaml") as report_file:
+        report = yaml.safe_load(report_file)
+    assert report["collapsed_edges"] == [{"name": "biolink:related_to", "total_number": 1, "collapsed_number": 1}]
@@ -0,0 +1,43 @@
+import pytest
+import yaml
+
+from cat_merge.duckdb_merge import merge_duckdb
+from cat_merge.duckdb_utils import read_kg_files
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    (tmp_path / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nGene:2\tbiolink:Gene\textra\nGene:3\tbiolink:Gene\n")
+    (tmp_path / "disease_nodes.tsv").write_text("id\tcategory\nDisease:1\tbiolink:Disease\n")
+    (tmp_path / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\tcategory\n"
+                                            "uuid:1\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n"
+                                            "uuid:2\tGene:3\n")
+    return tmp_path
+
+
+def test_rejected_rows_are_recorded(source_dir):
+    conn = read_kg_files(source=str(source_dir))
+    assert conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 3
+    rejects = conn.execute("SELECT provided_by, line, csv_line FROM rejects ORDER BY provided_by").fetchall()
+    assert rejects == [
+        ("g2d_edges", 3, "uuid:2\tGene:3"),
+        ("gene_nodes", 3, "Gene:2\tbiolink:Gene\textra"),
+    ]
+
+
+def test_parallel_rejected_rows_are_recorded(source_dir):
+    conn = read_kg_files(source=str(source_dir), workers=2)
+    rejects = conn.execute("SELECT provided_by, line FROM rejects ORDER BY provided_by").fetchall()
+    assert rejects == [("g2d_edges", 3), ("gene_nodes", 3)]
+
+
+def test_rejected_rows_qc_output(source_dir, tmp_path_factory):
+    output_dir = tmp_path_factory.mktemp("output")
+    merge_duckdb(name="test-kg", source=str(source_dir), output_dir=str(output_dir))
+    assert (output_dir / "qc" / "test-kg-rejected-rows.tsv").exists()
+    with open(output_dir / "qc_report.yaml") as report_file:
+        report = yaml.safe_load(report_file)
+    assert report["rejected_rows"] == [
+        {"name": "g2d_edges", "total_number": 1},
+        {"name": "gene_nodes", "total_number": 1},
+    ]
@@ -0,0 +1,46 @@
+import pytest
+
+from cat_merge.duckdb_merge import merge_duckdb
+from cat_merge.duckdb_utils import encode_low_cardinality_columns, read_kg_files
+
+
+@pytest.fixture
+def conn():
+    return read_kg_files(nodes=["tests/test_data/test_kg_nodes.tsv"], edges=["tests/test_data/test_kg_edges.tsv"])
+
+
+def test_columns_encoded_as_sorted_enums(conn):
+    before = conn.execute("SELECT * FROM edges ORDER BY provided_by, id").fetchall()
+    encode_low_cardinality_columns(conn)
+
+    edge_types = dict(conn.execute("SELECT column_name, column_type FROM (DESCRIBE edges)").fetchall())
+    for col_name in ["category", "predicate", "provided_by"]:
+        assert edge_types[col_name].startswith("ENUM(")
+    assert edge_types["subject"] == "VARCHAR"
+    node_types = dict(conn.execute("SELECT column_name, column_type FROM (DESCRIBE nodes)").fetchall())
+    assert node_types["category"].startswith("ENUM(")
+
+    assert conn.execute("SELECT * FROM edges ORDER BY provided_by, id").fetchall() == before
+
+
+def test_columns_over_max_values_not_encoded(conn):
+    # The test edges have 6 categories and 7 predicates
+    encode_low_cardinality_columns(conn, max_values=6)
+    edge_types = dict(conn.execute("SELECT column_name, column_type FROM (DESCRIBE edges)").fetchall())
+    assert edge_types["category"].startswith("ENUM(")
+    assert edge_types["predicate"] == "VARCHAR"
+
+
+def test_merge_with_enum_columns_matches_plain_merge(tmp_path):
+    for output_dir, enum_columns in [("plain", False), ("enum", True)]:
+        merge_duckdb(name="kg",
+                     nodes=["tests/test_data/test_kg_nodes.tsv"],
+                     edges=["tests/test_data/test_kg_edges.tsv"],
+                     output_dir=str(tmp_path / output_dir),
+                     graph_stats=True,
+                     enum_columns=enum_columns)
+
+    for output in ["kg_nodes.tsv", "kg_edges.tsv", "qc_report.yaml", "merged_graph_stats.yaml"]:
+        plain = sorted((tmp_path / "plain" / output).read_text().splitlines())
+        encoded = sorted((tmp_path / "enum" / output).read_text().splitlines())
+        assert encoded == plain, output
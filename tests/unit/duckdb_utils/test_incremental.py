@@ -0,0 +1,134 @@
+import json
+import os
+
+import pytest
+
+import cat_merge.duckdb_utils as duckdb_utils
+from cat_merge.duckdb_merge import merge_duckdb
+from cat_merge.duckdb_utils import read_kg_files
+from cat_merge.schema_utils import BIOLINK_SCHEMA_FILE, SLOT_INDEX_FILE, SLOT_INDEX_FORMAT, SchemaParser
+
+
+NODES_QUERY = "SELECT * FROM nodes ORDER BY id, provided_by"
+EDGES_QUERY = "SELECT * FROM edges ORDER BY id, provided_by"
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nGene:2\tbiolink:Gene\n")
+    (source / "disease_nodes.tsv").write_text("id\tcategory\tname\nDisease:1\tbiolink:Disease\tdis\n")
+    (source / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\tcategory\nuuid:1\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n")
+    return source
+
+
+@pytest.fixture
+def loaded_files(monkeypatch):
+    """Record the files passed to _load_file_list."""
+    loaded = []
+    load_file_list = duckdb_utils._load_file_list
+
+    def recording_load_file_list(conn, table_name, files, *args, **kwargs):
+        loaded.extend(os.path.basename(f) for f in files)
+        return load_file_list(conn, table_name, files, *args, **kwargs)
+
+    monkeypatch.setattr(duckdb_utils, "_load_file_list", recording_load_file_list)
+    return loaded
+
+
+def incremental_load(source_dir, database_path):
+    conn = read_kg_files(source=str(source_dir), database_path=str(database_path), incremental=True)
+    result = conn.execute(NODES_QUERY).fetchall(), conn.execute(EDGES_QUERY).fetchall()
+    columns = [col for (col,) in conn.execute("SELECT column_name FROM (DESCRIBE nodes)").fetchall()]
+    conn.close()
+    return result, columns
+
+
+def full_load(source_dir):
+    conn = read_kg_files(source=str(source_dir))
+    result = conn.execute(NODES_QUERY).fetchall(), conn.execute(EDGES_QUERY).fetchall()
+    columns = [col for (col,) in conn.execute("SELECT column_name FROM (DESCRIBE nodes)").fetchall()]
+    return result, columns
+
+
+def test_unchanged_files_are_not_reloaded(source_dir, tmp_path, loaded_files):
+    database_path = tmp_path / "kg.duckdb"
+    first = incremental_load(source_dir, database_path)
+    assert sorted(loaded_files) == ["disease_nodes.tsv", "g2d_edges.tsv", "gene_nodes.tsv"]
+
+    loaded_files.clear()
+    assert incremental_load(source_dir, database_path) == first
+    assert loaded_files == []
+
+
+def test_touched_file_with_same_content_is_not_reloaded(source_dir, tmp_path, loaded_files):
+    database_path = tmp_path / "kg.duckdb"
+    incremental_load(source_dir, database_path)
+    stat = os.stat(source_dir / "gene_nodes.tsv")
+    os.utime(source_dir / "gene_nodes.tsv", ns=(stat.st_atime_ns, stat.st_mtime_ns + 10**9))
+
+    loaded_files.clear()
+    incremental_load(source_dir, database_path)
+    assert loaded_files == []
+
+
+def test_changed_file_reloads_only_its_partition(source_dir, tmp_path, loaded_files):
+    database_path = tmp_path / "kg.duckdb"
+    incremental_load(source_dir, database_path)
+    (source_dir / "gene_nodes.tsv").write_text("id\tcategory\tsymbol\nGene:1\tbiolink:Gene\tG1\nGene:3\tbiolink:Gene\tG3\n")
+
+    loaded_files.clear()
+    result = incremental_load(source_dir, database_path)
+    assert loaded_files == ["gene_nodes.tsv"]
+    assert result == full_load(source_dir)
+
+
+def test_removed_and_added_files(source_dir, tmp_path):
+    database_path = tmp_path / "kg.duckdb"
+    incremental_load(source_dir, database_path)
+    (source_dir / "disease_nodes.tsv").unlink()
+    (source_dir / "pheno_nodes.tsv").write_text("id\tcategory\nHP:1\tbiolink:PhenotypicFeature\n")
+
+    result = incremental_load(source_dir, database_path)
+    assert result == full_load(source_dir)
+    assert "name" not in result[1]
+
+
+def test_incremental_merge_matches_full_merge(source_dir, tmp_path):
+    merge_duckdb(name="kg", source=str(source_dir), output_dir=str(tmp_path / "incremental"), incremental=True)
+    (source_dir / "g2d_edges.tsv").write_text(
+        "id\tsubject\tpredicate\tobject\tcategory\n"
+        "uuid:1\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n"
+        "uuid:2\tGene:2\tbiolink:related_to\tDisease:2\tbiolink:Association\n"
+    )
+    merge_duckdb(name="kg", source=str(source_dir), output_dir=str(tmp_path / "incremental"), incremental=True)
+    merge_duckdb(name="kg", source=str(source_dir), output_dir=str(tmp_path / "full"))
+
+    for output in ["kg_nodes.tsv", "kg_edges.tsv", "qc/kg-dangling-edges.tsv", "qc_report.yaml"]:
+        incremental_lines = sorted((tmp_path / "incremental" / output).read_text().splitlines())
+        full_lines = sorted((tmp_path / "full" / output).read_text().splitlines())
+        assert incremental_lines == full_lines, output
+
+
+def test_changed_default_schema_reloads_all_partitions(source_dir, tmp_path, loaded_files, cat_merge_cache_dir, monkeypatch):
+    database_path = tmp_path / "kg.duckdb"
+    incremental_load(source_dir, database_path)
+
+    # Cache a Biolink version whose category slot is single-valued and select it
+    parser = SchemaParser()
+    schema_dir = cat_merge_cache_dir / "biolink" / "9.9.9-test"
+    schema_dir.mkdir(parents=True)
+    (schema_dir / BIOLINK_SCHEMA_FILE).write_text("id: https://w3id.org/biolink/biolink-model\n")
+    (schema_dir / SLOT_INDEX_FILE).write_text(json.dumps({
+        "format": SLOT_INDEX_FORMAT,
+        "multivalued": sorted(parser.multivalued_slots - {"category"}),
+        "types": parser.slot_types,
+    }))
+    monkeypatch.setenv("CAT_MERGE_BIOLINK_VERSION", "9.9.9")
+    (source_dir / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nGene:3\tbiolink:Gene\n")
+
+    loaded_files.clear()
+    result = incremental_load(source_dir, database_path)
+    assert sorted(loaded_files) == ["disease_nodes.tsv", "g2d_edges.tsv", "gene_nodes.tsv"]
+    assert result == full_load(source_dir)
@@ -0,0 +1,67 @@
+import duckdb
+import pytest
+
+from cat_merge.duckdb_merge import merge_duckdb
+from cat_merge.duckdb_utils import create_qc_aggregations, intern_node_ids, merge_and_clean
+
+
+def make_conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            ('Gene:1', 'biolink:Gene', 'a_nodes'),
+            ('Gene:1', 'biolink:Gene', 'b_nodes'),
+            ('Disease:1', 'biolink:Disease', 'a_nodes')
+        ) t(id, category, provided_by)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            ('uuid:1', 'Gene:1', 'biolink:related_to', 'Disease:1', 'biolink:Association', 'a_edges'),
+            ('uuid:2', 'Gene:2', 'biolink:related_to', 'Disease:1', 'biolink:Association', 'a_edges')
+        ) t(id, subject, predicate, object, category, provided_by)
+    """)
+    return conn
+
+
+def test_keys_are_dense_integers():
+    conn = make_conn()
+    intern_node_ids(conn)
+    keys = conn.execute("SELECT node_key FROM node_keys ORDER BY node_key").fetchall()
+    assert keys == [(1,), (2,)]
+    assert conn.execute("SELECT typeof(node_key) FROM nodes LIMIT 1").fetchone()[0] == "UINTEGER"
+    # Gene:2 is not a node, so uuid:2's subject has no key
+    edge_keys = conn.execute("""
+        SELECT e.id, e.subject_key IS NULL, s.id, o.id
+        FROM edges e LEFT JOIN node_keys s ON e.subject_key = s.node_key LEFT JOIN node_keys o ON e.object_key = o.node_key
+        ORDER BY e.id
+    """).fetchall()
+    assert edge_keys == [("uuid:1", False, "Gene:1", "Disease:1"), ("uuid:2", True, None, "Disease:1")]
+
+
+@pytest.mark.parametrize("table", ["nodes", "edges", "duplicate_nodes", "dangling_edges", "edge_stats"])
+def test_merge_with_keys_matches_merge_without(table):
+    results = []
+    for intern in (False, True):
+        conn = make_conn()
+        if intern:
+            intern_node_ids(conn)
+        merge_and_clean(conn)
+        create_qc_aggregations(conn)
+        results.append(conn.execute(f"""
+            SELECT COLUMNS(c -> c NOT LIKE '%_key') FROM {table} ORDER BY ALL
+        """).fetchall())
+    assert results[0] == results[1]
+
+
+def test_keys_not_written(tmp_path):
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    (source_dir / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nDisease:1\tbiolink:Disease\n")
+    (source_dir / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\tcategory\n"
+                                              "uuid:1\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n"
+                                              "uuid:2\tGene:2\tbiolink:related_to\tDisease:1\tbiolink:Association\n")
+    output_dir = tmp_path / "output"
+    merge_duckdb(name="test-kg", source=str(source_dir), output_dir=str(output_dir))
+    for output_file in [output_dir / "test-kg_nodes.tsv", output_dir / "test-kg_edges.tsv",
+                        output_dir / "qc" / "test-kg-dangling-edges.tsv"]:
+        assert "_key" not in output_file.read_text().splitlines()[0]
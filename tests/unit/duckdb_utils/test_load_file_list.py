@@ -0,0 +1,64 @@
+import gzip
+
+import duckdb
+import pytest
+
+from cat_merge.duckdb_utils import _load_file_list
+
+
+@pytest.fixture
+def node_files(tmp_path):
+    files = {
+        "gene_nodes.tsv": "id\tcategory\tname\nGene:1\tbiolink:Gene\tfoo\nGene:2\tbiolink:Gene\tbar\n",
+        "disease_nodes.tsv": "id\tcategory\nDisease:1\tbiolink:Disease\n",
+        "pheno_nodes.tsv": "id\tcategory\tsymbol\nPheno:1\tbiolink:PhenotypicFeature\tp1\n",
+    }
+    paths = []
+    for file_name, content in files.items():
+        path = tmp_path / file_name
+        path.write_text(content)
+        paths.append(str(path))
+    return paths
+
+
+def _rows(conn, columns):
+    return conn.execute(f"SELECT {columns} FROM nodes ORDER BY id").fetchall()
+
+
+def test_parallel_load_provided_by(node_files):
+    conn = duckdb.connect()
+    _load_file_list(conn, "nodes", node_files, "_nodes", workers=3)
+    assert _rows(conn, "id, provided_by") == [
+        ("Disease:1", "disease_nodes"),
+        ("Gene:1", "gene_nodes"),
+        ("Gene:2", "gene_nodes"),
+        ("Pheno:1", "pheno_nodes"),
+    ]
+
+
+def test_parallel_load_unions_columns_by_name(node_files):
+    conn = duckdb.connect()
+    _load_file_list(conn, "nodes", node_files, "_nodes", workers=2)
+    assert _rows(conn, "id, name, symbol") == [
+        ("Disease:1", None, None),
+        ("Gene:1", "foo", None),
+        ("Gene:2", "bar", None),
+        ("Pheno:1", None, "p1"),
+    ]
+
+
+def test_parallel_load_matches_serial_load(node_files):
+    serial = duckdb.connect()
+    _load_file_list(serial, "nodes", node_files[:1], "_nodes")
+    parallel = duckdb.connect()
+    _load_file_list(parallel, "nodes", node_files[:1], "_nodes", workers=4)
+    assert _rows(serial, "*") == _rows(parallel, "id, category, name, provided_by")
+
+
+def test_compressed_file_provided_by(tmp_path):
+    path = tmp_path / "gene_nodes.tsv.gz"
+    with gzip.open(path, "wt") as f:
+        f.write("id\tcategory\nGene:1\tbiolink:Gene\n")
+    conn = duckdb.connect()
+    _load_file_list(conn, "nodes", [str(path)], "_nodes")
+    assert _rows(conn, "id, provided_by") == [("Gene:1", "gene_nodes")]
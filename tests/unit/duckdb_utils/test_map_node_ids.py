@@ -0,0 +1,64 @@
+import duckdb
+import pytest
+
+from cat_merge.duckdb_utils import apply_mappings, merge_and_clean
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            ('Gene:1', 'biolink:Gene', 'gene_nodes'),
+            ('XGene:1', 'biolink:Gene', 'xgene_nodes'),
+            ('XGene:2', 'biolink:Gene', 'xgene_nodes'),
+            ('Disease:1', 'biolink:Disease', 'disease_nodes')
+        ) t(id, category, provided_by)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            ('uuid:1', 'XGene:2', 'biolink:related_to', 'Disease:1', 'g2d_edges')
+        ) t(id, subject, predicate, object, provided_by)
+    """)
+    conn.execute("""
+        CREATE TABLE mappings AS SELECT * FROM (VALUES
+            ('Gene:1', 'skos:exactMatch', 'XGene:1', 'test'),
+            ('Gene:2', 'skos:exactMatch', 'XGene:2', 'test')
+        ) t(subject_id, predicate_id, object_id, mapping_source)
+    """)
+    return conn
+
+
+def test_node_ids_mapped(conn):
+    apply_mappings(conn, map_node_ids=True)
+    columns = [col for (col,) in conn.execute("SELECT column_name FROM (DESCRIBE nodes)").fetchall()]
+    assert columns == ["id", "category", "provided_by", "original_id"]
+    assert conn.execute("SELECT id, original_id FROM nodes ORDER BY id, original_id NULLS FIRST").fetchall() == [
+        ("Disease:1", None),
+        ("Gene:1", None),
+        ("Gene:1", "XGene:1"),
+        ("Gene:2", "XGene:2"),
+    ]
+
+
+def test_remapped_duplicates_are_merged(conn):
+    apply_mappings(conn, map_node_ids=True)
+    merge_and_clean(conn)
+    assert conn.execute("SELECT count(*) FROM duplicate_nodes").fetchone()[0] == 2
+    assert conn.execute("SELECT id, provided_by FROM nodes ORDER BY id").fetchall() == [
+        ("Disease:1", "disease_nodes"),
+        ("Gene:1", "gene_nodes"),
+        ("Gene:2", "xgene_nodes"),
+    ]
+    assert conn.execute("SELECT count(*) FROM dangling_edges").fetchone()[0] == 0
+    assert conn.execute("SELECT subject FROM edges").fetchall() == [("Gene:2",)]
+
+
+def test_input_original_id_kept(conn):
+    conn.execute("ALTER TABLE nodes ADD COLUMN original_id VARCHAR")
+    conn.execute("UPDATE nodes SET original_id = 'OLD:1' WHERE id = 'Disease:1'")
+    apply_mappings(conn, map_node_ids=True)
+    assert dict(conn.execute("SELECT provided_by, original_id FROM nodes WHERE id != 'Gene:1'").fetchall()) == {
+        "disease_nodes": "OLD:1",
+        "xgene_nodes": "XGene:2",
+    }
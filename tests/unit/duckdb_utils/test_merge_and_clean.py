@@ -0,0 +1,87 @@
+import duckdb
+import pytest
+
+from cat_merge.duckdb_utils import merge_and_clean
+
+
+@pytest.fixture
+def conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            ('Gene:1', 'biolink:Gene', 'b_nodes'),
+            ('Gene:1', 'biolink:Gene', 'a_nodes'),
+            ('Disease:1', 'biolink:Disease', 'a_nodes')
+        ) t(id, category, provided_by)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            ('uuid:1', 'Gene:1', 'Disease:1', 'b_edges'),
+            ('uuid:1', 'Gene:1', 'Disease:1', 'c_edges'),
+            ('uuid:2', 'Gene:2', 'Disease:1', 'a_edges'),
+            ('uuid:2', 'Gene:1', 'Disease:1', 'b_edges'),
+            ('uuid:3', 'Gene:1', 'Disease:2', 'a_edges')
+        ) t(id, subject, object, provided_by)
+    """)
+    merge_and_clean(conn)
+    return conn
+
+
+def rows(conn, query):
+    return conn.execute(query).fetchall()
+
+
+def test_clean_nodes(conn):
+    assert rows(conn, "SELECT id, provided_by FROM nodes ORDER BY id") == [
+        ("Disease:1", "a_nodes"), ("Gene:1", "a_nodes")]
+    assert rows(conn, "SELECT id, provided_by FROM duplicate_nodes ORDER BY provided_by") == [
+        ("Gene:1", "a_nodes"), ("Gene:1", "b_nodes")]
+
+
+def test_clean_edges(conn):
+    # uuid:2 keeps its non-dangling row even though the dangling row sorts first by provided_by
+    assert rows(conn, "SELECT id, subject, provided_by FROM edges ORDER BY id") == [
+        ("uuid:1", "Gene:1", "b_edges"), ("uuid:2", "Gene:1", "b_edges")]
+    assert rows(conn, "SELECT id, provided_by FROM duplicate_edges ORDER BY id, provided_by") == [
+        ("uuid:1", "b_edges"), ("uuid:1", "c_edges"), ("uuid:2", "a_edges"), ("uuid:2", "b_edges")]
+    assert rows(conn, "SELECT id, provided_by FROM dangling_edges ORDER BY id") == [
+        ("uuid:2", "a_edges"), ("uuid:3", "a_edges")]
+
+
+def test_no_classification_columns_left(conn):
+    for table in ("nodes", "edges", "duplicate_nodes", "duplicate_edges", "dangling_edges"):
+        columns = [col for (col,) in rows(conn, f"SELECT column_name FROM (DESCRIBE {table})")]
+        assert not [col for col in columns if col.startswith("_")]
+    assert rows(conn, "SELECT table_name FROM duckdb_tables() WHERE temporary") == []
+
+
+@pytest.fixture
+def duplicate_nodes_conn():
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            ('Gene:1', 'A', ['X:1', 'X:2'], NULL, 'a_nodes'),
+            ('Gene:1', 'B', ['X:2', 'X:3'], ['syn'], 'b_nodes'),
+            ('Gene:2', 'C', NULL, NULL, 'c_nodes')
+        ) t(id, name, xref, synonym, provided_by)
+    """)
+    conn.execute("CREATE TABLE edges (id VARCHAR, subject VARCHAR, object VARCHAR, provided_by VARCHAR)")
+    return conn
+
+
+@pytest.mark.parametrize("strategy, priority, expected", [
+    ("first", ["b_nodes"], [("Gene:1", "A", ["X:1", "X:2"], None, "a_nodes")]),
+    ("priority", ["b_nodes"], [("Gene:1", "B", ["X:2", "X:3"], ["syn"], "b_nodes")]),
+    ("union", None, [("Gene:1", "A", ["X:1", "X:2", "X:3"], ["syn"], "a_nodes")]),
+    ("union", ["b_nodes"], [("Gene:1", "B", ["X:2", "X:3", "X:1"], ["syn"], "b_nodes")]),
+])
+def test_node_merge_strategies(duplicate_nodes_conn, strategy, priority, expected):
+    merge_and_clean(duplicate_nodes_conn, strategy, priority)
+    assert rows(duplicate_nodes_conn, "SELECT * FROM nodes ORDER BY id") == \
+        expected + [("Gene:2", "C", None, None, "c_nodes")]
+    assert rows(duplicate_nodes_conn, "SELECT COUNT(*) FROM duplicate_nodes") == [(2,)]
+
+
+def test_unknown_node_merge_strategy(duplicate_nodes_conn):
+    with pytest.raises(ValueError, match="Unknown node merge strategy"):
+        merge_and_clean(duplicate_nodes_conn, "last")
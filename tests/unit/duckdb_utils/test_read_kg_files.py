@@ -0,0 +1,216 @@
+import gzip
+import tarfile
+
+import duckdb
+import pytest
+
+from cat_merge.duckdb_utils import duckdb_config, read_kg_files
+
+
+@pytest.fixture
+def source_dir(tmp_path):
+    (tmp_path / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nGene:2\tbiolink:Gene\n")
+    (tmp_path / "disease_nodes.tsv").write_text("id\tcategory\tname\nDisease:1\tbiolink:Disease\tdis\n")
+    (tmp_path / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\nuuid:1\tGene:1\tbiolink:related_to\tDisease:1\n")
+    return str(tmp_path)
+
+
+def test_source_dir_provided_by(source_dir):
+    conn = read_kg_files(source=source_dir)
+    rows = conn.execute("SELECT id, name, provided_by FROM nodes ORDER BY id").fetchall()
+    assert rows == [
+        ("Disease:1", "dis", "disease_nodes"),
+        ("Gene:1", None, "gene_nodes"),
+        ("Gene:2", None, "gene_nodes"),
+    ]
+    assert conn.execute("SELECT provided_by FROM edges").fetchall() == [("g2d_edges",)]
+
+
+def test_source_dir_creates_no_staging_tables(source_dir):
+    conn = read_kg_files(source=source_dir)
+    tables = {name for (name,) in conn.execute("SELECT table_name FROM information_schema.tables").fetchall()}
+    assert tables == {"nodes", "edges", "rejects"}
+
+
+def test_source_dir_parallel_matches_serial(source_dir):
+    serial = read_kg_files(source=source_dir)
+    parallel = read_kg_files(source=source_dir, workers=2)
+    query = "SELECT id, category, name, provided_by FROM nodes ORDER BY id"
+    assert serial.execute(query).fetchall() == parallel.execute(query).fetchall()
+
+
+def test_source_dir_parallel_column_order_matches_serial(source_dir):
+    with open(f"{source_dir}/pheno_nodes.tsv", "w") as f:
+        f.write("id\tcategory\tdescription\nPheno:1\tbiolink:PhenotypicFeature\tpheno\n")
+    serial = read_kg_files(source=source_dir)
+    for workers in (2, 3):
+        parallel = read_kg_files(source=source_dir, workers=workers)
+        for table in ("nodes", "edges"):
+            assert parallel.execute(f"DESCRIBE {table}").fetchall() == serial.execute(f"DESCRIBE {table}").fetchall()
+
+
+def test_source_dir_compressed_files(source_dir):
+    with gzip.open(f"{source_dir}/chem_nodes.tsv.gz", "wt") as f:
+        f.write("id\tcategory\nChem:1\tbiolink:ChemicalEntity\n")
+    duckdb.connect().execute(f"""
+        COPY (SELECT 'Pheno:1' as id, 'biolink:PhenotypicFeature' as category)
+        TO '{source_dir}/pheno_nodes.tsv.zst' (FORMAT CSV, DELIMITER '\t', HEADER, COMPRESSION zstd)
+    """)
+    conn = read_kg_files(source=source_dir)
+    rows = conn.execute("SELECT id, provided_by FROM nodes WHERE id IN ('Chem:1', 'Pheno:1') ORDER BY id").fetchall()
+    assert rows == [("Chem:1", "chem_nodes"), ("Pheno:1", "pheno_nodes")]
+
+
+def test_source_dir_without_edges_raises(tmp_path):
+    (tmp_path / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\n")
+    with pytest.raises(ValueError):
+        read_kg_files(source=str(tmp_path))
+
+
+def test_tar_archive_source(source_dir, tmp_path_factory):
+    tar_path = tmp_path_factory.mktemp("archive") / "kg.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        for file_name in ("gene_nodes.tsv", "disease_nodes.tsv", "g2d_edges.tsv"):
+            tar.add(f"{source_dir}/{file_name}", arcname=f"kg/{file_name}")
+    from_tar = read_kg_files(source=str(tar_path))
+    from_dir = read_kg_files(source=source_dir)
+    query = "SELECT id, category, name, provided_by FROM nodes ORDER BY id"
+    assert from_tar.execute(query).fetchall() == from_dir.execute(query).fetchall()
+    assert from_tar.execute("SELECT id, subject, object, provided_by FROM edges").fetchall() == \
+        [("uuid:1", "Gene:1", "Disease:1", "g2d_edges")]
+
+
+def test_tar_archive_rejected_lines(tmp_path):
+    (tmp_path / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nGene:2\tbiolink:Gene\textra\n")
+    (tmp_path / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\nuuid:1\tGene:1\tbiolink:related_to\tGene:2\n")
+    tar_path = tmp_path / "kg.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        for file_name in ("gene_nodes.tsv", "g2d_edges.tsv"):
+            tar.add(tmp_path / file_name, arcname=f"kg/{file_name}")
+    conn = read_kg_files(source=str(tar_path))
+    assert conn.execute("SELECT id FROM nodes").fetchall() == [("Gene:1",)]
+    assert conn.execute("SELECT provided_by, file, line, error_type, csv_line FROM rejects").fetchall() == [
+        ("gene_nodes", "kg/gene_nodes.tsv", 3, "TOO MANY COLUMNS", "Gene:2\tbiolink:Gene\textra")
+    ]
+
+
+def test_tar_archive_short_lines_rejected_as_in_directory(tmp_path):
+    source = tmp_path / "source"
+    source.mkdir()
+    (source / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\n")
+    (source / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\n"
+                                          "uuid:1\tGene:1\tbiolink:related_to\tGene:1\n"
+                                          "bad line with too\tmany\n")
+    tar_path = tmp_path / "kg.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        for file_name in ("gene_nodes.tsv", "g2d_edges.tsv"):
+            tar.add(source / file_name, arcname=file_name)
+    query = "SELECT provided_by, line, error_type, error, csv_line FROM rejects"
+    from_tar = read_kg_files(source=str(tar_path))
+    from_dir = read_kg_files(source=str(source))
+    assert from_tar.execute("SELECT id FROM edges").fetchall() == [("uuid:1",)]
+    assert from_tar.execute(query).fetchall() == from_dir.execute(query).fetchall() == [
+        ("g2d_edges", 3, "MISSING COLUMNS", "Expected Number of Columns: 4 Found: 2", "bad line with too\tmany")
+    ]
+
+
+def test_tar_archive_incremental_replaces_rejects(tmp_path):
+    (tmp_path / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nGene:2\tbiolink:Gene\textra\n")
+    (tmp_path / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\nuuid:1\tGene:1\tbiolink:related_to\tGene:1\n")
+    tar_path = tmp_path / "kg.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        for file_name in ("gene_nodes.tsv", "g2d_edges.tsv"):
+            tar.add(tmp_path / file_name, arcname=f"kg/{file_name}")
+    for _ in range(3):
+        conn = read_kg_files(source=str(tar_path), database_path=str(tmp_path / "kg.duckdb"), incremental=True)
+        assert conn.execute("SELECT COUNT(*) FROM rejects").fetchone()[0] == 1
+        conn.close()
+
+
+@pytest.mark.parametrize("options", [{"workers": 2}, {"explicit_columns": True}])
+def test_tar_archive_unsupported_options_raise(source_dir, tmp_path_factory, options):
+    tar_path = tmp_path_factory.mktemp("archive") / "kg.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        for file_name in ("gene_nodes.tsv", "g2d_edges.tsv"):
+            tar.add(f"{source_dir}/{file_name}", arcname=f"kg/{file_name}")
+    with pytest.raises(ValueError, match="not supported for tar archive sources"):
+        read_kg_files(source=str(tar_path), **options)
+
+
+def test_source_not_directory_or_archive_raises(tmp_path):
+    path = tmp_path / "not_an_archive.txt"
+    path.write_text("hello")
+    with pytest.raises(ValueError):
+        read_kg_files(source=str(path))
+
+
+def test_source_dir_mixed_tsv_and_parquet(source_dir):
+    duckdb.connect().execute(f"""
+        COPY (SELECT 'Chem:1' as id, 'chem' as name, 'biolink:ChemicalEntity' as category,
+                     ['a', 'b'] as xref, ['c', 'd'] as tags)
+        TO '{source_dir}/chem_nodes.parquet' (FORMAT PARQUET)
+    """)
+    conn = read_kg_files(source=source_dir)
+    rows = conn.execute("SELECT id, category, name, xref, tags, provided_by FROM nodes ORDER BY id").fetchall()
+    # Lists in multivalued Biolink slots are kept, other lists are joined with '|' as in TSV files
+    assert rows == [
+        ("Chem:1", ["biolink:ChemicalEntity"], "chem", ["a", "b"], "c|d", "chem_nodes"),
+        ("Disease:1", ["biolink:Disease"], "dis", None, None, "disease_nodes"),
+        ("Gene:1", ["biolink:Gene"], None, None, None, "gene_nodes"),
+        ("Gene:2", ["biolink:Gene"], None, None, None, "gene_nodes"),
+    ]
+
+
+def test_file_list_with_parquet(source_dir):
+    duckdb.connect().execute(f"""
+        COPY (SELECT 'Chem:1' as id, 'biolink:ChemicalEntity' as category)
+        TO '{source_dir}/chem_nodes.parquet' (FORMAT PARQUET)
+    """)
+    conn = read_kg_files(nodes=[f"{source_dir}/gene_nodes.tsv", f"{source_dir}/chem_nodes.parquet"],
+                         edges=[f"{source_dir}/g2d_edges.tsv"])
+    rows = conn.execute("SELECT id, provided_by FROM nodes ORDER BY id").fetchall()
+    assert rows == [("Chem:1", "chem_nodes"), ("Gene:1", "gene_nodes"), ("Gene:2", "gene_nodes")]
+
+
+def test_column_spec_explicit_types(source_dir, tmp_path_factory):
+    spec_path = tmp_path_factory.mktemp("spec") / "columns.yaml"
+    spec_path.write_text("negated: boolean\nhas_count: BIGINT\n")
+    with gzip.open(f"{source_dir}/counts_edges.tsv.gz", "wt") as f:
+        f.write("id\tsubject\tpredicate\tobject\tnegated\thas_count\n"
+                "uuid:2\tGene:2\tbiolink:related_to\tDisease:1\tTrue\t3\n")
+    conn = read_kg_files(source=source_dir, column_spec=str(spec_path))
+    types = dict(conn.execute("SELECT column_name, data_type FROM information_schema.columns "
+                              "WHERE table_name = 'edges'").fetchall())
+    assert types["negated"] == "BOOLEAN"
+    assert types["has_count"] == "BIGINT"
+    assert types["subject"] == "VARCHAR"
+    rows = conn.execute("SELECT id, negated, has_count, provided_by FROM edges ORDER BY id").fetchall()
+    assert rows == [("uuid:1", None, None, "g2d_edges"), ("uuid:2", True, 3, "counts_edges")]
+
+
+def test_explicit_columns_without_schema_reads_varchar(source_dir):
+    explicit = read_kg_files(source=source_dir, explicit_columns=True)
+    sniffed = read_kg_files(source=source_dir)
+    query = "SELECT id, category, name, provided_by FROM nodes ORDER BY id"
+    assert explicit.execute(query).fetchall() == sniffed.execute(query).fetchall()
+
+
+def test_duckdb_config_omits_unset_settings():
+    assert duckdb_config() == {}
+    assert duckdb_config(memory_limit="1GB", threads=2, preserve_insertion_order=False) == {
+        "memory_limit": "1GB",
+        "threads": 2,
+        "preserve_insertion_order": False,
+    }
+
+
+def test_resource_config_applied_to_connection(source_dir, tmp_path):
+    spill_dir = str(tmp_path / "spill")
+    config = duckdb_config(memory_limit="1GB", threads=2, temp_directory=spill_dir, preserve_insertion_order=False)
+    conn = read_kg_files(source=source_dir, config=config)
+    settings = dict(conn.execute(
+        "SELECT name, value FROM duckdb_settings() "
+        "WHERE name IN ('threads', 'temp_directory', 'preserve_insertion_order')"
+    ).fetchall())
+    assert settings == {"threads": "2", "temp_directory": spill_dir, "preserve_insertion_order": "false"}
+    assert conn.execute("SELECT count(*) FROM nodes").fetchone()[0] == 3
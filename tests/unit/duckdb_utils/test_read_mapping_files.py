@@ -0,0 +1,79 @@
+import duckdb
+import pytest
+
+from cat_merge import duckdb_utils
+from cat_merge.duckdb_utils import read_mapping_files
+
+
+@pytest.fixture
+def mapping_files(tmp_path):
+    (tmp_path / "mondo.sssom.tsv").write_text(
+        "# curie_map:\n"
+        "subject_id\tpredicate_id\tobject_id\tmapping_justification\tconfidence\n"
+        "MONDO:1\tskos:exactMatch\tOMIM:1\tsemapv:ManualMappingCuration\t0.9\n"
+        "MONDO:2\tskos:exactMatch\tOMIM:2\tsemapv:LexicalMatching\t0.5\n"
+        "MONDO:3\tskos:broadMatch\tOMIM:3\tsemapv:ManualMappingCuration\t0.95\n"
+        "MONDO:4\tskos:exactMatch\tOMIM:4\tsemapv:ManualMappingCuration\t\n"
+    )
+    (tmp_path / "other.sssom.tsv").write_text(
+        "subject_id\tpredicate_id\tobject_id\n"
+        "HGNC:1\tskos:exactMatch\tNCBIGene:1\n"
+    )
+    return [str(tmp_path / "*.sssom.tsv")]
+
+
+def mapped_ids(conn):
+    return [object_id for (object_id,) in conn.execute("SELECT object_id FROM mappings ORDER BY object_id").fetchall()]
+
+
+def test_no_filters(mapping_files):
+    conn = duckdb.connect()
+    read_mapping_files(conn, mapping_files)
+    assert mapped_ids(conn) == ["NCBIGene:1", "OMIM:1", "OMIM:2", "OMIM:3", "OMIM:4"]
+
+
+@pytest.mark.parametrize("filters, expected", [
+    ({"predicates": ["skos:exactMatch"]}, ["NCBIGene:1", "OMIM:1", "OMIM:2", "OMIM:4"]),
+    ({"justifications": ["semapv:ManualMappingCuration"]}, ["OMIM:1", "OMIM:3", "OMIM:4"]),
+    ({"min_confidence": 0.8}, ["OMIM:1", "OMIM:3"]),
+    ({"predicates": ["skos:exactMatch"], "min_confidence": 0.8}, ["OMIM:1"]),
+])
+def test_filters(mapping_files, filters, expected):
+    conn = duckdb.connect()
+    read_mapping_files(conn, mapping_files, **filters)
+    assert mapped_ids(conn) == expected
+
+
+def test_cached_mappings_reused(mapping_files, tmp_path, monkeypatch):
+    cache_dir = tmp_path / "cache"
+    read_mapping_files(duckdb.connect(), mapping_files, predicates=["skos:exactMatch"], cache_dir=cache_dir)
+    assert len(list(cache_dir.glob("*.rejects.parquet"))) == 1
+
+    def fail(*args, **kwargs):
+        raise AssertionError("mapping files should not be parsed")
+    monkeypatch.setattr(duckdb_utils, "_read_csv_sql", fail)
+    conn = duckdb.connect()
+    read_mapping_files(conn, mapping_files, predicates=["skos:exactMatch"], cache_dir=cache_dir)
+    assert mapped_ids(conn) == ["NCBIGene:1", "OMIM:1", "OMIM:2", "OMIM:4"]
+    assert conn.execute("SELECT DISTINCT mapping_source FROM mappings ORDER BY 1").fetchall() == [("mondo",), ("other",)]
+
+
+def test_cache_key_changes_with_content_and_filters(mapping_files, tmp_path):
+    cache_dir = tmp_path / "cache"
+    read_mapping_files(duckdb.connect(), mapping_files, cache_dir=cache_dir)
+    read_mapping_files(duckdb.connect(), mapping_files, min_confidence=0.8, cache_dir=cache_dir)
+    with open(tmp_path / "other.sssom.tsv", "a") as mapping_file:
+        mapping_file.write("HGNC:2\tskos:exactMatch\tNCBIGene:2\n")
+    conn = duckdb.connect()
+    read_mapping_files(conn, mapping_files, cache_dir=cache_dir)
+    assert "NCBIGene:2" in mapped_ids(conn)
+    assert len(list(cache_dir.glob("*.rejects.parquet"))) == 3
+
+
+def test_cached_rejects_restored(tmp_path):
+    mapping_file = tmp_path / "bad.sssom.tsv"
+    mapping_file.write_text("subject_id\tpredicate_id\tobject_id\nA:1\tskos:exactMatch\tB:1\nA:2\n")
+    for _ in range(2):
+        conn = duckdb.connect()
+        read_mapping_files(conn, [str(mapping_file)], cache_dir=tmp_path / "cache")
+        assert conn.execute("SELECT provided_by, file, line FROM rejects").fetchall() == [("bad.sssom", str(mapping_file), 3)]
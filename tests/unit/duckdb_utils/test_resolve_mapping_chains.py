@@ -0,0 +1,47 @@
+import duckdb
+import pytest
+
+from cat_merge.duckdb_utils import build_mapping_lookup
+
+
+def conn_with_mappings(mappings):
+    conn = duckdb.connect()
+    conn.execute("CREATE TABLE mappings (subject_id VARCHAR, object_id VARCHAR, mapping_source VARCHAR)")
+    conn.executemany("INSERT INTO mappings VALUES (?, ?, 'test')", mappings)
+    return conn
+
+
+def lookup(conn):
+    return dict(conn.execute("SELECT object_id, subject_id FROM mapping_lookup").fetchall())
+
+
+def cycles(conn):
+    return conn.execute("SELECT object_id, subject_id, path, reason FROM mapping_cycles ORDER BY object_id").fetchall()
+
+
+def test_chains_resolved_to_final_target():
+    # C <- B <- A, where A -> B and B -> C come from different rows
+    conn = conn_with_mappings([("B", "A"), ("C", "B"), ("X", "Y"), ("Z", "Z")])
+    build_mapping_lookup(conn)
+    assert lookup(conn) == {"A": "C", "B": "C", "Y": "X", "Z": "Z"}
+    assert cycles(conn) == []
+
+
+def test_cycles_keep_single_hop_and_are_reported():
+    conn = conn_with_mappings([("B", "A"), ("A", "B"), ("A", "C")])
+    build_mapping_lookup(conn)
+    assert lookup(conn) == {"A": "B", "B": "A", "C": "A"}
+    assert cycles(conn) == [
+        ("A", "B", ["A", "B", "A"], "cycle"),
+        ("B", "A", ["B", "A", "B"], "cycle"),
+        ("C", "A", ["C", "A", "B", "A"], "cycle"),
+    ]
+
+
+@pytest.mark.parametrize("max_depth, expected", [(1, "B"), (2, "C"), (3, "D")])
+def test_max_depth(max_depth, expected):
+    conn = conn_with_mappings([("B", "A"), ("C", "B"), ("D", "C")])
+    build_mapping_lookup(conn, max_depth=max_depth)
+    assert lookup(conn)["A"] == expected
+    truncated = [object_id for object_id, _, _, reason in cycles(conn) if reason == "max_depth"]
+    assert ("A" in truncated) == (max_depth < 3)
@@ -0,0 +1,123 @@
+import duckdb
+import pytest
+
+from cat_merge.duckdb_merge import merge_duckdb
+from cat_merge.duckdb_shards import _write_node_lookup, sharded_merge_and_clean
+from cat_merge.duckdb_utils import create_qc_aggregations, intern_node_ids, merge_and_clean
+
+
+TABLES = ["nodes", "edges", "duplicate_nodes", "duplicate_edges", "dangling_edges", "node_stats", "edge_stats"]
+
+
+def make_conn(intern=True):
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS SELECT * FROM (VALUES
+            ('Gene:1', 'biolink:Gene', ['X:1'], 'b_nodes'),
+            ('Gene:1', 'biolink:Gene', ['X:2'], 'a_nodes'),
+            ('Gene:2', 'biolink:Gene', NULL, 'a_nodes'),
+            ('Disease:1', 'biolink:Disease', NULL, 'a_nodes'),
+            ('Disease:2', 'biolink:Disease', ['X:3'], 'b_nodes')
+        ) t(id, category, xref, provided_by)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS SELECT * FROM (VALUES
+            ('uuid:1', 'Gene:1', 'biolink:related_to', 'Disease:1', ['PMID:1'], 'biolink:Association', 'a_edges'),
+            ('uuid:1', 'Gene:1', 'biolink:related_to', 'Disease:1', ['PMID:1'], 'biolink:Association', 'b_edges'),
+            ('uuid:2', 'Gene:1', 'biolink:related_to', 'Disease:1', ['PMID:2'], 'biolink:Association', 'b_edges'),
+            ('uuid:3', 'Gene:3', 'biolink:related_to', 'Disease:1', NULL, 'biolink:Association', 'a_edges'),
+            ('uuid:4', 'Gene:2', 'biolink:related_to', 'Disease:2', NULL, 'biolink:Association', 'a_edges'),
+            ('uuid:5', 'Gene:2', 'biolink:causes', 'Disease:9', NULL, 'biolink:Association', 'b_edges')
+        ) t(id, subject, predicate, object, publications, category, provided_by)
+    """)
+    if intern:
+        intern_node_ids(conn)
+    return conn
+
+
+def contents(conn, tables):
+    return {table: conn.execute(f"SELECT * FROM {table} ORDER BY ALL").fetchall() for table in tables}
+
+
+@pytest.mark.parametrize("options", [
+    {},
+    {"node_merge_strategy": "union"},
+    {"node_merge_strategy": "priority", "source_priority": ["b_nodes"], "dedup_triples": True},
+])
+def test_sharded_matches_single_process(tmp_path, options):
+    conn = make_conn()
+    merge_and_clean(conn, options.get("node_merge_strategy", "first"), options.get("source_priority"),
+                    options.get("dedup_triples", False))
+    create_qc_aggregations(conn)
+    tables = TABLES + (["collapsed_edges"] if options.get("dedup_triples") else [])
+    expected = contents(conn, tables)
+
+    conn = make_conn()
+    sharded_merge_and_clean(conn, 3, processes=2, work_dir=str(tmp_path), **options)
+    assert contents(conn, tables) == expected
+    assert list(tmp_path.iterdir()) == []
+
+
+def test_sharded_without_node_keys_matches_single_process(tmp_path):
+    conn = make_conn(intern=False)
+    merge_and_clean(conn, dedup_triples=True)
+    create_qc_aggregations(conn)
+    tables = TABLES + ["collapsed_edges"]
+    expected = contents(conn, tables)
+
+    conn = make_conn(intern=False)
+    sharded_merge_and_clean(conn, 3, processes=2, work_dir=str(tmp_path), dedup_triples=True)
+    assert contents(conn, tables) == expected
+
+
+@pytest.mark.parametrize("intern,key_column", [(True, "node_key"), (False, "id")])
+def test_node_lookup_has_key_and_category_only(tmp_path, intern, key_column):
+    conn = make_conn(intern)
+    conn.execute(f"COPY nodes TO '{tmp_path / 'nodes.parquet'}' (FORMAT PARQUET)")
+    _write_node_lookup(conn, str(tmp_path / "nodes.parquet"), tmp_path / "node_lookup.parquet")
+    lookup = conn.execute(f"DESCRIBE SELECT * FROM read_parquet('{tmp_path / 'node_lookup.parquet'}')").fetchall()
+    assert [column[0] for column in lookup] == [key_column, "category"]
+
+
+def test_merge_duckdb_shards(tmp_path):
+    source_dir = tmp_path / "source"
+    source_dir.mkdir()
+    (source_dir / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\nDisease:1\tbiolink:Disease\n"
+                                               "Gene:1\tbiolink:Gene\n")
+    (source_dir / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\tcategory\n"
+                                              "uuid:1\tGene:1\tbiolink:related_to\tDisease:1\tbiolink:Association\n"
+                                              "uuid:2\tGene:2\tbiolink:related_to\tDisease:1\tbiolink:Association\n")
+    outputs = []
+    for shards in (1, 4):
+        output_dir = tmp_path / f"output-{shards}"
+        merge_duckdb(name="test-kg", source=str(source_dir), output_dir=str(output_dir), shards=shards)
+        outputs.append([sorted((output_dir / path).read_text().splitlines())
+                        for path in ["test-kg_nodes.tsv", "test-kg_edges.tsv", "qc_report.yaml"]])
+    assert outputs[0] == outputs[1]
+
+
+def test_sharded_workers_spill_to_own_directories(tmp_path):
+    # Enough rows that each worker spills past its memory limit into the shared temp_directory
+    conn = duckdb.connect()
+    conn.execute("""
+        CREATE TABLE nodes AS
+        SELECT 'N:' || (i % 30000) as id, 'biolink:Gene' as category, repeat('x', 200) || i::VARCHAR as name,
+            ['X:' || i::VARCHAR] as xref, 'p' || (i % 3) as provided_by
+        FROM range(60000) t(i)
+    """)
+    conn.execute("""
+        CREATE TABLE edges AS
+        SELECT 'uuid:' || (i % 30000) as id, 'N:' || (i % 30000) as subject, 'biolink:related_to' as predicate,
+            'N:' || ((i + 1) % 30000) as object, ['PMID:' || i::VARCHAR] as publications,
+            'biolink:Association' as category, 'p' || (i % 3) as provided_by
+        FROM range(60000) t(i)
+    """)
+    intern_node_ids(conn)
+    temp_directory = tmp_path / "spill"
+    temp_directory.mkdir()
+    config = {"memory_limit": "20MB", "threads": 1, "temp_directory": str(temp_directory),
+              "preserve_insertion_order": False}
+    sharded_merge_and_clean(conn, 3, config=config, processes=3, work_dir=str(tmp_path), dedup_triples=True)
+    assert conn.execute("SELECT COUNT(*) FROM nodes").fetchone()[0] == 30000
+    assert conn.execute("SELECT COUNT(*) FROM edges").fetchone()[0] == 30000
+    assert list(temp_directory.iterdir()) == []
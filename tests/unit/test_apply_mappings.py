@@ -51,3 +51,10 @@ def test_no_extra_columns(edges, mapping):
     expected_columns = set(edge_columns + ["original_subject", "original_object"])
     assert mapped_edge_columns == expected_columns
 
+
+def test_duplicate_object_ids_do_not_multiply_edges(edges, mapping):
+    mapping.loc[len(mapping)] = ["Gene:99", "skos:closeMatch", "XGene:2"]
+    mapped_edges = apply_mappings(edges, mapping)
+    assert len(mapped_edges) == 4
+    assert value(mapped_edges, 'uuid:2', 'subject') == 'Gene:2'
+    assert value(mapped_edges, 'uuid:1', 'original_subject') is None
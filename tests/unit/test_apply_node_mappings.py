@@ -0,0 +1,57 @@
+import pytest
+from tests.test_utils import string_df
+from cat_merge.mapping_utils import apply_node_mappings
+from cat_merge.merge_utils import merge_kg
+
+
+@pytest.fixture
+def nodes():
+    nodes = u"""\
+    id          category         provided_by
+    Gene:1      biolink:Gene     gene_nodes
+    XGene:1     biolink:Gene     xgene_nodes
+    XGene:2     biolink:Gene     xgene_nodes
+    Disease:1   biolink:Disease  disease_nodes
+    """
+    return string_df(nodes)
+
+
+@pytest.fixture
+def edges():
+    edges = u"""\
+    id      subject  predicate           object
+    uuid:1  XGene:2  biolink:related_to  Disease:1
+    """
+    return string_df(edges)
+
+
+@pytest.fixture
+def mapping():
+    mapping = u"""\
+    subject_id  predicate_id     object_id
+    Gene:1      skos:exactMatch  XGene:1
+    Gene:2      skos:exactMatch  XGene:2
+    """
+    return string_df(mapping)
+
+
+def test_node_ids_mapped(nodes, mapping):
+    mapped_nodes = apply_node_mappings(nodes, mapping)
+    assert list(mapped_nodes.id) == ["Gene:1", "Gene:1", "Gene:2", "Disease:1"]
+    assert list(mapped_nodes.original_id) == [None, "XGene:1", "XGene:2", None]
+
+
+def test_merge_kg_map_node_ids(nodes, edges, mapping):
+    kg, qc = merge_kg(edge_dfs=[edges], node_dfs=[nodes], mapping_dfs=[mapping], map_node_ids=True)
+    assert sorted(kg.nodes.id) == ["Disease:1", "Gene:1", "Gene:2"]
+    # The remapped node duplicates the node that already had the canonical id
+    assert sorted(qc.duplicate_nodes.provided_by) == ["gene_nodes", "xgene_nodes"]
+    # The edge to the remapped node is no longer dangling
+    assert list(kg.edges.subject) == ["Gene:2"]
+    assert len(qc.dangling_edges) == 0
+
+
+def test_merge_kg_without_map_node_ids(nodes, edges, mapping):
+    kg, qc = merge_kg(edge_dfs=[edges], node_dfs=[nodes], mapping_dfs=[mapping])
+    assert "original_id" not in kg.nodes.columns
+    assert len(qc.dangling_edges) == 1
@@ -0,0 +1,32 @@
+import io
+import tarfile
+
+import pytest
+
+from cat_merge.file_utils import read_df, read_tar_dfs
+
+
+def test_read_df_rejects_parquet(tmp_path):
+    path = tmp_path / "test_nodes.parquet"
+    path.write_bytes(b"")
+    with pytest.raises(ValueError, match="only supported by the duckdb engine"):
+        read_df(str(path))
+
+
+def test_read_tar_dfs_rejects_parquet(tmp_path):
+    tar_path = tmp_path / "kg.tar.gz"
+    with tarfile.open(tar_path, "w:gz") as tar:
+        info = tarfile.TarInfo("test_nodes.parquet")
+        info.size = 0
+        tar.addfile(info, io.BytesIO(b""))
+    with tarfile.open(tar_path, "r") as tar:
+        with pytest.raises(ValueError, match="only supported by the duckdb engine"):
+            read_tar_dfs(tar, "_nodes")
+
+
+def test_read_df_reads_tsv(tmp_path):
+    path = tmp_path / "test_nodes.tsv"
+    path.write_text("id\tcategory\nGene:1\tbiolink:Gene\n")
+    df = read_df(str(path))
+    assert list(df["id"]) == ["Gene:1"]
+    assert list(df["provided_by"]) == [None]
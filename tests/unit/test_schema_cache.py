@@ -0,0 +1,85 @@
+import gzip
+import io
+
+import pytest
+
+from cat_merge import schema_utils
+from cat_merge.schema_utils import (
+    BUNDLED_BIOLINK_VERSION,
+    BUNDLED_SCHEMA_DIR,
+    SchemaParser,
+    cache_biolink_schema,
+    get_default_schema_path,
+)
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CAT_MERGE_CACHE_DIR", str(tmp_path))
+    monkeypatch.delenv("CAT_MERGE_BIOLINK_VERSION", raising=False)
+    return tmp_path / "biolink"
+
+
+@pytest.fixture
+def biolink_release(monkeypatch):
+    """Serve a release built from the bundled snapshot with a different version instead of GitHub."""
+    files = {}
+    for bundled_file in BUNDLED_SCHEMA_DIR.glob("*.yaml.gz"):
+        with gzip.open(bundled_file, "rb") as fh:
+            files[bundled_file.name[:-len(".gz")]] = fh.read()
+    files["biolink_model.yaml"] = files["biolink_model.yaml"].replace(
+        f"version: {BUNDLED_BIOLINK_VERSION}".encode(), b"version: 9.9.9", 1)
+    requested = []
+
+    def urlopen(url):
+        requested.append(url)
+        return io.BytesIO(files[url.rsplit("/", 1)[1]])
+
+    monkeypatch.setattr(schema_utils.urllib.request, "urlopen", urlopen)
+    return requested
+
+
+def test_default_schema_is_bundled_snapshot(cache_dir):
+    schema_path = get_default_schema_path()
+    assert schema_path.parent.parent == cache_dir
+    assert schema_path.parent.name.startswith(f"{BUNDLED_BIOLINK_VERSION}-")
+    assert (schema_path.parent / "attributes.yaml").exists()
+    assert get_default_schema_path() == schema_path
+
+
+def test_default_schema_parser_works_offline():
+    parser = SchemaParser()
+    assert parser.is_field_multivalued("category")
+    assert not parser.is_field_multivalued("name")
+
+
+def test_cache_release_downloads_imports(biolink_release, cache_dir):
+    schema_path = cache_biolink_schema(version="9.9.9")
+    assert schema_path.parent.name.startswith("9.9.9-")
+    assert (schema_path.parent / "attributes.yaml").exists()
+    assert biolink_release[0].startswith("https://raw.githubusercontent.com/biolink/biolink-model/v9.9.9/")
+    # Not pinned, so the bundled snapshot is still the default
+    assert get_default_schema_path().parent.name.startswith(f"{BUNDLED_BIOLINK_VERSION}-")
+
+
+def test_pinned_schema_is_default(biolink_release):
+    schema_path = cache_biolink_schema(pin=True)
+    assert "/master/" in biolink_release[0]
+    assert get_default_schema_path() == schema_path
+
+
+def test_version_from_environment(biolink_release, monkeypatch):
+    monkeypatch.setenv("CAT_MERGE_BIOLINK_VERSION", "9.9.9")
+    with pytest.raises(FileNotFoundError, match="cache-schema --version 9.9.9"):
+        get_default_schema_path()
+    schema_path = cache_biolink_schema(version="9.9.9")
+    assert get_default_schema_path() == schema_path
+
+
+def test_uncached_environment_version_fails_merge(monkeypatch, tmp_path):
+    from cat_merge.duckdb_utils import read_kg_files
+    (tmp_path / "gene_nodes.tsv").write_text("id\tcategory\nGene:1\tbiolink:Gene\n")
+    (tmp_path / "g2d_edges.tsv").write_text("id\tsubject\tpredicate\tobject\nuuid:1\tGene:1\tbiolink:related_to\tGene:1\n")
+    monkeypatch.setenv("CAT_MERGE_BIOLINK_VERSION", "9.9.9")
+    with pytest.raises(FileNotFoundError, match="cache-schema --version 9.9.9"):
+        read_kg_files(source=str(tmp_path))
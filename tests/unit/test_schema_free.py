@@ -0,0 +1,46 @@
+import subprocess
+import sys
+
+from cat_merge.duckdb_utils import read_kg_files
+from cat_merge.schema_utils import KGX_SCHEMA, KGXFieldParser, get_schema_parser
+
+
+def imports_module(code, module):
+    """Run code in a fresh interpreter and report whether it imported module."""
+    result = subprocess.run([sys.executable, "-c", f"{code}\nimport sys\nprint('{module}' in sys.modules)"],
+                            capture_output=True, text=True, check=True)
+    return result.stdout.strip().splitlines()[-1] == "True"
+
+
+def test_cli_import_is_lazy():
+    assert not imports_module("import cat_merge.cli", "linkml_runtime")
+    assert not imports_module("import cat_merge.cli", "pandas")
+    assert not imports_module("import cat_merge.cli", "duckdb")
+
+
+def test_schema_free_merge_does_not_import_linkml():
+    code = (
+        "from cat_merge.duckdb_utils import read_kg_files\n"
+        "read_kg_files(nodes=['tests/test_data/test_kg_nodes.tsv'], edges=['tests/test_data/test_kg_edges.tsv'], "
+        "schema_path='kgx')"
+    )
+    assert not imports_module(code, "linkml_runtime")
+
+
+def test_kgx_field_parser():
+    parser = get_schema_parser(KGX_SCHEMA)
+    assert isinstance(parser, KGXFieldParser)
+    assert parser.is_field_multivalued("xref")
+    assert parser.is_field_multivalued("knowledge_source")
+    assert not parser.is_field_multivalued("name")
+    assert parser.get_field_type("negated") == "VARCHAR"
+
+
+def test_read_kg_files_schema_free():
+    conn = read_kg_files(nodes=["tests/test_data/test_kg_nodes.tsv"],
+                         edges=["tests/test_data/test_kg_edges.tsv"],
+                         schema_path=KGX_SCHEMA)
+    node_types = dict(conn.execute("SELECT column_name, column_type FROM (DESCRIBE nodes)").fetchall())
+    assert node_types["category"] == "VARCHAR[]"
+    assert node_types["synonym"] == "VARCHAR[]"
+    assert node_types["name"] == "VARCHAR"
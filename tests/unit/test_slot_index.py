@@ -0,0 +1,79 @@
+import json
+
+import pytest
+from linkml_runtime.utils import schemaview
+
+from cat_merge.schema_utils import SLOT_INDEX_FILE, SchemaParser, get_default_schema_path
+
+
+SCHEMA = """\
+id: https://example.org/test-schema
+name: test_schema
+prefixes:
+  linkml: https://w3id.org/linkml/
+imports:
+  - linkml:types
+default_range: string
+slots:
+  xref:
+    multivalued: true
+  in taxon:
+    multivalued: true
+  negated:
+    range: boolean
+  name: {}
+"""
+
+
+@pytest.fixture(autouse=True)
+def cache_dir(tmp_path, monkeypatch):
+    monkeypatch.setenv("CAT_MERGE_CACHE_DIR", str(tmp_path / "cache"))
+    monkeypatch.delenv("CAT_MERGE_BIOLINK_VERSION", raising=False)
+    return tmp_path / "cache" / "biolink"
+
+
+@pytest.fixture
+def schema_file(tmp_path):
+    schema_path = tmp_path / "schema.yaml"
+    schema_path.write_text(SCHEMA)
+    return schema_path
+
+
+@pytest.fixture
+def no_schema_view(monkeypatch):
+    def fail(*args, **kwargs):
+        raise AssertionError("schema should not be parsed")
+    monkeypatch.setattr(schemaview, "SchemaView", fail)
+
+
+def test_index_lookups(schema_file):
+    parser = SchemaParser(str(schema_file))
+    assert parser.is_field_multivalued("xref")
+    assert parser.is_field_multivalued("in_taxon")
+    assert not parser.is_field_multivalued("name")
+    assert not parser.is_field_multivalued("unknown")
+    assert parser.get_field_type("negated") == "BOOLEAN"
+    assert parser.get_field_type("name") == "VARCHAR"
+    assert isinstance(parser.multivalued_slots, frozenset)
+
+
+def test_default_schema_index_is_sidecar(cache_dir):
+    SchemaParser()
+    index_path = get_default_schema_path().parent / SLOT_INDEX_FILE
+    with open(index_path) as index_file:
+        assert "category" in json.load(index_file)["multivalued"]
+
+
+def test_index_reused_without_parsing_schema(schema_file, request):
+    SchemaParser(str(schema_file))
+    request.getfixturevalue("no_schema_view")
+    parser = SchemaParser(str(schema_file))
+    assert parser.is_field_multivalued("xref")
+
+
+def test_changed_schema_gets_new_index(schema_file, cache_dir):
+    SchemaParser(str(schema_file))
+    schema_file.write_text(SCHEMA.replace("  name: {}", "  name:\n    multivalued: true"))
+    parser = SchemaParser(str(schema_file))
+    assert parser.is_field_multivalued("name")
+    assert len(list((cache_dir / "slot-index").glob("*.json"))) == 2